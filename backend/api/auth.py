@@ -5,9 +5,17 @@ import os
 
 from fastapi import Header, HTTPException
 
+from api.auth_cache import (
+    FirebaseVerifier,
+    TokenVerifier,
+    VerificationCache,
+    VerificationStats,
+)
+
 logger = logging.getLogger(__name__)
 
 _firebase_available: bool = False
+_verification_cache = VerificationCache(FirebaseVerifier())
 
 
 def init_firebase() -> None:
@@ -29,12 +37,32 @@ def init_firebase() -> None:
         logger.exception("Firebase init failed — auth disabled.")
 
 
+def set_token_verifier(verifier: TokenVerifier) -> None:
+    """Check ID tokens with ``verifier`` instead of Firebase; drops cached claims.
+
+    A non-Firebase verifier enables auth even without Firebase credentials.
+    """
+    global _verification_cache  # noqa: PLW0603
+    _verification_cache = VerificationCache(verifier, _verification_cache.max_entries)
+
+
+def verification_stats() -> VerificationStats:
+    return _verification_cache.stats()
+
+
+def _auth_enabled() -> bool:
+    return _firebase_available or not isinstance(
+        _verification_cache.verifier, FirebaseVerifier,
+    )
+
+
 def verify_firebase_token(token: str) -> dict[str, str]:
-    """Verify a Firebase JWT and return ``{'uid': ..., 'email': ...}``."""
-    from firebase_admin import auth  # type: ignore[import-untyped]
+    """Verify a Firebase JWT and return ``{'uid': ..., 'email': ...}``.
 
+    Verified claims are cached until the token expires (see ``api.auth_cache``).
+    """
     try:
-        decoded = auth.verify_id_token(token)
+        decoded = _verification_cache.verify(token)
         return {"uid": decoded["uid"], "email": decoded.get("email", "")}
     except Exception as exc:
         raise HTTPException(status_code=401, detail="Invalid token.") from exc
@@ -46,33 +74,10 @@ async def get_optional_user(
     """FastAPI dependency: extract uid from Bearer token, or ``None``."""
     if authorization is None:
         return None
-    if not _firebase_available:
+    if not _auth_enabled():
         return None
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Invalid token.")
     token = authorization[len("Bearer "):]
     info = verify_firebase_token(token)
     return info["uid"]
-
-
-def update_user_profile(uid: str, email: str, won: bool) -> None:
-    """Increment Firestore user profile counters after a terminal game."""
-    if not _firebase_available:
-        return
-    try:
-        from firebase_admin import firestore  # type: ignore[import-untyped]
-
-        db = firestore.client()
-        doc_ref = db.collection("users").document(uid)
-        data: dict[str, object] = {
-            "uid": uid,
-            "email": email,
-            "games_played": firestore.Increment(1),
-        }
-        if won:
-            data["wins"] = firestore.Increment(1)
-        else:
-            data["losses"] = firestore.Increment(1)
-        doc_ref.set(data, merge=True)
-    except Exception:
-        logger.exception("Failed to update Firestore profile for %s", uid)
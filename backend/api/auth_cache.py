@@ -0,0 +1,175 @@
+"""Cached ID-token verification.
+
+Every authenticated request carries the same Firebase ID token for the
+life of the token, so verified claims are cached under the token's SHA-256
+digest until the token's ``exp`` claim, in a bounded LRU. The signature
+check itself is delegated to a ``TokenVerifier``: ``FirebaseVerifier`` in
+production, ``LocalKeySetVerifier`` (HS256 against an in-process key set)
+for tests and local runs.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from api.latency import LatencyRecorder
+
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+
+
+class TokenVerifier(Protocol):
+    def verify(self, token: str) -> dict[str, Any]:
+        """Return the token's claims (with ``uid`` and ``exp``) or raise."""
+        ...
+
+
+class FirebaseVerifier:
+    """Checks tokens with ``firebase_admin.auth.verify_id_token``."""
+
+    def verify(self, token: str) -> dict[str, Any]:
+        from firebase_admin import auth  # type: ignore[import-untyped]
+
+        return dict(auth.verify_id_token(token))
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+class LocalKeySetVerifier:
+    """HS256 JWTs signed by one of ``keys`` (``kid`` -> secret)."""
+
+    def __init__(
+        self, keys: Mapping[str, bytes], clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.keys = dict(keys)
+        self._clock = clock
+
+    def sign(self, claims: Mapping[str, Any], kid: str) -> str:
+        header = _b64encode(json.dumps({"alg": "HS256", "kid": kid}).encode())
+        body = _b64encode(json.dumps(dict(claims)).encode())
+        signature = hmac.new(self.keys[kid], f"{header}.{body}".encode(), hashlib.sha256)
+        return f"{header}.{body}.{_b64encode(signature.digest())}"
+
+    def verify(self, token: str) -> dict[str, Any]:
+        try:
+            header, body, signature = token.split(".")
+            kid = json.loads(_b64decode(header))["kid"]
+            claims = json.loads(_b64decode(body))
+            given = _b64decode(signature)
+        except (ValueError, KeyError, TypeError) as exc:
+            raise ValueError("Malformed token") from exc
+        key = self.keys.get(kid)
+        if key is None:
+            raise ValueError(f"Unknown key id {kid!r}")
+        expected = hmac.new(key, f"{header}.{body}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(given, expected):
+            raise ValueError("Token signature does not match")
+        if float(claims.get("exp", 0)) <= self._clock():
+            raise ValueError("Token has expired")
+        claims.setdefault("uid", claims.get("sub"))
+        return dict(claims)
+
+
+@dataclass(frozen=True)
+class VerificationStats:
+    hits: int
+    misses: int
+    hit_ratio: float
+    entries: int
+    evicted_total: int
+    verify_count: int
+    verify_mean_ms: float
+    verify_p95_ms: float
+    verify_max_ms: float
+
+
+class VerificationCache:
+    """Claims of verified tokens, keyed by token digest, until each ``exp``.
+
+    Failed verifications are never cached. Once ``max_entries`` is exceeded
+    the least recently used token is dropped.
+    """
+
+    def __init__(
+        self,
+        verifier: TokenVerifier,
+        max_entries: int = AUTH_CACHE_SIZE,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.verifier = verifier
+        self.max_entries = max_entries
+        self._clock = clock
+        # digest -> (claims, expires at)
+        self._entries: OrderedDict[bytes, tuple[dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._latency = LatencyRecorder()
+        self._hits = 0
+        self._misses = 0
+        self._evicted_total = 0
+
+    def verify(self, token: str) -> dict[str, Any]:
+        digest = hashlib.sha256(token.encode("utf-8")).digest()
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(digest)
+                self._hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[digest]
+            self._misses += 1
+
+        started = time.perf_counter()
+        try:
+            claims = self.verifier.verify(token)
+        finally:
+            self._latency.record("verify", time.perf_counter() - started)
+
+        expires_at = float(claims.get("exp", 0))
+        if expires_at > now:
+            with self._lock:
+                self._entries[digest] = (claims, expires_at)
+                self._entries.move_to_end(digest)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evicted_total += 1
+        return claims
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> VerificationStats:
+        with self._lock:
+            hits, misses, entries = self._hits, self._misses, len(self._entries)
+        latency = self._latency.stats()
+        verify = latency[0] if latency else None
+        return VerificationStats(
+            hits=hits,
+            misses=misses,
+            hit_ratio=hits / (hits + misses) if hits + misses else 0.0,
+            entries=entries,
+            evicted_total=self._evicted_total,
+            verify_count=verify.count if verify else 0,
+            verify_mean_ms=verify.mean_ms if verify else 0.0,
+            verify_p95_ms=verify.p95_ms if verify else 0.0,
+            verify_max_ms=verify.max_ms if verify else 0.0,
+        )
@@ -0,0 +1,156 @@
+"""Executors that keep blocking work off the event loop.
+
+Side effects that do I/O (Firestore profile writes, telemetry appends) are
+fired into a thread pool and never awaited by the request. Wumpus inference
+runs on a thread by default, or in a process pool so large batches do not
+hold the GIL the event loop needs. Its workers are spawned rather than forked, because
+forking this threaded server would copy the watcher, I/O and sweeper
+threads' locks mid-state. Each worker preloads every tier from the models
+directory. When the registry hot-reloads a model, a fresh, preloaded pool
+replaces the old one.
+
+``API_IO_WORKERS=0`` runs side effects inline and ``API_INFERENCE_WORKERS=0``
+(the default) keeps inference on a thread of this process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from engine.entities import Direction
+from rl import model_registry
+from rl.observation import OBSERVATION_SIZE
+
+logger = logging.getLogger(__name__)
+
+IO_WORKERS = int(os.getenv("API_IO_WORKERS", "4"))
+INFERENCE_WORKERS = int(os.getenv("API_INFERENCE_WORKERS", "0"))
+
+_io_workers = IO_WORKERS
+_inference_workers = INFERENCE_WORKERS
+_io_pool: ThreadPoolExecutor | None = None
+_inference_pool: ProcessPoolExecutor | None = None
+# Guards replacing the inference pool (the model watcher thread does it on
+# reload) against submissions from the event loop.
+_inference_lock = threading.Lock()
+
+
+def configure(io_workers: int | None = None, inference_workers: int | None = None) -> None:
+    """Resize the pools; existing pools are shut down and rebuilt on demand."""
+    global _io_workers, _inference_workers
+    shutdown()
+    if io_workers is not None:
+        _io_workers = io_workers
+    if inference_workers is not None:
+        _inference_workers = inference_workers
+
+
+def _log_failure(future: Future[Any]) -> None:
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Background side effect failed", exc_info=exc)
+
+
+def submit_io(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """Run a blocking side effect without making the request wait for it."""
+    global _io_pool
+    if _io_workers <= 0:
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            logger.exception("Side effect %s failed", getattr(func, "__name__", func))
+        return
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=_io_workers, thread_name_prefix="api-io")
+    _io_pool.submit(func, *args, **kwargs).add_done_callback(_log_failure)
+
+
+def _init_worker(models_dir: str) -> None:
+    model_registry._MODELS_DIR = Path(models_dir)
+    model_registry.preload()
+
+
+def _warm_worker() -> None:
+    """Start a worker of a new pool and run every tier once before it serves."""
+    observation = np.zeros((1, OBSERVATION_SIZE), dtype=np.float32)
+    for difficulty in model_registry.DIFFICULTY_MODELS:
+        model_registry.load_model(difficulty).predict_observations(observation)
+
+
+def _predict_in_worker(difficulty: str, observations: npt.NDArray[np.float32]) -> list[int]:
+    agent = model_registry.load_model(difficulty)
+    return [direction.value for direction in agent.predict_observations(observations)]
+
+
+def _predict_in_process(
+    difficulty: str, observations: npt.NDArray[np.float32],
+) -> list[Direction]:
+    return model_registry.load_model(difficulty).predict_observations(observations)
+
+
+def _new_inference_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=_inference_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(str(model_registry._MODELS_DIR),),
+    )
+
+
+async def predict(difficulty: str, observations: npt.NDArray[np.float32]) -> list[Direction]:
+    """Actions for ``observations``, computed in the inference pool if enabled.
+
+    Without a pool the model still runs on a thread, never on the event loop.
+    """
+    global _inference_pool
+    if _inference_workers <= 0:
+        return await asyncio.to_thread(_predict_in_process, difficulty, observations)
+    with _inference_lock:
+        if _inference_pool is None:
+            _inference_pool = _new_inference_pool()
+        future = _inference_pool.submit(_predict_in_worker, difficulty, observations)
+    values = await asyncio.wrap_future(future)
+    return [Direction(value) for value in values]
+
+
+def _replace_inference_pool(updated: list[str]) -> None:
+    """Swap in a freshly preloaded pool after ``updated`` tiers were reloaded."""
+    global _inference_pool
+    if _inference_pool is None:
+        return
+    pool = _new_inference_pool()
+    # Start (and preload) the new workers before any move is routed to them.
+    for future in [pool.submit(_warm_worker) for _ in range(_inference_workers)]:
+        future.result()
+    with _inference_lock:
+        old, _inference_pool = _inference_pool, pool
+    if old is not None:
+        # Batches already submitted to the old workers still finish.
+        old.shutdown(wait=False)
+    logger.info("Restarted inference workers for reloaded %s", ", ".join(updated))
+
+
+model_registry.add_reload_listener(_replace_inference_pool)
+
+
+def shutdown(wait: bool = True) -> None:
+    """Drain pending side effects and stop both pools."""
+    global _io_pool, _inference_pool
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=wait)
+        _io_pool = None
+    with _inference_lock:
+        pool, _inference_pool = _inference_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait)
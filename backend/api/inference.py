@@ -0,0 +1,103 @@
+"""Cross-session micro-batching of wumpus inference.
+
+Moves from every session queue their observation rows here; rows for the
+same difficulty are flushed through one ``predict_observations`` call once
+``max_batch_size`` rows are waiting or ``max_delay`` seconds have passed
+since the first of them arrived, whichever comes first. The forward pass
+itself runs wherever ``api.executors`` places inference.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+
+from api import executors
+from engine.entities import Direction
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "64"))
+MAX_DELAY_SECONDS = float(os.getenv("INFERENCE_MAX_DELAY_MS", "0.5")) / 1000.0
+
+
+@dataclass
+class _PendingRequest:
+    observations: npt.NDArray[np.float32]
+    future: asyncio.Future[list[Direction]]
+
+
+class InferenceScheduler:
+    def __init__(
+        self,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_delay: float = MAX_DELAY_SECONDS,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._pending: dict[str, list[_PendingRequest]] = {}
+        self._pending_rows: dict[str, int] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._running: set[asyncio.Task[None]] = set()
+        self.batches_run = 0
+        self.rows_run = 0
+
+    async def predict(
+        self, difficulty: str, observations: npt.NDArray[np.float32],
+    ) -> list[Direction]:
+        """Queue ``(k, 9)`` observations and wait for their ``k`` actions."""
+        if len(observations) == 0:
+            return []
+        loop = asyncio.get_running_loop()
+        request = _PendingRequest(observations=observations, future=loop.create_future())
+        self._pending.setdefault(difficulty, []).append(request)
+        rows = self._pending_rows.get(difficulty, 0) + len(observations)
+        self._pending_rows[difficulty] = rows
+
+        if rows >= self.max_batch_size:
+            self._flush(difficulty)
+        elif difficulty not in self._timers:
+            self._timers[difficulty] = loop.call_later(self.max_delay, self._flush, difficulty)
+        return await request.future
+
+    def _flush(self, difficulty: str) -> None:
+        timer = self._timers.pop(difficulty, None)
+        if timer is not None:
+            timer.cancel()
+        requests = self._pending.pop(difficulty, [])
+        self._pending_rows.pop(difficulty, None)
+        if not requests:
+            return
+        task = asyncio.get_running_loop().create_task(self._run_batch(difficulty, requests))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, difficulty: str, requests: list[_PendingRequest]) -> None:
+        try:
+            batch = np.concatenate([request.observations for request in requests])
+            actions = await executors.predict(difficulty, batch)
+        except Exception as exc:
+            logger.exception("Batched inference failed for difficulty %r", difficulty)
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            return
+
+        self.batches_run += 1
+        self.rows_run += len(batch)
+        offset = 0
+        for request in requests:
+            count = len(request.observations)
+            if not request.future.done():
+                request.future.set_result(actions[offset:offset + count])
+            offset += count
+
+
+scheduler = InferenceScheduler()
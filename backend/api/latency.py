@@ -0,0 +1,108 @@
+"""Move latency per transport, so the REST and WebSocket paths can be compared.
+
+REST moves are timed by ``MoveTimingMiddleware`` from the first byte of the
+request to the last byte of the response, which covers header parsing,
+auth, validation and serialisation. WebSocket moves are timed per frame,
+from receiving an action to sending its state update.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "4096"))
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    transport: str
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class _Series:
+    def __init__(self, window: int) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: deque[float] = deque(maxlen=window)
+
+
+class LatencyRecorder:
+    """Lifetime count, mean and max plus percentiles over the last ``window`` samples."""
+
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self.window = window
+        self._series: dict[str, _Series] = {}
+        self._lock = threading.Lock()
+
+    def record(self, transport: str, seconds: float) -> None:
+        with self._lock:
+            series = self._series.get(transport)
+            if series is None:
+                series = self._series[transport] = _Series(self.window)
+            series.count += 1
+            series.total += seconds
+            series.max = max(series.max, seconds)
+            series.recent.append(seconds)
+
+    def stats(self) -> list[LatencyStats]:
+        with self._lock:
+            snapshot = [
+                (name, s.count, s.total, s.max, sorted(s.recent))
+                for name, s in sorted(self._series.items())
+            ]
+        return [
+            LatencyStats(
+                transport=name,
+                count=count,
+                mean_ms=total / count * 1000.0,
+                p50_ms=_percentile(recent, 0.50) * 1000.0,
+                p95_ms=_percentile(recent, 0.95) * 1000.0,
+                p99_ms=_percentile(recent, 0.99) * 1000.0,
+                max_ms=peak * 1000.0,
+            )
+            for name, count, total, peak, recent in snapshot
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+move_latency = LatencyRecorder()
+
+
+class MoveTimingMiddleware:
+    """Records every HTTP request to ``path`` in ``move_latency`` as ``"rest"``."""
+
+    def __init__(self, app: ASGIApp, path: str = "/game/move") -> None:
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+
+        async def timed_send(message: Message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                move_latency.record("rest", time.perf_counter() - started)
+
+        await self.app(scope, receive, timed_send)
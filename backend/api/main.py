@@ -4,14 +4,47 @@ from dotenv import load_dotenv
 
 load_dotenv()  
 
+import asyncio
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from api import executors
 from api.auth import init_firebase
-from api.routes import router
-from api.telemetry import start_processor
-
-app = FastAPI(title="Hunter Wumpus API")
+from api.latency import MoveTimingMiddleware
+from api.profile_writer import profile_writer
+from api.routes import _sessions, router
+from api.telemetry import close_writer, start_processor
+from rl import model_registry
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # Load every tier before serving so no player waits on a cold model.
+    if os.getenv("MODEL_PRELOAD", "1") != "0":
+        await asyncio.to_thread(model_registry.preload)
+    model_registry.start_watcher(
+        float(os.getenv("MODEL_WATCH_INTERVAL", str(model_registry.DEFAULT_WATCH_INTERVAL)))
+    )
+    _sessions.start_sweeper()
+    profile_writer.start()
+    try:
+        yield
+    finally:
+        await _sessions.stop_sweeper()
+        model_registry.stop_watcher()
+        # Side effects still queued on the I/O pool write to the session store,
+        # the profile writer and the telemetry file, so drain them first.
+        await asyncio.to_thread(executors.shutdown)
+        _sessions.close()
+        await asyncio.to_thread(profile_writer.close)
+        await asyncio.to_thread(close_writer)
+
+
+app = FastAPI(title="Hunter Wumpus API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -20,6 +53,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(MoveTimingMiddleware)
+
 app.include_router(router)
 
 init_firebase()
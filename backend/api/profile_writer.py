@@ -0,0 +1,345 @@
+"""Batched background writes of player profile counters.
+
+Finished games only record an increment in memory; increments for the same
+uid are coalesced and a background thread commits them through a
+``ProfileSink`` every ``flush_interval`` seconds (Firestore in production,
+``MemorySink`` in tests). Once ``max_pending`` uids are waiting the buffer
+is handed to a spill thread that appends it to a JSONL file, even while a
+slow commit holds up the flusher, so memory stays bounded and
+``/game/move`` never waits on the backend or the disk. A flush moves the
+spill file aside to ``<spill>.inflight`` and deletes it only once the
+commit succeeded; updates a commit could not apply stay in that file, so a
+crash or a sink outage never loses them. ``close`` commits what is left,
+or keeps it on disk for the next run.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FLUSH_INTERVAL_SECONDS = float(os.getenv("PROFILE_FLUSH_INTERVAL_SECONDS", "2"))
+PROFILE_MAX_PENDING = int(os.getenv("PROFILE_MAX_PENDING", "10000"))
+PROFILE_SPILL_PATH = os.getenv(
+    "PROFILE_SPILL_PATH", str(Path(__file__).resolve().parents[1] / "profile_spill.jsonl"),
+)
+
+# Firestore rejects batches with more than 500 writes.
+FIRESTORE_BATCH_LIMIT = 500
+
+
+@dataclass
+class ProfileDelta:
+    email: str = ""
+    games_played: int = 0
+    wins: int = 0
+    losses: int = 0
+
+    def merge(self, other: ProfileDelta) -> None:
+        self.email = other.email or self.email
+        self.games_played += other.games_played
+        self.wins += other.wins
+        self.losses += other.losses
+
+
+class ProfileSink(Protocol):
+    def commit(self, updates: Mapping[str, ProfileDelta]) -> None:
+        """Apply every update or raise; a failed commit is retried later.
+
+        A sink that commits in several chunks raises ``ProfileCommitError``
+        naming the uids it already applied, so only the rest are retried.
+        """
+        ...
+
+
+class ProfileCommitError(Exception):
+    """A commit failed after some chunks of it were applied."""
+
+    def __init__(self, committed: frozenset[str]) -> None:
+        super().__init__(f"Commit failed after {len(committed)} updates were applied")
+        self.committed = committed
+
+
+def commit_in_chunks(
+    updates: Mapping[str, ProfileDelta],
+    limit: int,
+    commit_chunk: Callable[[list[tuple[str, ProfileDelta]]], None],
+) -> None:
+    """Commit ``updates`` ``limit`` at a time, trying every chunk.
+
+    Raises ``ProfileCommitError`` (chained to the first failure) if any chunk failed.
+    """
+    items = list(updates.items())
+    committed: list[str] = []
+    first_error: Exception | None = None
+    for start in range(0, len(items), limit):
+        chunk = items[start:start + limit]
+        try:
+            commit_chunk(chunk)
+        except Exception as exc:
+            first_error = first_error or exc
+            continue
+        committed.extend(uid for uid, _ in chunk)
+    if first_error is not None:
+        raise ProfileCommitError(frozenset(committed)) from first_error
+
+
+class FirestoreSink:
+    """Increments ``users/{uid}`` documents in batched writes."""
+
+    def commit(self, updates: Mapping[str, ProfileDelta]) -> None:
+        from api import auth
+
+        if not auth._firebase_available:
+            return
+        from firebase_admin import firestore  # type: ignore[import-untyped]
+
+        db = firestore.client()
+
+        def commit_chunk(chunk: list[tuple[str, ProfileDelta]]) -> None:
+            batch = db.batch()
+            for uid, delta in chunk:
+                data: dict[str, object] = {
+                    "uid": uid,
+                    "email": delta.email,
+                    "games_played": firestore.Increment(delta.games_played),
+                }
+                if delta.wins:
+                    data["wins"] = firestore.Increment(delta.wins)
+                if delta.losses:
+                    data["losses"] = firestore.Increment(delta.losses)
+                batch.set(db.collection("users").document(uid), data, merge=True)
+            batch.commit()
+
+        commit_in_chunks(updates, FIRESTORE_BATCH_LIMIT, commit_chunk)
+
+
+class MemorySink:
+    """Keeps profiles in a dict; a stand-in for Firestore, chunked the same way."""
+
+    def __init__(self, batch_limit: int = FIRESTORE_BATCH_LIMIT) -> None:
+        self.batch_limit = batch_limit
+        self.profiles: dict[str, ProfileDelta] = {}
+        self.commits = 0
+
+    def commit(self, updates: Mapping[str, ProfileDelta]) -> None:
+        commit_in_chunks(updates, self.batch_limit, self._commit_chunk)
+
+    def _commit_chunk(self, chunk: list[tuple[str, ProfileDelta]]) -> None:
+        for uid, delta in chunk:
+            self.profiles.setdefault(uid, ProfileDelta()).merge(delta)
+        self.commits += 1
+
+
+@dataclass(frozen=True)
+class ProfileWriterStats:
+    pending: int
+    committed_total: int
+    spilled_total: int
+    failed_commits: int
+
+
+def _spill_lines(updates: Mapping[str, ProfileDelta]) -> str:
+    return "".join(
+        json.dumps({"uid": uid, **delta.__dict__}) + "\n" for uid, delta in updates.items()
+    )
+
+
+def _merge_into(
+    target: dict[str, ProfileDelta], updates: Iterable[tuple[str, ProfileDelta]],
+) -> None:
+    for uid, delta in updates:
+        existing = target.get(uid)
+        if existing is None:
+            target[uid] = ProfileDelta(delta.email, delta.games_played, delta.wins, delta.losses)
+        else:
+            existing.merge(delta)
+
+
+class ProfileWriter:
+    def __init__(
+        self,
+        sink: ProfileSink,
+        flush_interval: float = PROFILE_FLUSH_INTERVAL_SECONDS,
+        max_pending: int = PROFILE_MAX_PENDING,
+        spill_path: str | Path = PROFILE_SPILL_PATH,
+    ) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be >= 1")
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.spill_path = Path(spill_path)
+        self._inflight_path = self.spill_path.with_name(self.spill_path.name + ".inflight")
+        self._pending: dict[str, ProfileDelta] = {}
+        # Full buffers waiting for the spill thread.
+        self._overflow: list[dict[str, ProfileDelta]] = []
+        self._lock = threading.Lock()
+        # Serialises flushes, and spill-file access, without holding up record().
+        self._flush_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._committed_total = 0
+        self._spilled_total = 0
+        self._failed_commits = 0
+        self._wake = threading.Event()
+        self._spill_wake = threading.Event()
+        self._closed = threading.Event()
+        self._flusher: threading.Thread | None = None
+        self._spiller: threading.Thread | None = None
+
+    def record(self, uid: str, email: str, won: bool) -> None:
+        """Count one finished game for ``uid``; never blocks on the sink or the disk."""
+        delta = ProfileDelta(email, 1, int(won), int(not won))
+        with self._lock:
+            _merge_into(self._pending, ((uid, delta),))
+            if len(self._pending) < self.max_pending:
+                return
+            self._overflow.append(self._pending)
+            self._pending = {}
+        self._spill_wake.set()
+
+    def _spill(self, updates: Mapping[str, ProfileDelta]) -> None:
+        try:
+            with self._spill_lock:
+                with open(self.spill_path, "a", encoding="utf-8") as fh:
+                    fh.write(_spill_lines(updates))
+        except OSError:
+            logger.exception(
+                "Failed to spill %d profile updates to %s", len(updates), self.spill_path,
+            )
+            return
+        self._spilled_total += len(updates)
+
+    def _spill_overflow(self) -> None:
+        with self._lock:
+            overflow, self._overflow = self._overflow, []
+        for updates in overflow:
+            self._spill(updates)
+
+    def _take_spilled(self) -> list[tuple[str, ProfileDelta]]:
+        """Move the spill file into the in-flight file and read everything in it."""
+        with self._spill_lock:
+            if self.spill_path.exists():
+                if self._inflight_path.exists():
+                    # Left over from a failed commit or a crash: keep both.
+                    with open(self._inflight_path, "a", encoding="utf-8") as fh:
+                        fh.write(self.spill_path.read_text(encoding="utf-8"))
+                    self.spill_path.unlink()
+                else:
+                    self.spill_path.replace(self._inflight_path)
+            if not self._inflight_path.exists():
+                return []
+            raw = self._inflight_path.read_text(encoding="utf-8")
+        updates = []
+        for line in raw.splitlines():
+            try:
+                entry = json.loads(line)
+                uid = entry.pop("uid")
+                updates.append((uid, ProfileDelta(**entry)))
+            except (json.JSONDecodeError, KeyError, TypeError):
+                logger.warning("Skipping malformed profile spill line: %s", line[:80])
+        return updates
+
+    def _keep_inflight(self, updates: Mapping[str, ProfileDelta]) -> None:
+        """Replace the in-flight file with the updates that still need committing."""
+        partial = self._inflight_path.with_name(self._inflight_path.name + ".partial")
+        try:
+            with self._spill_lock:
+                partial.write_text(_spill_lines(updates), encoding="utf-8")
+                partial.replace(self._inflight_path)
+        except OSError:
+            logger.exception(
+                "Failed to keep %d profile updates in %s", len(updates), self._inflight_path,
+            )
+            return
+        self._spilled_total += len(updates)
+
+    def _drop_inflight(self) -> None:
+        with self._spill_lock:
+            self._inflight_path.unlink(missing_ok=True)
+
+    def flush(self) -> int:
+        """Commit buffered and spilled updates in one go; returns the uid count."""
+        with self._flush_lock:
+            batch: dict[str, ProfileDelta] = {}
+            _merge_into(batch, self._take_spilled())
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                overflow, self._overflow = self._overflow, []
+            for updates in overflow:
+                _merge_into(batch, updates.items())
+            _merge_into(batch, pending.items())
+            if not batch:
+                self._drop_inflight()
+                return 0
+            try:
+                self.sink.commit(batch)
+            except Exception as exc:
+                # Chunks that did land must not be retried: the increments would count twice.
+                committed = exc.committed if isinstance(exc, ProfileCommitError) else frozenset()
+                failed = {uid: delta for uid, delta in batch.items() if uid not in committed}
+                logger.exception("Committing %d profile updates failed; will retry", len(failed))
+                self._failed_commits += 1
+                self._committed_total += len(batch) - len(failed)
+                self._keep_inflight(failed)
+                return len(batch) - len(failed)
+            self._drop_inflight()
+            self._committed_total += len(batch)
+            return len(batch)
+
+    def _flush_loop(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _spill_loop(self) -> None:
+        while not self._closed.is_set():
+            self._spill_wake.wait()
+            self._spill_wake.clear()
+            self._spill_overflow()
+
+    def start(self) -> None:
+        """Commit every ``flush_interval`` seconds, and spill overflow, on background threads."""
+        if self._flusher is None and self.flush_interval > 0:
+            self._closed.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="profile-writer", daemon=True,
+            )
+            self._spiller = threading.Thread(
+                target=self._spill_loop, name="profile-spill", daemon=True,
+            )
+            self._flusher.start()
+            self._spiller.start()
+
+    def close(self) -> None:
+        """Stop the threads and commit what is left (keeping it on disk if that fails)."""
+        self._closed.set()
+        self._wake.set()
+        self._spill_wake.set()
+        for thread in (self._flusher, self._spiller):
+            if thread is not None:
+                thread.join()
+        self._flusher = self._spiller = None
+        self.flush()
+
+    def stats(self) -> ProfileWriterStats:
+        with self._lock:
+            pending = len(self._pending) + sum(len(updates) for updates in self._overflow)
+        return ProfileWriterStats(
+            pending=pending,
+            committed_total=self._committed_total,
+            spilled_total=self._spilled_total,
+            failed_commits=self._failed_commits,
+        )
+
+
+profile_writer = ProfileWriter(FirestoreSink())
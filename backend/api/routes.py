@@ -1,30 +1,37 @@
 from __future__ import annotations
 
+import json
 import random
+import secrets
+import time
 import uuid
-from dataclasses import dataclass, field
-
-from fastapi import APIRouter, Depends, HTTPException
-
-from api.auth import get_optional_user, update_user_profile
-from api.schemas import ActionType, GameStateResponse, MoveRequest, SensesPayload, StartRequest
+from dataclasses import asdict, dataclass
+from typing import get_args
+
+from fastapi import APIRouter, Depends, HTTPException, Response, WebSocket, WebSocketDisconnect
+from starlette.status import WS_1008_POLICY_VIOLATION
+
+from api import executors, inference
+from api.auth import get_optional_user, verification_stats
+from api.latency import move_latency
+from api.profile_writer import profile_writer
+from api.schemas import (
+    ActionType,
+    AuthCacheStats,
+    GameStateDelta,
+    GameStateResponse,
+    MoveLatency,
+    MoveRequest,
+    SensesPayload,
+    StartRequest,
+)
+from api.sessions import SessionConflictError, SessionState, create_session_store
 from api.telemetry import enqueue_stats
+from api.tokens import decode_state_token, encode_state_token
 from engine.entities import Direction, Position
-from engine.game_state import GameEngine
+from engine.game_state import GameEngine, GameStatus
 from rl import model_registry
-
-
-@dataclass
-class SessionState:
-    engine: GameEngine
-    turn: int = 0
-    arrows_remaining: int = 1
-    explored_tiles: list[tuple[int, int]] = field(default_factory=lambda: [(0, 0)])
-    explored_set: set[tuple[int, int]] = field(default_factory=lambda: {(0, 0)})
-    message: str = "The hunt begins. Find the gold. Survive."
-    user_id: str | None = None
-    pacing_interval: int = 1
-    difficulty: str = "medium"
+from rl.observation import write_engine_observations
 
 
 PACING_BY_DIFFICULTY: dict[str, int] = {
@@ -32,8 +39,16 @@ PACING_BY_DIFFICULTY: dict[str, int] = {
 }
 
 
+# Close code for a WebSocket opened on a game this server does not know.
+WS_GAME_NOT_FOUND = 4404
+# Clients offer this subprotocol plus ``WS_TOKEN_PREFIX + <ID token>``; the
+# server accepts with ``WS_SUBPROTOCOL`` so the token is never echoed back.
+WS_SUBPROTOCOL = "wumpus"
+WS_TOKEN_PREFIX = "bearer."
+
 router = APIRouter()
-_sessions: dict[str, SessionState] = {}
+_sessions = create_session_store()
+_ACTIONS: frozenset[str] = frozenset(get_args(ActionType))
 
 
 def _to_pair(position: Position) -> tuple[int, int]:
@@ -104,35 +119,6 @@ def _direction_label(direction: Direction) -> str:
     return "WEST"
 
 
-def _arrow_hits_wumpus(engine: GameEngine, direction: Direction) -> int | None:
-    """Return index of first wumpus hit by an arrow, or None."""
-    player = engine.player_pos
-    for i, wumpus in enumerate(engine.wumpus_positions):
-        hit = False
-        if direction == Direction.NORTH:
-            hit = player.x == wumpus.x and wumpus.y < player.y
-        elif direction == Direction.SOUTH:
-            hit = player.x == wumpus.x and wumpus.y > player.y
-        elif direction == Direction.EAST:
-            hit = player.y == wumpus.y and wumpus.x > player.x
-        elif direction == Direction.WEST:
-            hit = player.y == wumpus.y and wumpus.x < player.x
-        if hit:
-            return i
-    return None
-
-
-def _observation_state_for_wumpus(
-    engine: GameEngine, wumpus_pos: Position,
-) -> dict[str, object]:
-    return {
-        "grid_size": engine.size,
-        "player_pos": [engine.player_pos.x, engine.player_pos.y],
-        "wumpus_pos": [wumpus_pos.x, wumpus_pos.y],
-        "scent_grid": [row[:] for row in engine.scent_grid],
-    }
-
-
 def _build_response(
     game_id: str,
     session: SessionState,
@@ -154,17 +140,152 @@ def _build_response(
     )
 
 
-def _require_session(game_id: str) -> SessionState:
-    if game_id not in _sessions:
+@dataclass(frozen=True)
+class _Baseline:
+    """What the client already holds, captured before a turn is played."""
+
+    turn: int
+    status: str
+    player_pos: tuple[int, int]
+    arrows_remaining: int
+    wumpuses_remaining: int
+    explored_count: int
+
+
+def _baseline(session: SessionState, known_turn: int | None) -> _Baseline | None:
+    # A client that is behind (or asks for no delta) gets a full snapshot.
+    if known_turn is None or known_turn != session.turn:
+        return None
+    return _Baseline(
+        turn=session.turn,
+        status=session.engine.status,
+        player_pos=_to_pair(session.engine.player_pos),
+        arrows_remaining=session.arrows_remaining,
+        wumpuses_remaining=len(session.engine.wumpus_positions),
+        explored_count=len(session.explored_tiles),
+    )
+
+
+# Built on every move, so not frozen: frozen dataclasses construct ~4x slower.
+@dataclass(slots=True)
+class _TurnUndo:
+    """The state a turn changes before it awaits inference, to undo a failed turn."""
+
+    turn: int
+    arrows_remaining: int
+    message: str
+    explored_count: int
+    status: GameStatus
+    player_pos: Position
+    pending_trail: Position | None
+    wumpus_positions: tuple[Position, ...]
+
+    @classmethod
+    def capture(cls, session: SessionState) -> _TurnUndo:
+        engine = session.engine
+        return cls(
+            turn=session.turn,
+            arrows_remaining=session.arrows_remaining,
+            message=session.message,
+            explored_count=len(session.explored_tiles),
+            status=engine.status,
+            player_pos=engine.player_pos,
+            pending_trail=engine.pending_player_trail,
+            wumpus_positions=tuple(engine.wumpus_positions),
+        )
+
+    def restore(self, session: SessionState) -> None:
+        session.turn = self.turn
+        session.arrows_remaining = self.arrows_remaining
+        session.message = self.message
+        for tile in session.explored_tiles[self.explored_count:]:
+            session.explored_set.discard(tile)
+        del session.explored_tiles[self.explored_count:]
+        engine = session.engine
+        engine.status = self.status
+        engine.player_pos = self.player_pos
+        engine.pending_player_trail = self.pending_trail
+        if len(engine.wumpus_positions) != len(self.wumpus_positions):
+            engine.wumpus_positions = list(self.wumpus_positions)
+
+
+def _build_delta(
+    game_id: str,
+    session: SessionState,
+    baseline: _Baseline,
+    senses_override: dict[str, bool | str | None] | None = None,
+) -> GameStateDelta:
+    senses = senses_override or session.engine.get_senses(session.engine.player_pos)
+    changed: dict[str, object] = {}
+    if session.engine.status != baseline.status:
+        changed["status"] = session.engine.status
+    player_pos = _to_pair(session.engine.player_pos)
+    if player_pos != baseline.player_pos:
+        changed["player_pos"] = player_pos
+    if session.arrows_remaining != baseline.arrows_remaining:
+        changed["arrows_remaining"] = session.arrows_remaining
+    wumpuses_remaining = len(session.engine.wumpus_positions)
+    if wumpuses_remaining != baseline.wumpuses_remaining:
+        changed["wumpuses_remaining"] = wumpuses_remaining
+    return GameStateDelta(
+        game_id=game_id,
+        delta=True,
+        turn=session.turn,
+        since_turn=baseline.turn,
+        new_explored_tiles=session.explored_tiles[baseline.explored_count:],
+        senses=SensesPayload(**senses),
+        message=session.message,
+        **changed,
+    )
+
+
+def _reply(
+    game_id: str,
+    session: SessionState,
+    baseline: _Baseline | None,
+    senses_override: dict[str, bool | str | None] | None = None,
+) -> GameStateResponse | GameStateDelta:
+    if baseline is None:
+        return _build_response(game_id, session, senses_override)
+    return _build_delta(game_id, session, baseline, senses_override)
+
+
+def _reply_json(reply: GameStateResponse | GameStateDelta) -> str:
+    if isinstance(reply, GameStateDelta):
+        return reply.model_dump_json(exclude_unset=True)
+    return reply.model_dump_json()
+
+
+async def _require_known(game_id: str) -> None:
+    if not await _sessions.contains_async(game_id):
+        raise HTTPException(status_code=404, detail="Game not found.")
+
+
+async def _require_session(game_id: str) -> SessionState:
+    session = await _sessions.get_async(game_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Game not found.")
+    return session
+
+
+async def _save(game_id: str, session: SessionState) -> None:
+    try:
+        await _sessions.save_async(game_id, session)
+    except KeyError:
+        # Expired or evicted by a sweep while the turn was being played.
         raise HTTPException(status_code=404, detail="Game not found.")
-    return _sessions[game_id]
+    except SessionConflictError:
+        # Another worker played this turn first; its result stands.
+        raise HTTPException(
+            status_code=409, detail="Game was updated by another request; reload it.",
+        )
 
 
 def _maybe_update_profile(session: SessionState) -> None:
     if session.user_id is None:
         return
     won = session.engine.status in ("PlayerWon", "WumpusKilled")
-    update_user_profile(session.user_id, "", won)
+    profile_writer.record(session.user_id, "", won)
 
 
 _ENTITY_COUNTS: dict[str, tuple[tuple[int, int], tuple[int, int]]] = {
@@ -174,18 +295,21 @@ _ENTITY_COUNTS: dict[str, tuple[tuple[int, int], tuple[int, int]]] = {
 }
 
 
-def _get_entity_counts(difficulty: str, grid_size: int) -> tuple[int, int]:
+def _get_entity_counts(
+    difficulty: str, grid_size: int, rng: random.Random,
+) -> tuple[int, int]:
     """Return (wumpus_count, pit_count) for the given difficulty."""
     if difficulty in _ENTITY_COUNTS:
         (wmin, wmax), (pmin, pmax) = _ENTITY_COUNTS[difficulty]
-        return random.randint(wmin, wmax), random.randint(pmin, pmax)
+        return rng.randint(wmin, wmax), rng.randint(pmin, pmax)
     # Easy/Medium/Hard: 1 wumpus, standard pit formula
     pit_count = max(2, min(8, int(grid_size * 0.2)))
     return 1, pit_count
 
 
 def _fire_telemetry(session: SessionState) -> None:
-    enqueue_stats(
+    executors.submit_io(
+        enqueue_stats,
         user_id=session.user_id,
         difficulty=session.difficulty,
         status=session.engine.status,
@@ -198,14 +322,33 @@ def _fire_telemetry(session: SessionState) -> None:
     )
 
 
+def _record_result(session: SessionState) -> None:
+    _maybe_update_profile(session)
+    _fire_telemetry(session)
+
+
 @router.post("/game/start", response_model=GameStateResponse)
 async def start_game(
     request: StartRequest,
     user_id: str | None = Depends(get_optional_user),
 ) -> GameStateResponse:
-    wumpus_count, pit_count = _get_entity_counts(request.difficulty, request.grid_size)
+    """Deal a new game.
+
+    With ``stateless`` the game lives only in the returned ``state_token``.
+    The server keeps no record of it, so it cannot tell a fresh token from
+    an older one: resending a token replays that turn, and resending one
+    from before a loss undoes it. Stateless games are therefore practice
+    games. Their results never count towards the player's profile stats
+    or telemetry.
+    """
+    # One seed per game fixes both the entity counts and the board, so a game
+    # can be replayed from its seed alone.
+    seed = secrets.randbits(63)
+    wumpus_count, pit_count = _get_entity_counts(
+        request.difficulty, request.grid_size, random.Random(seed),
+    )
     engine = GameEngine(
-        size=request.grid_size, num_pits=pit_count, num_wumpuses=wumpus_count,
+        size=request.grid_size, num_pits=pit_count, num_wumpuses=wumpus_count, seed=seed,
     )
     game_id = str(uuid.uuid4())
     pacing = PACING_BY_DIFFICULTY.get(request.difficulty, 1)
@@ -214,8 +357,13 @@ async def start_game(
         user_id=user_id,
         difficulty=request.difficulty,
         pacing_interval=pacing,
+        seed=seed,
     )
-    _sessions[game_id] = session
+    if request.stateless:
+        response = _build_response(game_id, session)
+        response.state_token = encode_state_token(game_id, session)
+        return response
+    await _sessions.add_async(game_id, session)
     return _build_response(game_id, session)
 
 
@@ -223,10 +371,127 @@ async def start_game(
 async def move(
     request: MoveRequest,
     user_id: str | None = Depends(get_optional_user),
-) -> GameStateResponse:
-    session = _require_session(request.game_id)
-    if user_id is not None:
-        session.user_id = user_id
+) -> GameStateResponse | Response:
+    if request.state_token is not None:
+        reply = await _play_stateless_turn(request, request.state_token)
+    else:
+        reply = await _take_turn(request, user_id)
+    if isinstance(reply, GameStateDelta):
+        # Deltas bypass response_model so unchanged fields stay off the wire.
+        return Response(_reply_json(reply), media_type="application/json")
+    return reply
+
+
+async def _take_turn(
+    request: MoveRequest, user_id: str | None,
+) -> GameStateResponse | GameStateDelta:
+    await _require_known(request.game_id)
+    # Turns of one game must not interleave while waiting on inference, and
+    # the session is read under the lock so it reflects the previous turn.
+    async with _sessions.lock(request.game_id):
+        session = await _require_session(request.game_id)
+        if user_id is not None:
+            session.user_id = user_id
+        undo = _TurnUndo.capture(session)
+        try:
+            reply = await _play_turn(request, session, _baseline(session, request.known_turn))
+        except BaseException:
+            # The in-memory store hands out live objects: undo whatever part
+            # of the turn was applied so a failed move leaves no trace.
+            undo.restore(session)
+            raise
+        await _save(request.game_id, session)
+        return reply
+
+
+@router.websocket("/game/ws/{game_id}")
+async def game_channel(websocket: WebSocket, game_id: str) -> None:
+    """Play a game over one connection: auth once, then one frame per move.
+
+    Each text frame is ``{"player_action": ..., "known_turn": ...}`` and is
+    answered, in order, with the ``GameStateResponse`` (or, when
+    ``known_turn`` is current, ``GameStateDelta``) JSON or
+    ``{"error": ..., "status_code": ...}``.
+    Browsers cannot set headers on a WebSocket, so the ID token comes as a
+    ``Sec-WebSocket-Protocol`` entry, ``bearer.<token>``, offered alongside
+    ``wumpus``; an ``Authorization`` header also works. Tokens are never
+    taken from the URL, which proxies and access logs record.
+    """
+    offered: list[str] = websocket.scope.get("subprotocols", [])
+    authorization = websocket.headers.get("authorization")
+    if authorization is None:
+        authorization = next(
+            (
+                f"Bearer {protocol[len(WS_TOKEN_PREFIX):]}"
+                for protocol in offered
+                if protocol.startswith(WS_TOKEN_PREFIX)
+            ),
+            None,
+        )
+    try:
+        user_id = await get_optional_user(authorization)
+    except HTTPException:
+        await websocket.close(code=WS_1008_POLICY_VIOLATION)
+        return
+    if not await _sessions.contains_async(game_id):
+        await websocket.close(code=WS_GAME_NOT_FOUND)
+        return
+
+    await websocket.accept(subprotocol=WS_SUBPROTOCOL if WS_SUBPROTOCOL in offered else None)
+    try:
+        while True:
+            frame = await websocket.receive_text()
+            started = time.perf_counter()
+            await websocket.send_text(await _channel_reply(game_id, frame, user_id))
+            move_latency.record("websocket", time.perf_counter() - started)
+    except WebSocketDisconnect:
+        pass
+
+
+async def _channel_reply(game_id: str, frame: str, user_id: str | None) -> str:
+    try:
+        body = json.loads(frame)
+        action = body.get("player_action")
+        known_turn = body.get("known_turn")
+    except (ValueError, AttributeError):
+        action = known_turn = None
+    if action not in _ACTIONS:
+        return json.dumps({"error": "Unknown action.", "status_code": 422})
+    # The frame is already checked, so skip re-validating the request model.
+    request = MoveRequest.model_construct(
+        game_id=game_id,
+        player_action=action,
+        known_turn=known_turn if isinstance(known_turn, int) else None,
+    )
+    try:
+        reply = await _take_turn(request, user_id)
+    except HTTPException as exc:
+        return json.dumps({"error": exc.detail, "status_code": exc.status_code})
+    return _reply_json(reply)
+
+
+async def _play_stateless_turn(
+    request: MoveRequest, state_token: str,
+) -> GameStateResponse | GameStateDelta:
+    # Everything about the game is in the token, so no store or lock is needed.
+    try:
+        session = decode_state_token(state_token, request.game_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid game token.")
+    # A token can be resent to replay a turn, so its results are not credited.
+    reply = await _play_turn(
+        request, session, _baseline(session, request.known_turn), record_result=False,
+    )
+    reply.state_token = encode_state_token(request.game_id, session)
+    return reply
+
+
+async def _play_turn(
+    request: MoveRequest,
+    session: SessionState,
+    baseline: _Baseline | None = None,
+    record_result: bool = True,
+) -> GameStateResponse | GameStateDelta:
     if session.engine.status != "Ongoing":
         raise HTTPException(status_code=400, detail="Game is already over.")
 
@@ -239,7 +504,7 @@ async def move(
         if session.arrows_remaining == 0:
             raise HTTPException(status_code=400, detail="No arrows remaining.")
         session.arrows_remaining = 0
-        hit_index = _arrow_hits_wumpus(session.engine, direction)
+        hit_index = session.engine.arrow_hit(direction)
         if hit_index is not None:
             session.engine.remove_wumpus(hit_index)
             if len(session.engine.wumpus_positions) == 0:
@@ -264,17 +529,27 @@ async def move(
             pre_wumpus_senses = session.engine.get_senses(session.engine.player_pos)
 
     if session.engine.status != "Ongoing":
-        _maybe_update_profile(session)
-        _fire_telemetry(session)
-        return _build_response(request.game_id, session, response_senses_override)
+        if record_result:
+            _record_result(session)
+        return _reply(request.game_id, session, baseline, response_senses_override)
 
     should_move_wumpus = session.turn % session.pacing_interval == 0
     if should_move_wumpus:
-        agent = model_registry.load_model(session.difficulty)
-        for i, wp in enumerate(session.engine.wumpus_positions):
-            obs_state = _observation_state_for_wumpus(session.engine, wp)
-            obs = agent.build_observation(obs_state)
-            wumpus_action = agent.get_wumpus_action(obs)
+        # Observations only depend on the scent grid and each wumpus' own
+        # cell, so every wumpus can be decided before any of them moves.
+        observations = write_engine_observations(session.engine)
+        table = model_registry.load_action_table(session.difficulty, session.engine.size)
+        if table is not None:
+            actions = table.predict_observations(observations)
+        else:
+            try:
+                actions = await inference.scheduler.predict(session.difficulty, observations)
+            except Exception as exc:
+                # Already logged by the scheduler; the caller rolls the turn back.
+                raise HTTPException(
+                    status_code=503, detail="The Wumpus could not move; try again.",
+                ) from exc
+        for i, wumpus_action in enumerate(actions):
             session.engine.move_wumpus(i, wumpus_action)
         session.engine.status = session.engine.check_game_over()
     session.engine._update_scent()
@@ -298,13 +573,24 @@ async def move(
         else:
             session.message = _status_message(session.engine.status)
 
-    if session.engine.status != "Ongoing":
-        _maybe_update_profile(session)
-        _fire_telemetry(session)
-    return _build_response(request.game_id, session, response_senses_override)
+    if session.engine.status != "Ongoing" and record_result:
+        _record_result(session)
+    return _reply(request.game_id, session, baseline, response_senses_override)
 
 
 @router.get("/game/{game_id}/status", response_model=GameStateResponse)
-def get_status(game_id: str) -> GameStateResponse:
-    session = _require_session(game_id)
-    return _build_response(game_id, session)
+async def get_status(game_id: str) -> GameStateResponse:
+    await _require_known(game_id)
+    # Never report a turn that is still half-resolved.
+    async with _sessions.lock(game_id):
+        return _build_response(game_id, await _require_session(game_id))
+
+
+@router.get("/metrics/move-latency", response_model=list[MoveLatency])
+async def get_move_latency() -> list[MoveLatency]:
+    return [MoveLatency(**asdict(stats)) for stats in move_latency.stats()]
+
+
+@router.get("/metrics/auth-cache", response_model=AuthCacheStats)
+async def get_auth_cache_stats() -> AuthCacheStats:
+    return AuthCacheStats(**asdict(verification_stats()))
@@ -37,11 +37,23 @@ DifficultyType = Literal[
 class StartRequest(BaseModel):
     grid_size: int = Field(default=10, ge=4, le=16)
     difficulty: DifficultyType = "medium"
+    stateless: bool = Field(
+        default=False,
+        description=(
+            "Keep the game in a sealed state_token instead of a server session. "
+            "Tokens can be replayed, so stateless results are not credited to "
+            "profile stats or telemetry."
+        ),
+    )
 
 
 class MoveRequest(BaseModel):
     game_id: str
     player_action: ActionType
+    state_token: str | None = None
+    # The turn of the last state the client holds; when it is current the
+    # reply is a ``GameStateDelta`` against it, otherwise a full snapshot.
+    known_turn: int | None = None
 
 
 class SensesPayload(BaseModel):
@@ -62,3 +74,43 @@ class GameStateResponse(BaseModel):
     senses: SensesPayload
     message: str
     wumpuses_remaining: int = 1
+    state_token: str | None = None
+
+
+class GameStateDelta(BaseModel):
+    """Changes since ``since_turn``; only fields that changed are serialised."""
+
+    game_id: str
+    delta: Literal[True] = True
+    turn: int
+    since_turn: int
+    new_explored_tiles: list[tuple[int, int]]
+    senses: SensesPayload
+    message: str
+    status: GameStatus | None = None
+    player_pos: tuple[int, int] | None = None
+    arrows_remaining: int | None = None
+    wumpuses_remaining: int | None = None
+    state_token: str | None = None
+
+
+class MoveLatency(BaseModel):
+    transport: str
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class AuthCacheStats(BaseModel):
+    hits: int
+    misses: int
+    hit_ratio: float
+    entries: int
+    evicted_total: int
+    verify_count: int
+    verify_mean_ms: float
+    verify_p95_ms: float
+    verify_max_ms: float
@@ -0,0 +1,370 @@
+"""Game sessions with expiry, an LRU cap and per-session locks.
+
+``SESSION_BACKEND=memory`` (default) keeps sessions in this process;
+``SESSION_BACKEND=sqlite`` shares them between workers and restarts through
+the database at ``SESSION_DB_PATH`` (see ``api.sqlite_sessions``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from engine.codec import decode_engine_from, encode_engine
+from engine.game_state import GameEngine
+
+if TYPE_CHECKING:
+    from api.sqlite_sessions import SqliteSessionStore
+
+logger = logging.getLogger(__name__)
+
+SESSION_IDLE_TTL_SECONDS = float(os.getenv("SESSION_IDLE_TTL_SECONDS", "1800"))
+SESSION_TERMINAL_TTL_SECONDS = float(os.getenv("SESSION_TERMINAL_TTL_SECONDS", "300"))
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "10000"))
+SESSION_SWEEP_INTERVAL_SECONDS = float(os.getenv("SESSION_SWEEP_INTERVAL_SECONDS", "60"))
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")
+SESSION_DB_PATH = os.getenv(
+    "SESSION_DB_PATH", str(Path(__file__).resolve().parents[1] / "sessions.db"),
+)
+
+
+class SessionConflictError(Exception):
+    """Another worker saved the game since this one read it."""
+
+    def __init__(self, game_id: str) -> None:
+        super().__init__(f"Game {game_id} was updated by another request")
+        self.game_id = game_id
+
+
+@dataclass
+class SessionState:
+    engine: GameEngine
+    turn: int = 0
+    arrows_remaining: int = 1
+    explored_tiles: list[tuple[int, int]] = field(default_factory=lambda: [(0, 0)])
+    explored_set: set[tuple[int, int]] = field(default_factory=lambda: {(0, 0)})
+    message: str = "The hunt begins. Find the gold. Survive."
+    user_id: str | None = None
+    pacing_interval: int = 1
+    difficulty: str = "medium"
+    seed: int | None = None
+
+
+SESSION_CODEC_VERSION = 1
+# version, turn, arrows, pacing, has seed, seed, explored count
+_SESSION_HEADER = struct.Struct("<BIBBBqH")
+
+
+def _pack_text(value: str) -> bytes:
+    encoded = value.encode("utf-8")
+    return struct.pack("<H", len(encoded)) + encoded
+
+
+def _unpack_text(data: bytes | memoryview, offset: int) -> tuple[str, int]:
+    (length,) = struct.unpack_from("<H", data, offset)
+    offset += 2
+    return bytes(data[offset:offset + length]).decode("utf-8"), offset + length
+
+
+def encode_session(session: SessionState) -> bytes:
+    """Binary snapshot: header, explored cells in order, texts, then the engine."""
+    size = session.engine.size
+    explored = [y * size + x for x, y in session.explored_tiles]
+    return b"".join(
+        (
+            _SESSION_HEADER.pack(
+                SESSION_CODEC_VERSION,
+                session.turn,
+                session.arrows_remaining,
+                session.pacing_interval,
+                session.seed is not None,
+                session.seed or 0,
+                len(explored),
+            ),
+            struct.pack(f"<{len(explored)}H", *explored),
+            _pack_text(session.message),
+            _pack_text(session.difficulty),
+            _pack_text(session.user_id or ""),
+            encode_engine(session.engine),
+        )
+    )
+
+
+def decode_session(data: bytes | memoryview) -> SessionState:
+    """Inverse of ``encode_session``; raises ``ValueError`` on bad input."""
+    try:
+        (
+            version, turn, arrows, pacing, has_seed, seed, explored_count,
+        ) = _SESSION_HEADER.unpack_from(data, 0)
+        if version != SESSION_CODEC_VERSION:
+            raise ValueError(f"Unsupported session snapshot version {version}")
+        offset = _SESSION_HEADER.size
+        explored = struct.unpack_from(f"<{explored_count}H", data, offset)
+        offset += 2 * explored_count
+        message, offset = _unpack_text(data, offset)
+        difficulty, offset = _unpack_text(data, offset)
+        user_id, offset = _unpack_text(data, offset)
+        engine, _ = decode_engine_from(data, offset)
+    except struct.error as exc:
+        raise ValueError("Truncated session snapshot") from exc
+
+    coordinates = engine.topology.coordinates
+    tiles = [coordinates[cell] for cell in explored]
+    return SessionState(
+        engine=engine,
+        turn=turn,
+        arrows_remaining=arrows,
+        explored_tiles=tiles,
+        explored_set=set(tiles),
+        message=message,
+        user_id=user_id or None,
+        pacing_interval=pacing,
+        difficulty=difficulty,
+        seed=seed if has_seed else None,
+    )
+
+
+@dataclass(frozen=True)
+class SessionStats:
+    sessions: int
+    ongoing: int
+    finished: int
+    locked: int
+    expired_total: int
+    evicted_total: int
+    approx_bytes: int
+
+
+def _session_bytes(session: SessionState) -> int:
+    """Rough footprint of one session's mutable state."""
+    engine = session.engine
+    return (
+        sys.getsizeof(session)
+        + sys.getsizeof(engine)
+        + sys.getsizeof(session.explored_tiles)
+        + sys.getsizeof(session.explored_set)
+        + sys.getsizeof(engine.pits)
+        + sys.getsizeof(engine.wumpus_positions)
+        + sys.getsizeof(engine.wumpus_visited)
+        + sys.getsizeof(session.message)
+    )
+
+
+class _SweptStore(ABC):
+    """Runs ``sweep`` periodically on the event loop.
+
+    Request handlers go through the ``*_async`` methods; a store that blocks
+    on I/O overrides them to do its work on a thread.
+    """
+
+    _sweeper: asyncio.Task[None] | None = None
+
+    @abstractmethod
+    def __contains__(self, game_id: object) -> bool: ...
+
+    @abstractmethod
+    def add(self, game_id: str, session: SessionState) -> None: ...
+
+    @abstractmethod
+    def get(self, game_id: str) -> SessionState | None: ...
+
+    @abstractmethod
+    def save(self, game_id: str, session: SessionState) -> None: ...
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Drop expired sessions; returns how many were removed."""
+
+    async def contains_async(self, game_id: str) -> bool:
+        return game_id in self
+
+    async def add_async(self, game_id: str, session: SessionState) -> None:
+        self.add(game_id, session)
+
+    async def get_async(self, game_id: str) -> SessionState | None:
+        return self.get(game_id)
+
+    async def save_async(self, game_id: str, session: SessionState) -> None:
+        self.save(game_id, session)
+
+    async def sweep_async(self) -> int:
+        return self.sweep()
+
+    async def _sweep_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            removed = await self.sweep_async()
+            if removed:
+                logger.info("Expired %d sessions", removed)
+
+    def start_sweeper(self, interval: float = SESSION_SWEEP_INTERVAL_SECONDS) -> None:
+        """Sweep every ``interval`` seconds on the running event loop."""
+        if self._sweeper is None and interval > 0:
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep_forever(interval))
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        try:
+            await self._sweeper
+        except asyncio.CancelledError:
+            pass
+        self._sweeper = None
+
+
+class SessionStore(_SweptStore):
+    """Sessions in least-recently-used order.
+
+    Ongoing games expire after ``idle_ttl`` seconds without a request and
+    finished ones after ``terminal_ttl``; once ``max_sessions`` is exceeded
+    the least recently used session is dropped. Sessions whose lock is held
+    are never expired by a sweep nor evicted by the cap.
+    """
+
+    def __init__(
+        self,
+        idle_ttl: float = SESSION_IDLE_TTL_SECONDS,
+        terminal_ttl: float = SESSION_TERMINAL_TTL_SECONDS,
+        max_sessions: int = MAX_SESSIONS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be >= 1")
+        self.idle_ttl = idle_ttl
+        self.terminal_ttl = terminal_ttl
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._sessions: OrderedDict[str, SessionState] = OrderedDict()
+        self._last_access: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._expired_total = 0
+        self._evicted_total = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, game_id: object) -> bool:
+        return game_id in self._sessions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._sessions))
+
+    def __getitem__(self, game_id: str) -> SessionState:
+        session = self.get(game_id)
+        if session is None:
+            raise KeyError(game_id)
+        return session
+
+    def __setitem__(self, game_id: str, session: SessionState) -> None:
+        self.add(game_id, session)
+
+    def add(self, game_id: str, session: SessionState) -> None:
+        self._sessions[game_id] = session
+        self._sessions.move_to_end(game_id)
+        self._last_access[game_id] = self._clock()
+        excess = len(self._sessions) - self.max_sessions
+        if excess <= 0:
+            return
+        # Oldest first, skipping games with a request in flight; if they are
+        # all busy the store stays over the cap until the next add.
+        victims = [
+            candidate for candidate in self._sessions
+            if candidate != game_id and not self._is_locked(candidate)
+        ][:excess]
+        for victim in victims:
+            self._remove(victim)
+        self._evicted_total += len(victims)
+
+    def get(self, game_id: str) -> SessionState | None:
+        """Return the session and mark it as just used."""
+        session = self._sessions.get(game_id)
+        if session is not None:
+            self._sessions.move_to_end(game_id)
+            self._last_access[game_id] = self._clock()
+        return session
+
+    def lock(self, game_id: str) -> asyncio.Lock:
+        """The lock serialising requests for ``game_id``.
+
+        Unknown ids get a throwaway lock, so probing ids leaves nothing behind.
+        """
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            if game_id in self._sessions:
+                self._locks[game_id] = lock
+        return lock
+
+    def _is_locked(self, game_id: str) -> bool:
+        lock = self._locks.get(game_id)
+        return lock is not None and lock.locked()
+
+    def save(self, game_id: str, session: SessionState) -> None:
+        """Persist ``session`` after a change; objects here are already live."""
+
+    def pop(self, game_id: str) -> SessionState | None:
+        return self._remove(game_id)
+
+    def close(self) -> None:
+        """Nothing to release for an in-memory store."""
+
+    def clear(self) -> None:
+        self._sessions.clear()
+        self._last_access.clear()
+        self._locks.clear()
+
+    def _remove(self, game_id: str) -> SessionState | None:
+        self._last_access.pop(game_id, None)
+        self._locks.pop(game_id, None)
+        return self._sessions.pop(game_id, None)
+
+    def sweep(self) -> int:
+        """Drop expired sessions; returns how many were removed."""
+        now = self._clock()
+        expired = []
+        for game_id, session in self._sessions.items():
+            ttl = self.idle_ttl if session.engine.status == "Ongoing" else self.terminal_ttl
+            if now - self._last_access[game_id] < ttl:
+                continue
+            if self._is_locked(game_id):
+                continue
+            expired.append(game_id)
+        for game_id in expired:
+            self._remove(game_id)
+        self._expired_total += len(expired)
+        return len(expired)
+
+    def stats(self) -> SessionStats:
+        ongoing = sum(1 for s in self._sessions.values() if s.engine.status == "Ongoing")
+        return SessionStats(
+            sessions=len(self._sessions),
+            ongoing=ongoing,
+            finished=len(self._sessions) - ongoing,
+            locked=sum(1 for lock in self._locks.values() if lock.locked()),
+            expired_total=self._expired_total,
+            evicted_total=self._evicted_total,
+            approx_bytes=sys.getsizeof(self._sessions)
+            + sum(_session_bytes(s) for s in self._sessions.values()),
+        )
+
+
+def create_session_store() -> SessionStore | SqliteSessionStore:
+    """The store selected by ``SESSION_BACKEND``."""
+    if SESSION_BACKEND == "memory":
+        return SessionStore()
+    if SESSION_BACKEND == "sqlite":
+        from api.sqlite_sessions import SqliteSessionStore
+
+        return SqliteSessionStore(SESSION_DB_PATH)
+    raise ValueError(f"Unknown SESSION_BACKEND {SESSION_BACKEND!r}")
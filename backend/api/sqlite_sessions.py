@@ -0,0 +1,266 @@
+"""SQLite session store shared by every worker process.
+
+Sessions are stored as ``encode_session`` blobs in a WAL-mode database, so
+readers in other workers never block on a writer and games survive
+restarts. Every row carries a ``version`` that each save bumps with a
+compare-and-swap: ``get`` remembers the version it read and ``save``
+writes before the move response goes out, only if the row still has that
+version. When two workers play the same turn of a game, the second save
+raises ``SessionConflictError`` instead of overwriting the first, so any
+worker can serve any game.
+
+The ``*_async`` methods run the queries on a thread: with ``busy_timeout``
+a locked database can stall a call for seconds, which must not stall the
+event loop. A game trimmed or expired by another worker's sweep while this
+worker was playing its turn makes ``save`` raise ``KeyError`` rather than a
+conflict, because there is nothing left to reload.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from api.sessions import (
+    MAX_SESSIONS,
+    SESSION_IDLE_TTL_SECONDS,
+    SESSION_TERMINAL_TTL_SECONDS,
+    SessionConflictError,
+    SessionState,
+    SessionStats,
+    _SweptStore,
+    decode_session,
+    encode_session,
+)
+
+# Fixed statement texts so sqlite3's statement cache keeps them prepared.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    game_id TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    finished INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (finished, updated_at)"
+_SELECT = "SELECT data, version FROM sessions WHERE game_id = ?"
+_EXISTS = "SELECT 1 FROM sessions WHERE game_id = ?"
+_INSERT = (
+    "INSERT OR REPLACE INTO sessions (game_id, data, finished, updated_at, version) "
+    "VALUES (?, ?, ?, ?, 0)"
+)
+_UPDATE = (
+    "UPDATE sessions SET data = ?, finished = ?, updated_at = ?, version = version + 1 "
+    "WHERE game_id = ? AND version = ?"
+)
+_DELETE = "DELETE FROM sessions WHERE game_id = ?"
+_EXPIRE = "DELETE FROM sessions WHERE finished = ? AND updated_at < ?"
+_TRIM = (
+    "DELETE FROM sessions WHERE game_id IN ("
+    "SELECT game_id FROM sessions ORDER BY updated_at DESC LIMIT -1 OFFSET ?)"
+)
+_STATS = "SELECT COUNT(*), COALESCE(SUM(finished), 0), COALESCE(SUM(LENGTH(data)), 0) FROM sessions"
+
+
+def _connect(path: str | Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        str(path), isolation_level=None, check_same_thread=False, cached_statements=64,
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    return conn
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+    if "version" not in columns:
+        conn.execute("ALTER TABLE sessions ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+
+class SqliteSessionStore(_SweptStore):
+    """``SessionStore`` interface backed by SQLite with versioned saves."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        idle_ttl: float = SESSION_IDLE_TTL_SECONDS,
+        terminal_ttl: float = SESSION_TERMINAL_TTL_SECONDS,
+        max_sessions: int = MAX_SESSIONS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be >= 1")
+        self.path = Path(path)
+        self.idle_ttl = idle_ttl
+        self.terminal_ttl = terminal_ttl
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._conn = _connect(self.path)
+        self._conn.execute(_SCHEMA)
+        _migrate(self._conn)
+        self._conn.execute(_INDEX)
+        self._db_lock = threading.Lock()
+        # game_id -> row version this worker last read or wrote
+        self._versions: dict[str, int] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._expired_total = 0
+        self._evicted_total = 0
+        self._closed = False
+
+    def __contains__(self, game_id: object) -> bool:
+        if not isinstance(game_id, str):
+            return False
+        with self._db_lock:
+            return self._conn.execute(_EXISTS, (game_id,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.stats().sessions
+
+    def __getitem__(self, game_id: str) -> SessionState:
+        session = self.get(game_id)
+        if session is None:
+            raise KeyError(game_id)
+        return session
+
+    def __setitem__(self, game_id: str, session: SessionState) -> None:
+        self.add(game_id, session)
+
+    def add(self, game_id: str, session: SessionState) -> None:
+        """Store a new game (replacing any row with the same id)."""
+        row = (
+            game_id,
+            encode_session(session),
+            int(session.engine.status != "Ongoing"),
+            self._clock(),
+        )
+        with self._db_lock:
+            self._conn.execute(_INSERT, row)
+        self._versions[game_id] = 0
+
+    def get(self, game_id: str) -> SessionState | None:
+        """Read the latest saved state and remember its version for ``save``."""
+        with self._db_lock:
+            row = self._conn.execute(_SELECT, (game_id,)).fetchone()
+        if row is None:
+            self._versions.pop(game_id, None)
+            return None
+        self._versions[game_id] = row[1]
+        return decode_session(row[0])
+
+    async def contains_async(self, game_id: str) -> bool:
+        return await asyncio.to_thread(self.__contains__, game_id)
+
+    async def add_async(self, game_id: str, session: SessionState) -> None:
+        await asyncio.to_thread(self.add, game_id, session)
+
+    async def get_async(self, game_id: str) -> SessionState | None:
+        return await asyncio.to_thread(self.get, game_id)
+
+    async def save_async(self, game_id: str, session: SessionState) -> None:
+        await asyncio.to_thread(self.save, game_id, session)
+
+    def lock(self, game_id: str) -> asyncio.Lock:
+        """Serialises requests for ``game_id`` within this worker only."""
+        lock = self._locks.get(game_id)
+        if lock is None:
+            lock = self._locks[game_id] = asyncio.Lock()
+        return lock
+
+    def save(self, game_id: str, session: SessionState) -> None:
+        """Write ``session`` if nobody saved the game since this worker read it.
+
+        Raises ``SessionConflictError`` when another worker got there first;
+        the caller should drop its copy and read the game again. Raises
+        ``KeyError`` when the row was deleted in the meantime.
+        """
+        expected = self._versions.get(game_id)
+        if expected is None:
+            raise SessionConflictError(game_id)
+        row = (
+            encode_session(session),
+            int(session.engine.status != "Ongoing"),
+            self._clock(),
+            game_id,
+            expected,
+        )
+        with self._db_lock:
+            updated = self._conn.execute(_UPDATE, row).rowcount
+            deleted = updated != 1 and not self._conn.execute(_EXISTS, (game_id,)).fetchone()
+        if updated != 1:
+            self._versions.pop(game_id, None)
+            if deleted:
+                raise KeyError(game_id)
+            raise SessionConflictError(game_id)
+        self._versions[game_id] = expected + 1
+
+    def pop(self, game_id: str) -> SessionState | None:
+        session = self.get(game_id)
+        self._versions.pop(game_id, None)
+        self._locks.pop(game_id, None)
+        with self._db_lock:
+            self._conn.execute(_DELETE, (game_id,))
+        return session
+
+    def clear(self) -> None:
+        self._versions.clear()
+        self._locks.clear()
+        with self._db_lock:
+            self._conn.execute("DELETE FROM sessions")
+
+    def sweep(self) -> int:
+        """Delete expired rows and trim to ``max_sessions``."""
+        removed = self._delete_expired()
+        self._forget_idle()
+        return removed
+
+    async def sweep_async(self) -> int:
+        # Only the queries leave the loop; the asyncio locks stay on it.
+        removed = await asyncio.to_thread(self._delete_expired)
+        self._forget_idle()
+        return removed
+
+    def _delete_expired(self) -> int:
+        now = self._clock()
+        with self._db_lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                expired = self._conn.execute(_EXPIRE, (0, now - self.idle_ttl)).rowcount
+                expired += self._conn.execute(_EXPIRE, (1, now - self.terminal_ttl)).rowcount
+                evicted = self._conn.execute(_TRIM, (self.max_sessions,)).rowcount
+        self._expired_total += expired
+        self._evicted_total += evicted
+        return expired + evicted
+
+    def _forget_idle(self) -> None:
+        # Versions only matter between a request's get and save, under its lock.
+        for game_id in [g for g, lock in self._locks.items() if not lock.locked()]:
+            del self._locks[game_id]
+        for game_id in [g for g in self._versions if g not in self._locks]:
+            del self._versions[game_id]
+
+    def stats(self) -> SessionStats:
+        with self._db_lock:
+            count, finished, data_bytes = self._conn.execute(_STATS).fetchone()
+        return SessionStats(
+            sessions=count,
+            ongoing=count - finished,
+            finished=finished,
+            locked=sum(1 for lock in self._locks.values() if lock.locked()),
+            expired_total=self._expired_total,
+            evicted_total=self._evicted_total,
+            approx_bytes=data_bytes,
+        )
+
+    def close(self) -> None:
+        """Close the database; every save has already been written."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._db_lock:
+            self._conn.close()
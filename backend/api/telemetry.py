@@ -1,4 +1,13 @@
-"""Local-first JSONL telemetry queue with async Google Sheets batch uploader."""
+"""Local-first JSONL telemetry queue with async Google Sheets batch uploader.
+
+Finished games only append a line to an in-memory buffer. A
+``TelemetryWriter`` thread writes the buffer through one open file handle
+every ``TELEMETRY_FLUSH_INTERVAL_SECONDS`` or once ``TELEMETRY_FLUSH_RECORDS``
+lines are waiting, and seals the queue file into a numbered segment once it
+holds ``MAX_QUEUE_SIZE`` lines. The uploader seals the live file itself
+before uploading, then uploads and deletes sealed segments only, so it
+never rewrites a file the writer may still append to.
+"""
 
 from __future__ import annotations
 
@@ -15,12 +24,156 @@ logger = logging.getLogger(__name__)
 
 TELEMETRY_QUEUE_PATH = Path(__file__).resolve().parents[1] / "telemetry_queue.jsonl"
 MAX_QUEUE_SIZE = 10_000
+TELEMETRY_FLUSH_INTERVAL_SECONDS = float(os.getenv("TELEMETRY_FLUSH_INTERVAL_SECONDS", "1"))
+TELEMETRY_FLUSH_RECORDS = int(os.getenv("TELEMETRY_FLUSH_RECORDS", "256"))
 
-_write_lock = threading.Lock()
 _sheets_client: Any = None
 _sheets_inited = False
 
 
+class TelemetryWriter:
+    """Buffered appends to ``path`` through a handle kept open between flushes.
+
+    The flush thread starts with the first append. With ``flush_interval=0``,
+    or after ``close``, every append is written straight through.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = TELEMETRY_FLUSH_INTERVAL_SECONDS,
+        flush_records: int = TELEMETRY_FLUSH_RECORDS,
+        segment_records: int = MAX_QUEUE_SIZE,
+    ) -> None:
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self.segment_records = segment_records
+        self._buffer: list[str] = []
+        self._buffer_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._handle: Any = None
+        self._lines = 0
+        self._wake = threading.Event()
+        self._closed = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def append(self, line: str) -> None:
+        """Queue one line (without newline); never touches the disk when buffered."""
+        with self._buffer_lock:
+            self._buffer.append(line)
+            backlog = len(self._buffer)
+        if self.flush_interval <= 0 or self._closed.is_set():
+            self.flush()
+            return
+        if self._thread is None:
+            self._start()
+        if backlog >= self.flush_records:
+            self._wake.set()
+
+    def _start(self) -> None:
+        with self._buffer_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._flush_loop, name="telemetry-writer", daemon=True,
+            )
+            self._thread.start()
+
+    def _flush_loop(self) -> None:
+        while not self._closed.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError:
+                logger.exception("Failed to write telemetry to %s; will retry", self.path)
+
+    def _open(self) -> Any:
+        if self._handle is None:
+            self._lines = (
+                self.path.read_bytes().count(b"\n") if self.path.exists() else 0
+            )
+            self._handle = open(self.path, "a", encoding="utf-8")
+        return self._handle
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                logger.exception("Failed to close %s", self.path)
+            self._handle = None
+
+    def flush(self) -> int:
+        """Write buffered lines, sealing the file once it is full; returns the count.
+
+        If the write fails the lines go back to the front of the buffer for
+        the next flush, and the ``OSError`` is raised.
+        """
+        with self._buffer_lock:
+            lines, self._buffer = self._buffer, []
+        if not lines:
+            return 0
+        with self._file_lock:
+            try:
+                handle = self._open()
+                handle.write("\n".join(lines) + "\n")
+                handle.flush()
+            except OSError:
+                self._close_handle()
+                with self._buffer_lock:
+                    self._buffer[:0] = lines
+                raise
+            self._lines += len(lines)
+            if self._lines >= self.segment_records:
+                self._seal()
+        return len(lines)
+
+    def _seal(self) -> None:
+        self._close_handle()
+        self._lines = 0
+        if self.path.exists() and self.path.stat().st_size > 0:
+            self.path.rename(self.path.with_name(f"{self.path.stem}.{time.time_ns()}.jsonl"))
+
+    def seal(self) -> None:
+        """Flush, then close the live file into a segment, even if it is not full."""
+        self.flush()
+        with self._file_lock:
+            self._seal()
+
+    def sealed_segments(self) -> list[Path]:
+        """Full segments, oldest first."""
+        return sorted(self.path.parent.glob(f"{self.path.stem}.*.jsonl"))
+
+    def close(self) -> None:
+        """Stop the thread, write what is buffered and close the file."""
+        self._closed.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._file_lock:
+            self._close_handle()
+
+
+_writer: TelemetryWriter | None = None
+
+
+def get_writer() -> TelemetryWriter:
+    global _writer  # noqa: PLW0603
+    if _writer is None:
+        _writer = TelemetryWriter(TELEMETRY_QUEUE_PATH)
+    return _writer
+
+
+def close_writer() -> None:
+    """Drain buffered telemetry to disk; called on shutdown."""
+    if _writer is not None:
+        _writer.close()
+
+
 def enqueue_stats(
     *,
     user_id: str | None,
@@ -33,7 +186,7 @@ def enqueue_stats(
     wumpus_count: int,
     pit_count: int,
 ) -> None:
-    """Append one JSON line to the local telemetry queue file (<1ms)."""
+    """Queue one JSON line for the local telemetry file; never waits on disk."""
     entry = {
         "timestamp": datetime.now(tz=timezone.utc).isoformat(),
         "user_id": user_id or "anonymous",
@@ -47,9 +200,7 @@ def enqueue_stats(
         "pit_count": pit_count,
     }
     try:
-        with _write_lock:
-            with open(TELEMETRY_QUEUE_PATH, "a", encoding="utf-8") as fh:
-                fh.write(json.dumps(entry) + "\n")
+        get_writer().append(json.dumps(entry))
     except OSError:
         logger.warning("Failed to write telemetry entry to %s", TELEMETRY_QUEUE_PATH)
 
@@ -96,44 +247,49 @@ _COLUMNS = [
 ]
 
 
-def flush_queue() -> int:
-    """Read all lines from the JSONL queue, upload to Sheets, truncate on success.
-
-    Returns the number of rows uploaded (0 if nothing to do or on failure).
-    """
-    ws = init_sheets_client()
-    if ws is None:
-        return 0
-
-    with _write_lock:
-        if not TELEMETRY_QUEUE_PATH.exists():
-            return 0
-        raw = TELEMETRY_QUEUE_PATH.read_text(encoding="utf-8").strip()
-        if not raw:
-            return 0
-        lines = raw.splitlines()
-
+def _rows(raw: str) -> list[list[Any]]:
     rows: list[list[Any]] = []
-    for line in lines:
+    for line in raw.strip().splitlines():
         try:
             entry = json.loads(line)
             rows.append([entry.get(col, "") for col in _COLUMNS])
         except json.JSONDecodeError:
             logger.warning("Skipping malformed telemetry line: %s", line[:80])
+    return rows
 
-    if not rows:
-        return 0
 
+def _upload(ws: Any, rows: list[list[Any]]) -> bool:
     try:
         ws.append_rows(rows, value_input_option="RAW")
-        with _write_lock:
-            TELEMETRY_QUEUE_PATH.write_text("", encoding="utf-8")
-        logger.info("Uploaded %d telemetry rows to Google Sheets", len(rows))
-        return len(rows)
     except Exception:
         logger.exception("Sheets upload failed — entries preserved in queue for retry")
+        return False
+    logger.info("Uploaded %d telemetry rows to Google Sheets", len(rows))
+    return True
+
+
+def flush_queue() -> int:
+    """Seal the live queue file, then upload sealed segments, dropping each once uploaded.
+
+    Returns the number of rows uploaded (0 if nothing to do or on failure).
+    """
+    ws = init_sheets_client()
+    if ws is None:
         return 0
 
+    writer = get_writer()
+    # Only sealed segments are uploaded, so appends (and rotations) during
+    # the upload land in a new live file instead of a file being sent.
+    writer.seal()
+    uploaded = 0
+    for segment in writer.sealed_segments():
+        rows = _rows(segment.read_text(encoding="utf-8"))
+        if rows and not _upload(ws, rows):
+            return uploaded
+        segment.unlink()
+        uploaded += len(rows)
+    return uploaded
+
 
 def start_processor() -> threading.Thread | None:
     """Spawn a daemon thread that flushes the telemetry queue periodically."""
@@ -0,0 +1,233 @@
+"""Sealed game-state tokens for games that live on the client.
+
+A stateless game keeps no server-side session: every response carries a
+token holding the whole game, and the next move sends it back, so any
+worker that shares ``GAME_TOKEN_SECRET`` can play the turn without a
+session lookup. The board is stored as the game's seed and entity counts
+(the engine deals the same board again from them) and the explored tiles
+as a bitmap. The token hides the board from the client, so the payload is
+encrypted with a SHAKE-256 keystream under a random nonce and the nonce
+and ciphertext are authenticated with a truncated HMAC-SHA256.
+
+Token: ``nonce (8) | ciphertext | tag (16)``, base64url without padding.
+The tag also covers the game id, so a token only plays the game it was
+issued for.
+
+Plaintext layout (little endian), cells as flat indices (see ``engine.topology``):
+
+    u8  version
+    u64 seed
+    u8  size, u8 num_pits, u8 num_wumpuses, u8 difficulty, u8 pacing
+    u8  status code, u32 turn, u8 arrows remaining
+    u16 player cell, u16 pending trail cell (0xFFFF: none)
+    u8  live wumpus count, then u16 cell each
+    u8  scent entry count, then (u16 cell, u8 value) each
+    ceil(cells / 8) bytes: bitmask of cells the wumpus has visited
+    ceil(cells / 8) bytes: bitmask of cells the player has explored
+
+Tokens do not expire and are not single-use: a client can resend an older
+token to take a turn again, or to undo a loss. ``/game/move`` therefore
+never credits a stateless game's result to profiles or telemetry (see the
+``/game/start`` API docs). The message and user id are not stored; the
+explored tiles come back in row-major order.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import struct
+import uuid
+from collections.abc import Iterable
+from typing import get_args
+
+from api.schemas import DifficultyType
+from api.sessions import SessionState
+from engine.game_state import STATUS_LABELS, GameEngine
+from engine.topology import get_topology
+
+logger = logging.getLogger(__name__)
+
+GAME_TOKEN_SECRET = os.getenv("GAME_TOKEN_SECRET", "")
+
+TOKEN_VERSION = 1
+NONCE_BYTES = 8
+TAG_BYTES = 16
+
+_DIFFICULTIES: tuple[str, ...] = get_args(DifficultyType)
+_HEADER = struct.Struct("<BQBBBBBBIBHH")
+_NO_CELL = 0xFFFF
+
+
+class _TokenKeys:
+    """Encryption and MAC keys derived from one secret."""
+
+    def __init__(self, secret: bytes) -> None:
+        self.cipher = hashlib.sha256(b"wumpus-token-cipher" + secret).digest()
+        # Copying a keyed HMAC skips re-deriving the padded key on every call.
+        self.mac = hmac.new(
+            hashlib.sha256(b"wumpus-token-mac" + secret).digest(), digestmod=hashlib.sha256,
+        )
+
+    def tag(self, data: bytes) -> bytes:
+        mac = self.mac.copy()
+        mac.update(data)
+        return mac.digest()[:TAG_BYTES]
+
+    def xor(self, nonce: bytes, data: bytes) -> bytes:
+        stream = hashlib.shake_256(self.cipher + nonce).digest(len(data))
+        mixed = int.from_bytes(data, "little") ^ int.from_bytes(stream, "little")
+        return mixed.to_bytes(len(data), "little")
+
+
+if GAME_TOKEN_SECRET:
+    _default_keys = _TokenKeys(GAME_TOKEN_SECRET.encode("utf-8"))
+else:
+    logger.warning(
+        "GAME_TOKEN_SECRET is not set; state tokens only verify in this process",
+    )
+    _default_keys = _TokenKeys(secrets.token_bytes(32))
+
+
+def _keys(secret: bytes | None) -> _TokenKeys:
+    return _default_keys if secret is None else _TokenKeys(secret)
+
+
+def _game_bytes(game_id: str) -> bytes:
+    try:
+        return uuid.UUID(game_id).bytes
+    except ValueError:
+        return game_id.encode("utf-8")
+
+
+def _cells_mask(cells: Iterable[tuple[int, int]], size: int) -> bytes:
+    mask = 0
+    for x, y in cells:
+        mask |= 1 << (y * size + x)
+    return mask.to_bytes((size * size + 7) // 8, "little")
+
+
+def _mask_cells(mask: int, coordinates: tuple[tuple[int, int], ...]) -> list[tuple[int, int]]:
+    cells = []
+    while mask:
+        lowest = mask & -mask
+        cells.append(coordinates[lowest.bit_length() - 1])
+        mask ^= lowest
+    return cells
+
+
+def encode_state_token(
+    game_id: str, session: SessionState, secret: bytes | None = None,
+) -> str:
+    """Seal ``session`` into a URL-safe token; it must have been dealt from a seed."""
+    if session.seed is None:
+        raise ValueError("Only seeded games can be encoded as state tokens")
+    engine = session.engine
+    size = engine.size
+    index = engine.topology.index
+    memory = engine._require_scent_memory()
+    trail = memory._pending_player_trail
+
+    parts = [
+        _HEADER.pack(
+            TOKEN_VERSION,
+            session.seed,
+            size,
+            engine.num_pits,
+            engine.num_wumpuses,
+            _DIFFICULTIES.index(session.difficulty),
+            session.pacing_interval,
+            STATUS_LABELS.index(engine.status),
+            session.turn,
+            session.arrows_remaining,
+            index(engine.player_pos),
+            _NO_CELL if trail is None else index(trail),
+        )
+    ]
+    wumpus_cells = [index(position) for position in engine.wumpus_positions]
+    parts.append(struct.pack(f"<B{len(wumpus_cells)}H", len(wumpus_cells), *wumpus_cells))
+    parts.append(struct.pack("<B", len(memory.active_scent)))
+    for (x, y), value in memory.active_scent.items():
+        parts.append(struct.pack("<HB", y * size + x, value))
+    parts.append(_cells_mask(memory.wumpus_visited, size))
+    parts.append(_cells_mask(session.explored_set, size))
+
+    keys = _keys(secret)
+    nonce = secrets.token_bytes(NONCE_BYTES)
+    sealed = nonce + keys.xor(nonce, b"".join(parts))
+    token = base64.urlsafe_b64encode(sealed + keys.tag(_game_bytes(game_id) + sealed))
+    return token.rstrip(b"=").decode("ascii")
+
+
+def decode_state_token(
+    token: str, game_id: str, secret: bytes | None = None,
+) -> SessionState:
+    """Verify and decode a token issued for ``game_id``.
+
+    Raises ``ValueError`` if the token is forged, malformed or for another game.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("Malformed state token") from exc
+    keys = _keys(secret)
+    sealed, tag = raw[:-TAG_BYTES], raw[-TAG_BYTES:]
+    if len(sealed) <= NONCE_BYTES or not hmac.compare_digest(
+        tag, keys.tag(_game_bytes(game_id) + sealed),
+    ):
+        raise ValueError("State token signature does not match")
+    payload = keys.xor(sealed[:NONCE_BYTES], sealed[NONCE_BYTES:])
+
+    try:
+        (
+            version, seed, size, num_pits, num_wumpuses, difficulty,
+            pacing, status, turn, arrows, player, trail,
+        ) = _HEADER.unpack_from(payload, 0)
+        if version != TOKEN_VERSION:
+            raise ValueError(f"Unsupported state token version {version}")
+        offset = _HEADER.size
+        (count,) = struct.unpack_from("<B", payload, offset)
+        wumpus_cells = struct.unpack_from(f"<{count}H", payload, offset + 1)
+        offset += 1 + 2 * count
+        (count,) = struct.unpack_from("<B", payload, offset)
+        scent = struct.unpack_from(f"<{'HB' * count}", payload, offset + 1)
+        offset += 1 + 3 * count
+    except struct.error as exc:
+        raise ValueError("Truncated state token") from exc
+
+    mask_bytes = (size * size + 7) // 8
+    if offset + 2 * mask_bytes != len(payload):
+        raise ValueError("Truncated state token")
+    visited = int.from_bytes(payload[offset:offset + mask_bytes], "little")
+    explored = int.from_bytes(payload[offset + mask_bytes:], "little")
+
+    topology = get_topology(size)
+    positions = topology.positions
+    coordinates = topology.coordinates
+    # The same seed deals the same pits and gold; only the moving parts are stored.
+    engine = GameEngine(size=size, num_pits=num_pits, num_wumpuses=num_wumpuses, seed=seed)
+    engine.status = STATUS_LABELS[status]
+    engine.player_pos = positions[player]
+    engine.wumpus_positions = [positions[cell] for cell in wumpus_cells]
+    memory = engine._require_scent_memory()
+    memory.active_scent = {coordinates[scent[i]]: scent[i + 1] for i in range(0, len(scent), 2)}
+    memory.wumpus_visited = set(_mask_cells(visited, coordinates))
+    memory._pending_player_trail = None if trail == _NO_CELL else positions[trail]
+
+    tiles = _mask_cells(explored, coordinates)
+    return SessionState(
+        engine=engine,
+        turn=turn,
+        arrows_remaining=arrows,
+        explored_tiles=tiles,
+        explored_set=set(tiles),
+        message="",
+        pacing_interval=pacing,
+        difficulty=_DIFFICULTIES[difficulty],
+        seed=seed,
+    )
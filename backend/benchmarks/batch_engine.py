@@ -0,0 +1,84 @@
+"""Game steps per second of ``BatchGameEngine`` next to ``GameEngine``.
+
+A step is one full turn on one board: a player move, a move for every
+wumpus, the game-over check and the scent update. The scalar engine plays
+the same random turns on the same seeded boards one at a time.
+
+    python benchmarks/batch_engine.py --boards 4096 --turns 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from engine.batch import BatchGameEngine  # noqa: E402
+from engine.entities import Direction  # noqa: E402
+from engine.game_state import GameEngine  # noqa: E402
+
+
+def _scalar_steps_per_second(
+    seeds: list[int], moves: np.ndarray, size: int, num_pits: int, num_wumpuses: int,
+) -> float:
+    engines = [
+        GameEngine(size=size, num_pits=num_pits, num_wumpuses=num_wumpuses, seed=seed)
+        for seed in seeds
+    ]
+    directions = list(Direction)
+    started = time.perf_counter()
+    for turn in moves:
+        for engine, actions in zip(engines, turn):
+            engine.move_player(directions[actions[0]])
+            for slot in range(num_wumpuses):
+                engine.move_wumpus(slot, directions[actions[1 + slot]])
+            engine.check_game_over()
+            engine._update_scent()
+    return moves.shape[0] * len(seeds) / (time.perf_counter() - started)
+
+
+def _batch_steps_per_second(
+    seeds: list[int], moves: np.ndarray, size: int, num_pits: int, num_wumpuses: int,
+) -> float:
+    batch = BatchGameEngine(
+        num_games=len(seeds), size=size, num_pits=num_pits,
+        num_wumpuses=num_wumpuses, seeds=seeds,
+    )
+    started = time.perf_counter()
+    for turn in moves:
+        batch.move_player(turn[:, 0])
+        for slot in range(num_wumpuses):
+            batch.move_wumpus(turn[:, 1 + slot], index=slot)
+        batch.check_game_over()
+        batch.update_scent()
+    return moves.shape[0] * len(seeds) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--boards", type=int, default=4096)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--grid-size", type=int, default=8)
+    parser.add_argument("--pits", type=int, default=4)
+    parser.add_argument("--wumpuses", type=int, default=1)
+    args = parser.parse_args()
+
+    seeds = list(range(args.boards))
+    rng = np.random.default_rng(0)
+    moves = rng.integers(0, 4, size=(args.turns, args.boards, 1 + args.wumpuses))
+    shape = (args.grid_size, args.pits, args.wumpuses)
+
+    scalar = _scalar_steps_per_second(seeds, moves, *shape)
+    batch = _batch_steps_per_second(seeds, moves, *shape)
+    print(f"{args.boards} boards, {args.grid_size}x{args.grid_size}, {args.turns} turns")
+    print(f"{'GameEngine':>16}: {scalar:>12,.0f} steps/s")
+    print(f"{'BatchGameEngine':>16}: {batch:>12,.0f} steps/s ({batch / scalar:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
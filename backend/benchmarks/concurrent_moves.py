@@ -0,0 +1,79 @@
+"""Concurrent /game/move throughput with and without the I/O executor.
+
+Plays many signed-in games at once against the in-process app. Telemetry
+writes are replaced by a blocking sleep standing in for backend latency,
+which is what stalls the event loop when side effects run inline.
+
+    python benchmarks/concurrent_moves.py --games 64 --side-effect-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+
+from api import executors, routes  # noqa: E402
+from api.auth import get_optional_user  # noqa: E402
+from api.main import app  # noqa: E402
+
+_MOVES = ("NORTH", "SOUTH", "EAST", "WEST")
+
+
+async def _play(client: httpx.AsyncClient, rng: random.Random, grid_size: int) -> int:
+    response = await client.post("/game/start", json={"grid_size": grid_size})
+    game_id = response.json()["game_id"]
+    moves = 0
+    status = "Ongoing"
+    while status == "Ongoing":
+        response = await client.post(
+            "/game/move", json={"game_id": game_id, "player_action": rng.choice(_MOVES)},
+        )
+        status = response.json()["status"]
+        moves += 1
+    return moves
+
+
+async def _run(games: int, rounds: int, grid_size: int) -> tuple[int, float]:
+    rng = random.Random(0)
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        total = 0
+        for _ in range(rounds):
+            results = await asyncio.gather(
+                *(_play(client, rng, grid_size) for _ in range(games))
+            )
+            total += sum(results)
+        return total, time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=64, help="Concurrent games")
+    parser.add_argument("--rounds", type=int, default=3, help="Batches of concurrent games")
+    parser.add_argument("--grid-size", type=int, default=4)
+    parser.add_argument("--side-effect-ms", type=float, default=20.0)
+    parser.add_argument("--io-workers", type=int, default=16)
+    args = parser.parse_args()
+
+    delay = args.side_effect_ms / 1000.0
+    routes.enqueue_stats = lambda **_kwargs: time.sleep(delay)  # type: ignore[assignment]
+    app.dependency_overrides[get_optional_user] = lambda: "bench-user"
+
+    for label, io_workers in (("inline", 0), (f"{args.io_workers} io threads", args.io_workers)):
+        executors.configure(io_workers=io_workers)
+        moves, elapsed = asyncio.run(_run(args.games, args.rounds, args.grid_size))
+        executors.shutdown()
+        print(f"{label:>16}: {moves} moves in {elapsed:.2f}s -> {moves / elapsed:,.0f} moves/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Full snapshot vs delta reply for one move late in a long game.
+
+Builds and serialises the ``/game/move`` reply both ways for a session
+that has explored ``--explored`` tiles, reporting bytes and time per reply.
+
+    python benchmarks/delta_responses.py --grid-size 16 --explored 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api.routes import _baseline, _build_delta, _build_response, _reply_json  # noqa: E402
+from api.sessions import SessionState  # noqa: E402
+from engine.game_state import GameEngine  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grid-size", type=int, default=16)
+    parser.add_argument("--explored", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    size = args.grid_size
+    session = SessionState(engine=GameEngine(size=size, num_pits=4, seed=0), seed=0)
+    tiles = [(x, y) for y in range(size) for x in range(size)][: args.explored]
+    session.explored_tiles = tiles
+    session.explored_set = set(tiles)
+    session.turn = len(tiles)
+    baseline = _baseline(session, session.turn)
+    assert baseline is not None
+    session.explored_tiles = [*tiles, (size - 1, size - 1)]
+    session.turn += 1
+
+    cases = {
+        "full": lambda: _reply_json(_build_response("game", session)),
+        "delta": lambda: _reply_json(_build_delta("game", session, baseline)),
+    }
+    for label, func in cases.items():
+        elapsed = timeit.timeit(func, number=args.iterations)
+        print(
+            f"{label:>6}: {len(func()):>5} bytes, "
+            f"{elapsed / args.iterations * 1e6:.1f} us to build and serialise"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Per-move session store cost: in-memory vs SQLite (versioned write per move).
+
+Each simulated move reads a session, advances its engine one turn and saves
+it, round-robin over ``--games`` live games, the same access pattern as
+``/game/move``.
+
+    python benchmarks/session_store.py --games 1000 --moves 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api.sessions import SessionState, SessionStore, encode_session  # noqa: E402
+from api.sqlite_sessions import SqliteSessionStore  # noqa: E402
+from engine.entities import Direction  # noqa: E402
+from engine.game_state import GameEngine  # noqa: E402
+
+
+def _run(store: SessionStore | SqliteSessionStore, games: int, moves: int) -> float:
+    rng = random.Random(0)
+    for game in range(games):
+        store[f"game-{game}"] = SessionState(engine=GameEngine(size=10, num_pits=4, seed=game))
+
+    started = time.perf_counter()
+    for move in range(moves):
+        game_id = f"game-{move % games}"
+        session = store[game_id]
+        session.engine.move_wumpus(Direction(rng.randrange(4)))
+        session.engine._update_scent()
+        session.turn += 1
+        store.save(game_id, session)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--moves", type=int, default=20_000)
+    args = parser.parse_args()
+
+    sample = SessionState(engine=GameEngine(size=10, num_pits=4, seed=0))
+    print(f"Snapshot size for a 10x10 game: {len(encode_session(sample))} bytes")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stores: list[tuple[str, SessionStore | SqliteSessionStore]] = [
+            ("memory", SessionStore()),
+            ("sqlite", SqliteSessionStore(Path(tmp) / "sessions.db")),
+        ]
+        for label, store in stores:
+            elapsed = _run(store, args.games, args.moves)
+            store.close()
+            print(
+                f"{label:>24}: {args.moves / elapsed:>10,.0f} moves/sec "
+                f"({elapsed / args.moves * 1e6:.1f} us/move)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Cost of sealing and opening stateless game-state tokens.
+
+Times ``encode_state_token`` and ``decode_state_token`` (HMAC check,
+decryption and rebuilding the engine from its seed) for a game that has
+been played for a while, next to the HMAC check alone.
+
+    python benchmarks/state_tokens.py --grid-size 10 --iterations 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import random
+import sys
+import timeit
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from api import tokens  # noqa: E402
+from api.sessions import SessionState  # noqa: E402
+from engine.entities import Direction  # noqa: E402
+from engine.game_state import GameEngine  # noqa: E402
+
+
+def _played_session(grid_size: int, turns: int) -> SessionState:
+    rng = random.Random(0)
+    engine = GameEngine(size=grid_size, num_pits=4, num_wumpuses=2, seed=0)
+    session = SessionState(engine=engine, seed=0)
+    for _ in range(turns):
+        engine.move_player(Direction(rng.randrange(4)))
+        position = (engine.player_pos.x, engine.player_pos.y)
+        session.explored_set.add(position)
+        engine.move_wumpus(0, Direction(rng.randrange(4)))
+        engine._update_scent()
+        session.turn += 1
+    return session
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grid-size", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    args = parser.parse_args()
+
+    session = _played_session(args.grid_size, args.turns)
+    game_id = str(uuid.uuid4())
+    token = tokens.encode_state_token(game_id, session)
+    raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    sealed = uuid.UUID(game_id).bytes + raw[:-tokens.TAG_BYTES]
+    print(f"Token for a {args.grid_size}x{args.grid_size} game: {len(token)} chars")
+
+    cases = {
+        "hmac check": lambda: tokens._default_keys.tag(sealed),
+        "encode": lambda: tokens.encode_state_token(game_id, session),
+        "decode + verify": lambda: tokens.decode_state_token(token, game_id),
+    }
+    for label, func in cases.items():
+        elapsed = timeit.timeit(func, number=args.iterations)
+        print(f"{label:>16}: {elapsed / args.iterations * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Move latency over the WebSocket channel vs one POST per move.
+
+Serves the app with uvicorn on a local port and plays ``--games`` concurrent
+games per transport, each for ``--moves`` moves (restarting lost games).
+Prints the client-measured round trip next to the server-side timings from
+``/metrics/move-latency``.
+
+    python benchmarks/ws_vs_rest.py --games 32 --moves 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+import websockets  # noqa: E402
+
+from api.main import app  # noqa: E402
+
+_MOVES = ("NORTH", "SOUTH", "EAST", "WEST")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def _rest_game(client: httpx.AsyncClient, moves: int, rng: random.Random) -> list[float]:
+    samples: list[float] = []
+    game_id = (await client.post("/game/start", json={"grid_size": 10})).json()["game_id"]
+    while len(samples) < moves:
+        started = time.perf_counter()
+        response = await client.post(
+            "/game/move", json={"game_id": game_id, "player_action": rng.choice(_MOVES)},
+        )
+        samples.append(time.perf_counter() - started)
+        if response.json()["status"] != "Ongoing":
+            game_id = (await client.post("/game/start", json={"grid_size": 10})).json()["game_id"]
+    return samples
+
+
+async def _ws_game(
+    client: httpx.AsyncClient, base: str, moves: int, rng: random.Random,
+) -> list[float]:
+    samples: list[float] = []
+    while len(samples) < moves:
+        game_id = (await client.post("/game/start", json={"grid_size": 10})).json()["game_id"]
+        async with websockets.connect(f"{base}/game/ws/{game_id}") as channel:
+            status = "Ongoing"
+            while status == "Ongoing" and len(samples) < moves:
+                started = time.perf_counter()
+                await channel.send(json.dumps({"player_action": rng.choice(_MOVES)}))
+                status = json.loads(await channel.recv())["status"]
+                samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def _run(port: int, games: int, moves: int) -> None:
+    base = f"http://127.0.0.1:{port}"
+    rng = random.Random(0)
+    limits = httpx.Limits(max_connections=games, max_keepalive_connections=games)
+    async with httpx.AsyncClient(base_url=base, limits=limits) as client:
+        for label, play in (
+            ("rest", lambda: _rest_game(client, moves, rng)),
+            ("websocket", lambda: _ws_game(client, f"ws://127.0.0.1:{port}", moves, rng)),
+        ):
+            started = time.perf_counter()
+            results = await asyncio.gather(*(play() for _ in range(games)))
+            elapsed = time.perf_counter() - started
+            samples = sorted(s for result in results for s in result)
+            print(
+                f"{label:>10} client: {len(samples) / elapsed:>7,.0f} moves/sec, "
+                f"p50 {statistics.median(samples) * 1e3:.2f} ms, "
+                f"p95 {samples[int(0.95 * len(samples))] * 1e3:.2f} ms"
+            )
+        for row in (await client.get("/metrics/move-latency")).json():
+            print(
+                f"{row['transport']:>10} server: mean {row['mean_ms']:.2f} ms, "
+                f"p50 {row['p50_ms']:.2f} ms, p95 {row['p95_ms']:.2f} ms"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--games", type=int, default=32)
+    parser.add_argument("--moves", type=int, default=50)
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        asyncio.run(_run(port, args.games, args.moves))
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
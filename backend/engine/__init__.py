@@ -1,8 +1,10 @@
+from .batch import BatchGameEngine
 from .entities import Direction, Position, TileContent
 from .game_state import GameEngine, GameStatus
 from .senses import MAX_SCENT, ScentMemorySystem
 
 __all__ = [
+	"BatchGameEngine",
 	"Direction",
 	"Position",
 	"TileContent",
@@ -0,0 +1,260 @@
+"""Vectorized game engine that advances many boards per call."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from .game_state import STATUS_LABELS, GameEngine
+from .senses import MAX_SCENT
+
+ONGOING = 0
+PLAYER_WON = 1
+WUMPUS_KILLED = 2
+PLAYER_LOST_PIT = 3
+PLAYER_LOST_WUMPUS = 4
+
+STENCH_LABELS: tuple[str | None, ...] = (None, "NORTH", "SOUTH", "EAST", "WEST", "ALL")
+STENCH_NONE = 0
+STENCH_ALL = 5
+
+# Indexed by Direction.value: NORTH, SOUTH, EAST, WEST.
+_DX = np.array([0, 0, 1, -1], dtype=np.int64)
+_DY = np.array([-1, 1, 0, 0], dtype=np.int64)
+
+BoolArray = npt.NDArray[np.bool_]
+IntArray = npt.NDArray[np.int64]
+
+
+class BatchGameEngine:
+    """Array-backed counterpart of ``GameEngine`` for ``num_games`` boards.
+
+    Every per-board field of ``GameEngine`` lives in a NumPy array with the
+    board index as the leading axis. Statuses and stench directions are small
+    integer codes; ``STATUS_LABELS`` and ``STENCH_LABELS`` map them back to the
+    strings the scalar engine uses. Boards are dealt by a scalar engine, so a
+    board reset with a seed is identical to ``GameEngine.reset(seed=...)``.
+    ``seed`` seeds the dealer used for boards reset without an explicit seed.
+    """
+
+    def __init__(
+        self,
+        num_games: int,
+        size: int = 4,
+        num_pits: int = 3,
+        num_wumpuses: int = 1,
+        seeds: Sequence[int] | None = None,
+        seed: int | None = None,
+    ) -> None:
+        if num_games < 1:
+            raise ValueError("num_games must be >= 1")
+        if seeds is not None and len(seeds) != num_games:
+            raise ValueError("seeds must provide one seed per game")
+        self._allocate(num_games, size, num_pits, num_wumpuses)
+        self._dealer = GameEngine(
+            size=size, num_pits=num_pits, num_wumpuses=num_wumpuses, seed=seed,
+        )
+        self.reset_games(np.arange(num_games), seeds=seeds)
+
+    def _allocate(self, num_games: int, size: int, num_pits: int, num_wumpuses: int) -> None:
+        self.num_games = num_games
+        self.size = size
+        self.num_pits = num_pits
+        self.num_wumpuses = num_wumpuses
+
+        n, w = num_games, num_wumpuses
+        self.player_x: IntArray = np.zeros(n, dtype=np.int64)
+        self.player_y: IntArray = np.zeros(n, dtype=np.int64)
+        self.wumpus_x: IntArray = np.zeros((n, w), dtype=np.int64)
+        self.wumpus_y: IntArray = np.zeros((n, w), dtype=np.int64)
+        self.wumpus_alive: BoolArray = np.zeros((n, w), dtype=np.bool_)
+        self.gold_x: IntArray = np.zeros(n, dtype=np.int64)
+        self.gold_y: IntArray = np.zeros(n, dtype=np.int64)
+        self.pits: BoolArray = np.zeros((n, size, size), dtype=np.bool_)
+        self.scent_grid: npt.NDArray[np.int8] = np.zeros((n, size, size), dtype=np.int8)
+        self.wumpus_visited: BoolArray = np.zeros((n, size, size), dtype=np.bool_)
+        self.status: npt.NDArray[np.int8] = np.zeros(n, dtype=np.int8)
+        self._trail_x: IntArray = np.zeros(n, dtype=np.int64)
+        self._trail_y: IntArray = np.zeros(n, dtype=np.int64)
+        self._trail_pending: BoolArray = np.zeros(n, dtype=np.bool_)
+        self._breeze: BoolArray = np.zeros((n, size, size), dtype=np.bool_)
+        # Flat views and offsets so per-board cell lookups are one 1-D gather.
+        self._board_offsets: IntArray = np.arange(n, dtype=np.int64) * (size * size)
+        self._pits_flat: BoolArray = self.pits.reshape(-1)
+        self._scent_flat: npt.NDArray[np.int8] = self.scent_grid.reshape(-1)
+        self._visited_flat: BoolArray = self.wumpus_visited.reshape(-1)
+        self._breeze_flat: BoolArray = self._breeze.reshape(-1)
+
+    @classmethod
+    def from_engines(cls, engines: Sequence[GameEngine]) -> BatchGameEngine:
+        """Build a batch holding copies of existing scalar boards."""
+        if not engines:
+            raise ValueError("engines must not be empty")
+        first = engines[0]
+        batch = cls.__new__(cls)
+        batch._allocate(len(engines), first.size, first.num_pits, first.num_wumpuses)
+        batch._dealer = GameEngine(
+            size=first.size, num_pits=first.num_pits, num_wumpuses=first.num_wumpuses,
+        )
+        for index, engine in enumerate(engines):
+            batch._load_engine(index, engine)
+        return batch
+
+    def reset_games(
+        self,
+        indices: Sequence[int] | IntArray,
+        seeds: Sequence[int] | None = None,
+    ) -> None:
+        """Generate fresh boards for the given game indices."""
+        dealer = self._dealer
+        for position, index in enumerate(indices):
+            dealer.reset(seed=None if seeds is None else seeds[position])
+            self._load_engine(int(index), dealer)
+
+    def _load_engine(self, index: int, engine: GameEngine) -> None:
+        if engine.size != self.size or engine.num_wumpuses > self.num_wumpuses:
+            raise ValueError("engine does not fit the batch dimensions")
+        self.player_x[index] = engine.player_pos.x
+        self.player_y[index] = engine.player_pos.y
+        self.wumpus_alive[index] = False
+        for slot, wumpus in enumerate(engine.wumpus_positions):
+            self.wumpus_x[index, slot] = wumpus.x
+            self.wumpus_y[index, slot] = wumpus.y
+            self.wumpus_alive[index, slot] = True
+        self.gold_x[index] = engine.gold_pos.x
+        self.gold_y[index] = engine.gold_pos.y
+        self.pits[index] = False
+        for pit in engine.pits:
+            self.pits[index, pit.y, pit.x] = True
+        self.scent_grid[index] = np.asarray(engine.scent_grid, dtype=np.int8)
+        self.wumpus_visited[index] = False
+        for x, y in engine.wumpus_visited:
+            self.wumpus_visited[index, y, x] = True
+        self.status[index] = STATUS_LABELS.index(engine.status)
+        # A move made before the conversion still owes its trail to the next scent update.
+        trail = engine._require_scent_memory()._pending_player_trail
+        self._trail_pending[index] = trail is not None
+        if trail is not None:
+            self._trail_x[index] = trail.x
+            self._trail_y[index] = trail.y
+        self._breeze[index] = self._breeze_map(self.pits[index])
+
+    @staticmethod
+    def _breeze_map(pits: BoolArray) -> BoolArray:
+        breeze = np.zeros_like(pits)
+        breeze[1:, :] |= pits[:-1, :]
+        breeze[:-1, :] |= pits[1:, :]
+        breeze[:, 1:] |= pits[:, :-1]
+        breeze[:, :-1] |= pits[:, 1:]
+        return breeze
+
+    def _step(self, x: IntArray, y: IntArray, directions: IntArray) -> tuple[IntArray, IntArray]:
+        limit = self.size - 1
+        return (
+            np.clip(x + _DX[directions], 0, limit),
+            np.clip(y + _DY[directions], 0, limit),
+        )
+
+    def _cells(self, x: IntArray, y: IntArray) -> IntArray:
+        """Flat index of cell ``(x, y)`` of every board into the ``*_flat`` views."""
+        return self._board_offsets + y * self.size + x
+
+    def move_player(self, directions: npt.ArrayLike, mask: BoolArray | None = None) -> None:
+        """Move each masked board's player by ``Direction.value`` codes.
+
+        Statuses are left alone: call ``check_game_over`` once the turn's
+        moves are done.
+        """
+        dirs = np.asarray(directions, dtype=np.int64)
+        new_x, new_y = self._step(self.player_x, self.player_y, dirs)
+        moved = (new_x != self.player_x) | (new_y != self.player_y)
+        if mask is not None:
+            moved &= np.asarray(mask, dtype=np.bool_)
+
+        np.copyto(self._trail_x, self.player_x, where=moved)
+        np.copyto(self._trail_y, self.player_y, where=moved)
+        self._trail_pending |= moved
+        np.copyto(self.player_x, new_x, where=moved)
+        np.copyto(self.player_y, new_y, where=moved)
+
+    def move_wumpus(
+        self, directions: npt.ArrayLike, index: int = 0, mask: BoolArray | None = None,
+    ) -> None:
+        """Move wumpus ``index`` on each masked board where it is still alive."""
+        active = self.wumpus_alive[:, index]
+        if mask is not None:
+            active = active & np.asarray(mask, dtype=np.bool_)
+        dirs = np.asarray(directions, dtype=np.int64)
+        wumpus_x = self.wumpus_x[:, index]
+        wumpus_y = self.wumpus_y[:, index]
+        new_x, new_y = self._step(wumpus_x, wumpus_y, dirs)
+        np.copyto(wumpus_x, new_x, where=active)
+        np.copyto(wumpus_y, new_y, where=active)
+        self._visited_flat[self._cells(new_x, new_y)[active]] = True
+
+    def update_scent(self, mask: BoolArray | None = None) -> None:
+        """Decay scent on masked boards, then drop any pending player trail."""
+        grid = self.scent_grid
+        pending = self._trail_pending
+        if mask is None:
+            grid -= grid > 0
+        else:
+            active = np.asarray(mask, dtype=np.bool_)
+            grid -= (grid > 0) & active[:, None, None]
+            pending = pending & active
+
+        placed = np.flatnonzero(pending)
+        self._scent_flat[self._cells(self._trail_x, self._trail_y)[placed]] = MAX_SCENT
+        self._trail_pending[placed] = False
+
+    def check_game_over(self, mask: BoolArray | None = None) -> npt.NDArray[np.int8]:
+        """Recompute the status code of each masked board; returns the live ``status``."""
+        player_x, player_y = self.player_x, self.player_y
+        in_pit = self._pits_flat[self._cells(player_x, player_y)]
+        eaten = (
+            self.wumpus_alive
+            & (self.wumpus_x == player_x[:, None])
+            & (self.wumpus_y == player_y[:, None])
+        ).any(axis=1)
+        on_gold = (self.gold_x == player_x) & (self.gold_y == player_y)
+
+        # Later rules win, matching the scalar engine's check order.
+        status = np.multiply(on_gold, PLAYER_WON, dtype=np.int8)
+        np.copyto(status, PLAYER_LOST_WUMPUS, where=eaten)
+        np.copyto(status, PLAYER_LOST_PIT, where=in_pit)
+        if mask is None:
+            self.status[:] = status
+        else:
+            np.copyto(self.status, status, where=np.asarray(mask, dtype=np.bool_))
+        return self.status
+
+    def get_senses(self) -> dict[str, npt.NDArray[np.generic]]:
+        """Senses at each board's player tile; stench uses ``STENCH_LABELS`` codes."""
+        breeze = self._breeze_flat[self._cells(self.player_x, self.player_y)]
+        shine = (
+            np.abs(self.gold_x - self.player_x) + np.abs(self.gold_y - self.player_y)
+        ) <= 1
+
+        dx = self.wumpus_x - self.player_x[:, None]
+        dy = self.wumpus_y - self.player_y[:, None]
+        alive = self.wumpus_alive
+        same_tile = (alive & (dx == 0) & (dy == 0)).any(axis=1)
+        adjacent = np.stack(
+            [
+                (alive & (dx == 0) & (dy == -1)).any(axis=1),
+                (alive & (dx == 0) & (dy == 1)).any(axis=1),
+                (alive & (dx == 1) & (dy == 0)).any(axis=1),
+                (alive & (dx == -1) & (dy == 0)).any(axis=1),
+            ],
+            axis=1,
+        )
+        count = adjacent.sum(axis=1)
+        stench = np.select(
+            [same_tile, count > 1, count == 1],
+            [STENCH_ALL, STENCH_ALL, adjacent.argmax(axis=1) + 1],
+            default=STENCH_NONE,
+        ).astype(np.int8)
+
+        return {"breeze": breeze, "stench_direction": stench, "shine": shine}
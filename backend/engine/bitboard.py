@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from .entities import Position
+from .topology import Topology
+
+# Stench labels per Direction.value.
+_DIRECTION_LABELS: tuple[str, ...] = ("NORTH", "SOUTH", "EAST", "WEST")
+
+
+class Bitboard:
+    """Integer bitmasks of one board's pits, wumpuses and gold.
+
+    Breeze and shine masks are derived once when pits and gold are placed;
+    the wumpus mask is refreshed whenever a wumpus moves or dies. Membership,
+    sense and arrow queries are then a handful of bitwise operations.
+    """
+
+    def __init__(self, topology: Topology) -> None:
+        self._topology = topology
+        self.pits = 0
+        self.wumpuses = 0
+        self.gold = 0
+        self.breeze = 0
+        self.shine = 0
+
+    def set_pits(self, pits: list[Position]) -> None:
+        topology = self._topology
+        pit_mask = 0
+        breeze = 0
+        for pit in pits:
+            cell = topology.index(pit)
+            pit_mask |= 1 << cell
+            breeze |= topology.neighbor_masks[cell]
+        self.pits = pit_mask
+        self.breeze = breeze
+
+    def set_gold(self, gold_pos: Position) -> None:
+        cell = self._topology.index(gold_pos)
+        self.gold = 1 << cell
+        self.shine = self.gold | self._topology.neighbor_masks[cell]
+
+    def set_wumpuses(self, wumpus_positions: list[Position]) -> None:
+        topology = self._topology
+        mask = 0
+        for wp in wumpus_positions:
+            mask |= 1 << topology.index(wp)
+        self.wumpuses = mask
+
+    def senses_at(self, cell: int) -> dict[str, bool | str | None]:
+        stench_direction: str | None = None
+        if self.wumpuses >> cell & 1:
+            stench_direction = "ALL"
+        elif self.wumpuses & self._topology.neighbor_masks[cell]:
+            for label, adjacent in zip(_DIRECTION_LABELS, self._topology.adjacent):
+                neighbor = adjacent[cell]
+                if neighbor >= 0 and self.wumpuses >> neighbor & 1:
+                    stench_direction = label if stench_direction is None else "ALL"
+        return {
+            "breeze": bool(self.breeze >> cell & 1),
+            "stench_direction": stench_direction,
+            "shine": bool(self.shine >> cell & 1),
+        }
+
+    def wumpus_on_ray(self, cell: int, direction: int) -> bool:
+        return bool(self.wumpuses & self._topology.rays[direction][cell])
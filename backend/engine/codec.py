@@ -0,0 +1,128 @@
+"""Compact binary snapshots of a ``GameEngine``.
+
+Layout (little endian), cells as flat indices (see ``engine.topology``):
+
+    u8  version
+    u8  size, u8 num_pits, u8 num_wumpuses, u8 status code
+    u16 player cell, u16 gold cell, u16 pending trail cell (0xFFFF: none)
+    u8  live wumpus count, then u16 cell each
+    u8  pit count, then u16 cell each
+    u8  scent entry count, then (u16 cell, u8 value) each
+    ceil(cells / 8) bytes: bitmask of cells the wumpus has visited
+
+The engine's random generator is not stored; a decoded engine only needs
+it again when ``reset`` deals a new board.
+"""
+
+from __future__ import annotations
+
+import struct
+
+from .game_state import STATUS_LABELS, GameEngine
+from .senses import ScentMemorySystem
+from .topology import get_topology
+
+CODEC_VERSION = 1
+
+_HEADER = struct.Struct("<BBBBBHHH")
+_NO_CELL = 0xFFFF
+
+
+def encode_engine(engine: GameEngine) -> bytes:
+    topology = engine.topology
+    index = topology.index
+    memory = engine._require_scent_memory()
+    trail = memory._pending_player_trail
+    size = engine.size
+
+    parts = [
+        _HEADER.pack(
+            CODEC_VERSION,
+            size,
+            engine.num_pits,
+            engine.num_wumpuses,
+            STATUS_LABELS.index(engine.status),
+            index(engine.player_pos),
+            index(engine.gold_pos),
+            _NO_CELL if trail is None else index(trail),
+        )
+    ]
+    wumpus_cells = [index(position) for position in engine.wumpus_positions]
+    parts.append(struct.pack(f"<B{len(wumpus_cells)}H", len(wumpus_cells), *wumpus_cells))
+    pit_cells = [index(position) for position in engine.pits]
+    parts.append(struct.pack(f"<B{len(pit_cells)}H", len(pit_cells), *pit_cells))
+
+    parts.append(struct.pack("<B", len(memory.active_scent)))
+    for (x, y), value in memory.active_scent.items():
+        parts.append(struct.pack("<HB", y * size + x, value))
+
+    visited = 0
+    for x, y in memory.wumpus_visited:
+        visited |= 1 << (y * size + x)
+    parts.append(visited.to_bytes((size * size + 7) // 8, "little"))
+    return b"".join(parts)
+
+
+def decode_engine(data: bytes | memoryview) -> GameEngine:
+    """Inverse of ``encode_engine``; raises ``ValueError`` on bad input."""
+    try:
+        engine, _ = decode_engine_from(data, 0)
+    except struct.error as exc:
+        raise ValueError("Truncated engine snapshot") from exc
+    return engine
+
+
+def decode_engine_from(data: bytes | memoryview, offset: int) -> tuple[GameEngine, int]:
+    """Decode an engine starting at ``offset``; returns it and the end offset."""
+    (
+        version, size, num_pits, num_wumpuses, status, player, gold, trail,
+    ) = _HEADER.unpack_from(data, offset)
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported engine snapshot version {version}")
+    offset += _HEADER.size
+    topology = get_topology(size)
+    positions = topology.positions
+    coordinates = topology.coordinates
+
+    (count,) = struct.unpack_from("<B", data, offset)
+    wumpus_cells = struct.unpack_from(f"<{count}H", data, offset + 1)
+    offset += 1 + 2 * count
+    (count,) = struct.unpack_from("<B", data, offset)
+    pit_cells = struct.unpack_from(f"<{count}H", data, offset + 1)
+    offset += 1 + 2 * count
+
+    (count,) = struct.unpack_from("<B", data, offset)
+    offset += 1
+    active_scent: dict[tuple[int, int], int] = {}
+    for _ in range(count):
+        cell, value = struct.unpack_from("<HB", data, offset)
+        active_scent[coordinates[cell]] = value
+        offset += 3
+
+    mask_bytes = (size * size + 7) // 8
+    if offset + mask_bytes > len(data):
+        raise ValueError("Truncated engine snapshot")
+    visited = int.from_bytes(data[offset:offset + mask_bytes], "little")
+    offset += mask_bytes
+
+    memory = ScentMemorySystem(size=size, wumpus_start=positions[0])
+    memory.active_scent = active_scent
+    memory.wumpus_visited.clear()
+    while visited:
+        lowest = visited & -visited
+        memory.wumpus_visited.add(coordinates[lowest.bit_length() - 1])
+        visited ^= lowest
+    memory._pending_player_trail = None if trail == _NO_CELL else positions[trail]
+    # Decoding runs on every cross-worker read, so skip dealing a board.
+    engine = GameEngine.from_board(
+        size,
+        num_pits,
+        num_wumpuses,
+        status=STATUS_LABELS[status],
+        player_pos=positions[player],
+        gold_pos=positions[gold],
+        pits=[positions[cell] for cell in pit_cells],
+        wumpus_positions=[positions[cell] for cell in wumpus_cells],
+        scent_memory=memory,
+    )
+    return engine, offset
@@ -3,8 +3,10 @@ from __future__ import annotations
 import random
 from typing import Literal
 
+from .bitboard import Bitboard
 from .entities import Direction, Position
 from .senses import ScentMemorySystem
+from .topology import Topology, get_topology
 
 GameStatus = Literal[
     "Ongoing",
@@ -13,10 +15,57 @@ GameStatus = Literal[
     "PlayerLost_Pit",
     "PlayerLost_Wumpus",
 ]
+# Integer status codes used by the batch engine and the binary encodings.
+STATUS_LABELS: tuple[GameStatus, ...] = (
+    "Ongoing",
+    "PlayerWon",
+    "WumpusKilled",
+    "PlayerLost_Pit",
+    "PlayerLost_Wumpus",
+)
 
 
 class GameEngine:
-    def __init__(self, size: int = 4, num_pits: int = 3, num_wumpuses: int = 1) -> None:
+    def __init__(
+        self,
+        size: int = 4,
+        num_pits: int = 3,
+        num_wumpuses: int = 1,
+        seed: int | None = None,
+    ) -> None:
+        self._setup(size, num_pits, num_wumpuses, seed)
+        self._reset_board()
+
+    @classmethod
+    def from_board(
+        cls,
+        size: int,
+        num_pits: int,
+        num_wumpuses: int,
+        *,
+        status: GameStatus,
+        player_pos: Position,
+        gold_pos: Position,
+        pits: list[Position],
+        wumpus_positions: list[Position],
+        scent_memory: ScentMemorySystem,
+    ) -> GameEngine:
+        """An engine on an existing board, without dealing a random one first.
+
+        Used to restore snapshots; its generator is seeded with 0, so only a
+        later ``reset`` draws from it.
+        """
+        engine = cls.__new__(cls)
+        engine._setup(size, num_pits, num_wumpuses, 0)
+        engine.status = status
+        engine.player_pos = player_pos
+        engine.gold_pos = gold_pos
+        engine.pits = pits
+        engine.wumpus_positions = wumpus_positions
+        engine._scent_memory = scent_memory
+        return engine
+
+    def _setup(self, size: int, num_pits: int, num_wumpuses: int, seed: int | None) -> None:
         if size < 2:
             raise ValueError("size must be at least 2")
         if num_pits < 0:
@@ -31,12 +80,43 @@ class GameEngine:
         self.num_pits = num_pits
         self.num_wumpuses = num_wumpuses
         self.player_pos: Position = Position(0, 0)
-        self.wumpus_positions: list[Position] = []
-        self.gold_pos: Position = Position(0, 0)
-        self.pits: list[Position] = []
         self.status: GameStatus = "Ongoing"
+        # Owned per engine so engines in other threads never share or reseed it;
+        # a board is fully determined by (seed, size, num_pits, num_wumpuses).
+        self._rng = random.Random(seed)
+        self._topology = get_topology(size)
+        self._board = Bitboard(self._topology)
+        self._wumpus_positions: list[Position] = []
+        self._gold_pos: Position = Position(0, 0)
+        self._pits: list[Position] = []
         self._scent_memory: ScentMemorySystem | None = None
-        self._reset_board()
+
+    @property
+    def wumpus_positions(self) -> list[Position]:
+        return self._wumpus_positions
+
+    @wumpus_positions.setter
+    def wumpus_positions(self, value: list[Position]) -> None:
+        self._wumpus_positions = value
+        self._board.set_wumpuses(value)
+
+    @property
+    def gold_pos(self) -> Position:
+        return self._gold_pos
+
+    @gold_pos.setter
+    def gold_pos(self, value: Position) -> None:
+        self._gold_pos = value
+        self._board.set_gold(value)
+
+    @property
+    def pits(self) -> list[Position]:
+        return self._pits
+
+    @pits.setter
+    def pits(self, value: list[Position]) -> None:
+        self._pits = value
+        self._board.set_pits(value)
 
     @property
     def wumpus_pos(self) -> Position:
@@ -50,95 +130,92 @@ class GameEngine:
             self.wumpus_positions[0] = value
         else:
             self.wumpus_positions.append(value)
-
-    def _all_non_start_positions(self) -> list[Position]:
-        positions: list[Position] = []
-        for y in range(self.size):
-            for x in range(self.size):
-                if x == 0 and y == 0:
-                    continue
-                positions.append(Position(x=x, y=y))
-        return positions
-
-    def _manhattan_distance(self, pos_a: Position, pos_b: Position) -> int:
-        return abs(pos_a.x - pos_b.x) + abs(pos_a.y - pos_b.y)
+        self._board.set_wumpuses(self.wumpus_positions)
 
     def _sample_with_distance_fallback(
         self,
-        available_positions: list[Position],
+        occupied: int,
         *,
         count: int,
-        origin: Position,
         preferred_min_distance: int,
         fallback_min_distance: int,
-    ) -> list[Position]:
+    ) -> tuple[list[int], int]:
+        """Sample ``count`` free cells, preferring ones far from the start tile.
+
+        ``occupied`` is a bitmask of taken cells (the start tile included);
+        returns the chosen cells and the updated mask. Cells at least
+        ``min_distance`` away form a suffix of ``cells_by_distance``, so
+        sampling is rejection sampling over that suffix.
+        """
+        topology = self._topology
+        ring_starts = topology.ring_starts
+        cell_count = len(topology.cells_by_distance)
+        start = ring_starts[1]
         for min_distance in range(preferred_min_distance, fallback_min_distance - 1, -1):
-            candidates = [
-                position
-                for position in available_positions
-                if self._manhattan_distance(origin, position) >= min_distance
-            ]
-            if len(candidates) >= count:
-                return random.sample(candidates, count)
-
-        fallback_candidates = [
-            position
-            for position in available_positions
-            if self._manhattan_distance(origin, position) >= fallback_min_distance
-        ]
-        if len(fallback_candidates) >= count:
-            return random.sample(fallback_candidates, count)
-
-        return random.sample(available_positions, count)
+            distance = min(min_distance, len(ring_starts) - 1)
+            taken = (occupied & topology.distance_masks[distance]).bit_count()
+            if cell_count - ring_starts[distance] - taken >= count:
+                start = ring_starts[distance]
+                break
+
+        order = topology.cells_by_distance
+        span = cell_count - start
+        randrange = self._rng.randrange
+        chosen: list[int] = []
+        while len(chosen) < count:
+            cell = order[start + randrange(span)]
+            if not occupied >> cell & 1:
+                occupied |= 1 << cell
+                chosen.append(cell)
+        return chosen, occupied
 
     def _reset_board(self) -> None:
-        self.player_pos = Position(0, 0)
+        positions = self._topology.positions
+        self.player_pos = positions[0]
         self.status = "Ongoing"
 
-        available_positions = self._all_non_start_positions()
-        self.wumpus_positions = self._sample_with_distance_fallback(
-            available_positions,
+        occupied = 1  # the start tile
+        wumpus_cells, occupied = self._sample_with_distance_fallback(
+            occupied,
             count=self.num_wumpuses,
-            origin=self.player_pos,
             preferred_min_distance=3,
             fallback_min_distance=2,
         )
-        for wp in self.wumpus_positions:
-            available_positions.remove(wp)
-
-        self.gold_pos = self._sample_with_distance_fallback(
-            available_positions,
+        gold_cells, occupied = self._sample_with_distance_fallback(
+            occupied,
             count=1,
-            origin=self.player_pos,
             preferred_min_distance=2,
             fallback_min_distance=1,
-        )[0]
-        available_positions.remove(self.gold_pos)
-
-        self.pits = self._sample_with_distance_fallback(
-            available_positions,
+        )
+        pit_cells, _ = self._sample_with_distance_fallback(
+            occupied,
             count=self.num_pits,
-            origin=self.player_pos,
             preferred_min_distance=1,
             fallback_min_distance=1,
         )
-        self._scent_memory = ScentMemorySystem(
-            size=self.size, wumpus_start=self.wumpus_positions[0],
-        )
+        self.wumpus_positions = [positions[cell] for cell in wumpus_cells]
+        self.gold_pos = positions[gold_cells[0]]
+        self.pits = [positions[cell] for cell in pit_cells]
+        if self._scent_memory is None:
+            self._scent_memory = ScentMemorySystem(
+                size=self.size, wumpus_start=self.wumpus_positions[0],
+            )
+        else:
+            self._scent_memory.reset(self.wumpus_positions[0])
 
-    def _clamp_position(self, position: Position) -> Position:
-        x = max(0, min(self.size - 1, position.x))
-        y = max(0, min(self.size - 1, position.y))
-        return Position(x=x, y=y)
+    def reset(self, seed: int | None = None) -> None:
+        """Deal a new board on this engine, reusing its buffers.
+
+        With a ``seed`` the board is reproducible; without one the engine's
+        generator simply advances.
+        """
+        if seed is not None:
+            self._rng.seed(seed)
+        self._reset_board()
 
     def _next_position(self, position: Position, direction: Direction) -> Position:
-        if direction == Direction.NORTH:
-            return self._clamp_position(Position(x=position.x, y=position.y - 1))
-        if direction == Direction.SOUTH:
-            return self._clamp_position(Position(x=position.x, y=position.y + 1))
-        if direction == Direction.EAST:
-            return self._clamp_position(Position(x=position.x + 1, y=position.y))
-        return self._clamp_position(Position(x=position.x - 1, y=position.y))
+        topology = self._topology
+        return topology.positions[topology.moves[direction.value][topology.index(position)]]
 
     def move_player(self, direction: Direction) -> GameStatus:
         previous_player_pos = self.player_pos
@@ -158,27 +235,44 @@ class GameEngine:
         self.wumpus_positions[idx] = self._next_position(
             self.wumpus_positions[idx], actual_direction,
         )
+        self._board.set_wumpuses(self.wumpus_positions)
         self._require_scent_memory().record_wumpus_visit(self.wumpus_positions[idx])
 
     def remove_wumpus(self, index: int) -> None:
         """Remove a killed wumpus from the board."""
         self.wumpus_positions.pop(index)
+        self._board.set_wumpuses(self.wumpus_positions)
 
     def _update_scent(self) -> None:
         self._require_scent_memory().update_scent()
 
+    @property
+    def pending_player_trail(self) -> Position | None:
+        """Cell the player just left; it is scented by the next ``_update_scent``."""
+        return self._require_scent_memory()._pending_player_trail
+
+    @pending_player_trail.setter
+    def pending_player_trail(self, value: Position | None) -> None:
+        self._require_scent_memory()._pending_player_trail = value
+
     def get_senses(self, pos: Position) -> dict[str, bool | str | None]:
-        return self._require_scent_memory().get_senses(
-            pos=pos,
-            pits=self.pits,
-            wumpus_positions=self.wumpus_positions,
-            gold_pos=self.gold_pos,
-        )
+        return self._board.senses_at(self._topology.index(pos))
 
     @property
     def scent_grid(self) -> list[list[int]]:
         return self._require_scent_memory().scent_grid
 
+    def scent_at(self, pos: Position) -> int:
+        return self._require_scent_memory().scent_at(pos)
+
+    def scent_at_cell(self, cell: int) -> int:
+        """Scent at flat cell index ``cell``; see ``engine.topology``."""
+        return self._require_scent_memory().active_scent.get(self._topology.coordinates[cell], 0)
+
+    @property
+    def topology(self) -> Topology:
+        return self._topology
+
     @property
     def wumpus_visited(self) -> set[tuple[int, int]]:
         return self._require_scent_memory().wumpus_visited
@@ -188,14 +282,28 @@ class GameEngine:
             raise RuntimeError("Scent memory system has not been initialized")
         return self._scent_memory
 
+    def arrow_hit(self, direction: Direction) -> int | None:
+        """Index of the first wumpus in the player's line of fire, or None."""
+        topology = self._topology
+        player_cell = topology.index(self.player_pos)
+        if not self._board.wumpus_on_ray(player_cell, direction.value):
+            return None
+        ray = topology.rays[direction.value][player_cell]
+        for index, wumpus in enumerate(self.wumpus_positions):
+            if ray >> topology.index(wumpus) & 1:
+                return index
+        return None
+
     def check_game_over(self) -> GameStatus:
-        if self.player_pos in self.pits:
+        board = self._board
+        player_cell = self._topology.index(self.player_pos)
+        if board.pits >> player_cell & 1:
             self.status = "PlayerLost_Pit"
             return self.status
-        if self.player_pos in self.wumpus_positions:
+        if board.wumpuses >> player_cell & 1:
             self.status = "PlayerLost_Wumpus"
             return self.status
-        if self.player_pos == self.gold_pos:
+        if board.gold >> player_cell & 1:
             self.status = "PlayerWon"
             return self.status
         self.status = "Ongoing"
@@ -0,0 +1,112 @@
+"""Lookup tables describing the grid itself, built once per board size.
+
+Cells are addressed by flat index ``y * size + x``; bitmasks set bit
+``cell`` for each member cell. Direction tables are indexed by
+``Direction.value`` (NORTH, SOUTH, EAST, WEST).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .entities import Position
+
+# (dx, dy) per Direction.value.
+DIRECTION_DELTAS: tuple[tuple[int, int], ...] = ((0, -1), (0, 1), (1, 0), (-1, 0))
+
+
+@dataclass(frozen=True)
+class Topology:
+    size: int
+    positions: tuple[Position, ...]
+    """Shared ``Position`` instance for every cell."""
+    coordinates: tuple[tuple[int, int], ...]
+    """Shared ``(x, y)`` key for every cell, as used by the scent memory."""
+    moves: tuple[tuple[int, ...], ...]
+    """``moves[direction][cell]``: destination of a move, clamped at the walls."""
+    adjacent: tuple[tuple[int, ...], ...]
+    """``adjacent[direction][cell]``: the neighbouring cell, or -1 off the board."""
+    neighbors: tuple[tuple[int, ...], ...]
+    """``neighbors[cell]``: in-bounds orthogonal neighbours in direction order."""
+    neighbor_masks: tuple[int, ...]
+    """``neighbor_masks[cell]``: bitmask of ``neighbors[cell]``."""
+    rays: tuple[tuple[int, ...], ...]
+    """``rays[direction][cell]``: bitmask of every cell strictly beyond ``cell``."""
+    origin_distance: tuple[int, ...]
+    """Manhattan distance of every cell from the start tile (0, 0)."""
+    distance_rings: tuple[tuple[int, ...], ...]
+    """``distance_rings[d]``: cells exactly ``d`` steps from the start tile."""
+    cells_by_distance: tuple[int, ...]
+    """Every cell, ordered by distance from the start tile."""
+    ring_starts: tuple[int, ...]
+    """``ring_starts[d]``: offset into ``cells_by_distance`` of the first cell
+    at least ``d`` steps away; the last entry is the cell count."""
+    distance_masks: tuple[int, ...]
+    """``distance_masks[d]``: bitmask of cells at least ``d`` steps away."""
+
+    def index(self, position: Position) -> int:
+        return position.y * self.size + position.x
+
+
+@lru_cache(maxsize=None)
+def get_topology(size: int) -> Topology:
+    """Return the (cached) tables for a ``size x size`` grid."""
+    cells = range(size * size)
+    positions = tuple(Position(x=cell % size, y=cell // size) for cell in cells)
+
+    adjacent: list[tuple[int, ...]] = []
+    moves: list[tuple[int, ...]] = []
+    for dx, dy in DIRECTION_DELTAS:
+        row: list[int] = []
+        for position in positions:
+            x, y = position.x + dx, position.y + dy
+            row.append(y * size + x if 0 <= x < size and 0 <= y < size else -1)
+        adjacent.append(tuple(row))
+        moves.append(tuple(cell if target < 0 else target for cell, target in enumerate(row)))
+
+    neighbors = tuple(
+        tuple(row[cell] for row in adjacent if row[cell] >= 0) for cell in cells
+    )
+    neighbor_masks = tuple(sum(1 << neighbor for neighbor in row) for row in neighbors)
+
+    rays: list[tuple[int, ...]] = []
+    for row in adjacent:
+        ray_row: list[int] = []
+        for cell in cells:
+            mask = 0
+            target = row[cell]
+            while target >= 0:
+                mask |= 1 << target
+                target = row[target]
+            ray_row.append(mask)
+        rays.append(tuple(ray_row))
+
+    origin_distance = tuple(position.x + position.y for position in positions)
+    distance_rings = tuple(
+        tuple(cell for cell in cells if origin_distance[cell] == distance)
+        for distance in range(2 * size - 1)
+    )
+    cells_by_distance = tuple(cell for ring in distance_rings for cell in ring)
+    ring_starts = tuple(
+        sum(len(ring) for ring in distance_rings[:distance])
+        for distance in range(len(distance_rings) + 1)
+    )
+    distance_masks = tuple(
+        sum(1 << cell for cell in cells_by_distance[start:]) for start in ring_starts
+    )
+    return Topology(
+        size=size,
+        positions=positions,
+        coordinates=tuple((position.x, position.y) for position in positions),
+        moves=tuple(moves),
+        adjacent=tuple(adjacent),
+        neighbors=neighbors,
+        neighbor_masks=neighbor_masks,
+        rays=tuple(rays),
+        origin_distance=origin_distance,
+        distance_rings=distance_rings,
+        cells_by_distance=cells_by_distance,
+        ring_starts=ring_starts,
+        distance_masks=distance_masks,
+    )
@@ -0,0 +1,164 @@
+"""Precomputed wumpus actions for every discrete observation of a grid size.
+
+An observation is fully described by the wumpus cell, the player cell and
+the five scent values (each ``0..MAX_SCENT``), so a policy can be evaluated
+once for all of them and served by index. Tables are flat ``uint8`` ``.npy``
+files laid out as ``[wumpus_cell][player_cell][scent code]``, where the
+scent code reads the five scents (center, N, E, S, W) as base
+``MAX_SCENT + 1`` digits. They are opened memory-mapped, so every worker
+process shares the same pages. A table's file name carries the content
+hash of the model artifact it was built from, so a retrained model is
+never served an older policy's table.
+
+    python -m rl.action_table --sizes 4 10
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.format import open_memmap
+
+from engine.entities import Direction
+from engine.senses import MAX_SCENT
+from rl.agent import PredictableModel
+from rl.observation import OBSERVATION_SIZE
+
+SCENT_LEVELS = MAX_SCENT + 1
+SCENT_CODES = SCENT_LEVELS ** 5
+# Weight of each scent feature's digit in the scent code.
+_SCENT_WEIGHTS = SCENT_LEVELS ** np.arange(4, -1, -1, dtype=np.int64)
+
+
+def table_size(size: int) -> int:
+    cells = size * size
+    return cells * cells * SCENT_CODES
+
+
+TABLE_HASH_CHARS = 16
+
+
+def table_path(model_path: Path, size: int, sha256: str) -> Path:
+    """Where the table built from artifact ``sha256`` lives (``easy_10.<hash>.npy``)."""
+    return model_path.with_name(f"{model_path.stem}_{size}.{sha256[:TABLE_HASH_CHARS]}.npy")
+
+
+class ActionTable:
+    """Serves a precomputed table through the ``PredictableModel`` interface."""
+
+    def __init__(self, actions: npt.NDArray[np.uint8], size: int) -> None:
+        if actions.shape != (table_size(size),):
+            raise ValueError(
+                f"Action table for a {size}x{size} grid needs {table_size(size)} entries, "
+                f"got shape {actions.shape}"
+            )
+        self.actions = actions
+        self.size = size
+
+    @classmethod
+    def load(cls, path: str | Path, size: int) -> ActionTable:
+        return cls(np.load(path, mmap_mode="r"), size)
+
+    def indices(self, observations: npt.NDArray[np.float32]) -> npt.NDArray[np.int64]:
+        """Table index of every row of a ``(k, 9)`` observation matrix."""
+        observations = np.asarray(observations, dtype=np.float32).reshape((-1, OBSERVATION_SIZE))
+        cells = self.size * self.size
+        coords = np.rint(observations[:, :4] * max(1, self.size - 1)).astype(np.int64)
+        scents = np.rint(observations[:, 4:] * MAX_SCENT).astype(np.int64)
+        wumpus_cell = coords[:, 1] * self.size + coords[:, 0]
+        player_cell = coords[:, 3] * self.size + coords[:, 2]
+        return (wumpus_cell * cells + player_cell) * SCENT_CODES + scents @ _SCENT_WEIGHTS
+
+    def predict(
+        self, observation: npt.NDArray[np.float32], deterministic: bool = True,
+    ) -> tuple[npt.NDArray[np.int64], None]:
+        del deterministic
+        single = np.ndim(observation) == 1
+        actions = self.actions[self.indices(observation)].astype(np.int64)
+        return (actions[0] if single else actions), None
+
+    def predict_observations(self, observations: npt.NDArray[np.float32]) -> list[Direction]:
+        return [Direction(int(action)) for action in self.actions[self.indices(observations)]]
+
+
+def _observation_chunk(size: int, wumpus_cell: int) -> npt.NDArray[np.float32]:
+    """Every observation with the wumpus on ``wumpus_cell``, in table order."""
+    cells = size * size
+    denom = float(max(1, size - 1))
+    player_cells = np.repeat(np.arange(cells), SCENT_CODES)
+    codes = np.tile(np.arange(SCENT_CODES), cells)
+
+    chunk = np.empty((cells * SCENT_CODES, OBSERVATION_SIZE), dtype=np.float32)
+    chunk[:, 0] = (wumpus_cell % size) / denom
+    chunk[:, 1] = (wumpus_cell // size) / denom
+    chunk[:, 2] = (player_cells % size) / denom
+    chunk[:, 3] = (player_cells // size) / denom
+    for column, weight in enumerate(_SCENT_WEIGHTS, start=4):
+        chunk[:, column] = ((codes // weight) % SCENT_LEVELS) / float(MAX_SCENT)
+    return chunk
+
+
+def build_action_table(model: PredictableModel, size: int, path: str | Path) -> Path:
+    """Evaluate ``model`` on every observation of a ``size`` grid into ``path``."""
+    path = Path(path)
+    cells = size * size
+    rows = cells * SCENT_CODES
+    # Written under a temporary name so readers never map a half-built table.
+    partial = path.with_name(f".{path.name}.partial")
+    table = open_memmap(partial, mode="w+", dtype=np.uint8, shape=(table_size(size),))
+    try:
+        for wumpus_cell in range(cells):
+            actions, _ = model.predict(_observation_chunk(size, wumpus_cell), deterministic=True)
+            table[wumpus_cell * rows:(wumpus_cell + 1) * rows] = np.asarray(actions, dtype=np.uint8)
+        table.flush()
+    finally:
+        del table
+    partial.replace(path)
+    return path
+
+
+def build_tables(sizes: Iterable[int], difficulties: Iterable[str] | None = None) -> list[Path]:
+    """Build tables for every distinct trained model behind ``difficulties``."""
+    from rl import model_registry
+
+    written: list[Path] = []
+    seen: set[Path] = set()
+    for difficulty in difficulties or model_registry.DIFFICULTY_MODELS:
+        model_path = model_registry.model_path(difficulty)
+        if model_path is None or model_path in seen:
+            continue
+        seen.add(model_path)
+        agent = model_registry.load_model(difficulty)
+        model = getattr(agent, "model", None)
+        sha256 = model_registry.served_sha256(difficulty)
+        if model is None or sha256 is None:
+            print(f"Skipping {difficulty}: no trained model at {model_path}")
+            continue
+        for size in sizes:
+            path = build_action_table(model, size, table_path(model_path, size, sha256))
+            written.append(path)
+            # Tables of earlier versions of the model can never be served again.
+            for stale in model_path.parent.glob(f"{model_path.stem}_{size}.*.npy"):
+                if stale != path:
+                    stale.unlink()
+    model_registry.forget_missing_tables()
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute wumpus action lookup tables")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10], help="Grid sizes")
+    parser.add_argument(
+        "--difficulties", nargs="+", default=None, help="Difficulty tiers (default: all)",
+    )
+    args = parser.parse_args()
+    for path in build_tables(args.sizes, args.difficulties):
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
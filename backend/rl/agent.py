@@ -6,8 +6,13 @@ from typing import Any, Protocol
 import numpy as np
 import numpy.typing as npt
 
-from engine.entities import Direction, Position
-from engine.senses import MAX_SCENT
+from engine.entities import Direction
+from engine.game_state import GameEngine
+from rl.observation import (
+    empty_observation,
+    write_engine_observations,
+    write_grid_observation,
+)
 
 
 class PredictableModel(Protocol):
@@ -19,11 +24,20 @@ class PredictableModel(Protocol):
 class RandomWumpusAgent:
     """Fallback agent used when the trained model file is not available."""
 
+    def __init__(self, seed: int | None = None) -> None:
+        self._rng = random.Random(seed)
+
     def build_observation(self, game_state: dict[str, Any]) -> npt.NDArray[np.float32]:
         return np.zeros(9, dtype=np.float32)
 
     def get_wumpus_action(self, obs: npt.NDArray[np.float32]) -> Direction:
-        return random.choice(list(Direction))
+        return self._rng.choice(list(Direction))
+
+    def predict_batch(self, engine: GameEngine) -> list[Direction]:
+        return [self._rng.choice(list(Direction)) for _ in engine.wumpus_positions]
+
+    def predict_observations(self, observations: npt.NDArray[np.float32]) -> list[Direction]:
+        return [self._rng.choice(list(Direction)) for _ in range(len(observations))]
 
 
 class WumpusAgent:
@@ -36,41 +50,31 @@ class WumpusAgent:
         action_value = int(np.asarray(action, dtype=np.int64).item())
         return Direction(action_value)
 
+    def predict_batch(self, engine: GameEngine) -> list[Direction]:
+        """Choose a move for every wumpus of ``engine`` in one forward pass."""
+        return self.predict_observations(write_engine_observations(engine))
+
+    def predict_observations(self, observations: npt.NDArray[np.float32]) -> list[Direction]:
+        batch = np.asarray(observations, dtype=np.float32).reshape((-1, 9))
+        actions, _ = self.model.predict(batch, deterministic=True)
+        return [Direction(int(action)) for action in np.asarray(actions, dtype=np.int64).reshape(-1)]
+
     def decide_from_state(self, game_state: dict[str, Any]) -> Direction:
         observation = self.build_observation(game_state)
         return self.get_wumpus_action(observation)
 
-    def build_observation(self, game_state: dict[str, Any]) -> npt.NDArray[np.float32]:
-        grid_size = int(game_state["grid_size"])
-        denom = float(max(1, grid_size - 1))
-
-        wumpus_x, wumpus_y = self._pair_to_position(game_state["wumpus_pos"])
-        player_x, player_y = self._pair_to_position(game_state["player_pos"])
-        scent_grid_raw = game_state["scent_grid"]
-        scent_grid = [[int(value) for value in row] for row in scent_grid_raw]
-
-        wumpus = Position(x=wumpus_x, y=wumpus_y)
-        obs: npt.NDArray[np.float32] = np.array(
-            [
-                wumpus.x / denom,
-                wumpus.y / denom,
-                player_x / denom,
-                player_y / denom,
-                self._scent_at(scent_grid, grid_size, wumpus),
-                self._scent_at(scent_grid, grid_size, Position(x=wumpus.x, y=wumpus.y - 1)),
-                self._scent_at(scent_grid, grid_size, Position(x=wumpus.x + 1, y=wumpus.y)),
-                self._scent_at(scent_grid, grid_size, Position(x=wumpus.x, y=wumpus.y + 1)),
-                self._scent_at(scent_grid, grid_size, Position(x=wumpus.x - 1, y=wumpus.y)),
-            ],
-            dtype=np.float32,
+    def build_observation(
+        self,
+        game_state: dict[str, Any],
+        out: npt.NDArray[np.float32] | None = None,
+    ) -> npt.NDArray[np.float32]:
+        return write_grid_observation(
+            empty_observation() if out is None else out,
+            int(game_state["grid_size"]),
+            self._pair_to_position(game_state["wumpus_pos"]),
+            self._pair_to_position(game_state["player_pos"]),
+            game_state["scent_grid"],
         )
-        return obs
-
-    def _scent_at(self, scent_grid: list[list[int]], grid_size: int, position: Position) -> float:
-        if position.x < 0 or position.x >= grid_size or position.y < 0 or position.y >= grid_size:
-            return 0.0
-        scent_value = scent_grid[position.y][position.x]
-        return float(scent_value) / float(MAX_SCENT)
 
     def _pair_to_position(self, pair: Any) -> tuple[int, int]:
         if not isinstance(pair, (list, tuple)) or len(pair) != 2:
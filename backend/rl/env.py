@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import random
 from typing import Any, ClassVar
 
 import gymnasium as gym
@@ -10,7 +9,7 @@ from gymnasium import spaces
 
 from engine.entities import Direction, Position
 from engine.game_state import GameEngine
-from engine.senses import MAX_SCENT
+from rl.observation import empty_observation, write_engine_observation
 
 
 class HunterWumpusEnv(gym.Env):
@@ -23,6 +22,7 @@ class HunterWumpusEnv(gym.Env):
         self.max_steps = max_steps
         self.step_count = 0
         self.engine = GameEngine(size=self.size, num_pits=self.num_pits)
+        self._obs = empty_observation()
 
         self.action_space = spaces.Discrete(4)
         self.observation_space = spaces.Box(
@@ -40,9 +40,7 @@ class HunterWumpusEnv(gym.Env):
     ) -> tuple[npt.NDArray[np.float32], dict[str, Any]]:
         del options
         super().reset(seed=seed)
-        if seed is not None:
-            random.seed(seed)
-        self.engine = GameEngine(size=self.size, num_pits=self.num_pits)
+        self.engine.reset(seed=seed)
         self.step_count = 0
         return self._get_obs(), {}
 
@@ -98,30 +96,9 @@ class HunterWumpusEnv(gym.Env):
         return self._action_to_direction(sampled)
 
     def _get_obs(self) -> npt.NDArray[np.float32]:
-        denom = float(max(1, self.size - 1))
-        wumpus = self.engine.wumpus_pos
-        player = self.engine.player_pos
-
-        obs: npt.NDArray[np.float32] = np.array(
-            [
-                wumpus.x / denom,
-                wumpus.y / denom,
-                player.x / denom,
-                player.y / denom,
-                self._scent_at(wumpus),
-                self._scent_at(Position(x=wumpus.x, y=wumpus.y - 1)),
-                self._scent_at(Position(x=wumpus.x + 1, y=wumpus.y)),
-                self._scent_at(Position(x=wumpus.x, y=wumpus.y + 1)),
-                self._scent_at(Position(x=wumpus.x - 1, y=wumpus.y)),
-            ],
-            dtype=np.float32,
-        )
-        return obs
-
-    def _scent_at(self, pos: Position) -> float:
-        if pos.x < 0 or pos.x >= self.size or pos.y < 0 or pos.y >= self.size:
-            return 0.0
-        return float(self.engine.scent_grid[pos.y][pos.x]) / float(MAX_SCENT)
+        # Built in the reusable buffer, then copied: vec envs keep returned
+        # observations (e.g. as ``terminal_observation``) past the next step.
+        return write_engine_observation(self._obs, self.engine, self.engine.wumpus_pos).copy()
 
     def _compute_reward(
         self,
@@ -134,7 +111,7 @@ class HunterWumpusEnv(gym.Env):
         if wumpus_before == wumpus_after:
             reward -= 5.0
 
-        if self._scent_at(wumpus_after) > 0.0:
+        if self.engine.scent_at(wumpus_after) > 0:
             reward += 2.0
 
         if status == "PlayerLost_Wumpus":
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Union
 
-from stable_baselines3 import PPO
-
+from rl.action_table import ActionTable, table_path
 from rl.agent import RandomWumpusAgent, WumpusAgent
+from rl.numpy_policy import NumpyPolicy, export_model_file
 
 logger = logging.getLogger(__name__)
 
@@ -21,36 +27,321 @@ DIFFICULTY_MODELS: dict[str, str] = {
     "impossible_iii": "impossible.zip",
 }
 
+DEFAULT_WATCH_INTERVAL = 5.0
+
 WumpusPolicy = Union[WumpusAgent, RandomWumpusAgent]
 
+
+@dataclass(frozen=True)
+class ModelMetrics:
+    path: str
+    sha256: str
+    file_bytes: int
+    parameter_bytes: int
+    load_seconds: float
+    loaded_at: float
+
+
+@dataclass(frozen=True)
+class _Artifact:
+    path: Path
+    sha256: str
+    mtime_ns: int
+    agent: WumpusAgent
+    metrics: ModelMetrics
+
+
+# Difficulty -> agent; the hot path is a single dict read.
 _cache: dict[str, WumpusPolicy] = {}
+# (artifact path, content hash) -> loaded artifact, shared by every tier using it.
+_artifacts: dict[tuple[Path, str], _Artifact] = {}
+# (difficulty, grid size) -> (agent looked up for, its table or None if not built).
+# The served agent changes exactly when the artifact hash does, so it keys
+# the entry to that hash without taking the lock on the hot path.
+_tables: dict[tuple[str, int], tuple[WumpusPolicy, ActionTable | None]] = {}
+_lock = threading.Lock()
+_path_locks: dict[Path, threading.Lock] = {}
+_watcher: _ModelWatcher | None = None
+_reload_listeners: list[Callable[[list[str]], None]] = []
+# .zip path -> mtime of the version that could not be exported to NumPy.
+_failed_exports: dict[Path, int] = {}
+
+
+def model_path(difficulty: str) -> Path | None:
+    """Path of the trained model for ``difficulty``, or None if unknown."""
+    filename = DIFFICULTY_MODELS.get(difficulty)
+    return None if filename is None else _MODELS_DIR / filename
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _artifact_path(path: Path) -> Path | None:
+    """The file actually loaded for a model: its NumPy export unless that is stale.
+
+    An export older than its ``.zip`` predates a retrain, so the ``.zip`` is
+    exported again; if that fails the ``.zip`` itself is served.
+    """
+    export_path = path.with_suffix(".npz")
+    model_mtime = _mtime_ns(path)
+    export_mtime = _mtime_ns(export_path)
+    if export_mtime is not None and (model_mtime is None or export_mtime >= model_mtime):
+        return export_path
+    if model_mtime is None:
+        return None
+    if export_mtime is None or _failed_exports.get(path) == model_mtime:
+        return path
+    try:
+        export_model_file(path)
+    except Exception:
+        logger.exception("Re-exporting retrained %s failed; serving the .zip", path)
+        _failed_exports[path] = model_mtime
+        return path
+    logger.info("Re-exported retrained %s to %s", path, export_path)
+    return export_path
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _parameter_bytes(agent: WumpusAgent) -> int:
+    model = agent.model
+    if isinstance(model, NumpyPolicy):
+        return model.nbytes
+    policy = getattr(model, "policy", None)
+    if policy is None:
+        return 0
+    return sum(p.numel() * p.element_size() for p in policy.parameters())
+
+
+def _load_artifact(path: Path) -> _Artifact:
+    """Load ``path`` unless an artifact with the same content is already loaded."""
+    with _lock:
+        path_lock = _path_locks.setdefault(path, threading.Lock())
+    with path_lock:
+        stat = path.stat()
+        sha256 = _file_sha256(path)
+        existing = _artifacts.get((path, sha256))
+        if existing is not None:
+            if existing.mtime_ns != stat.st_mtime_ns:
+                # Touched but not modified: remember the new mtime so the
+                # watcher does not hash the file again on every poll.
+                existing = replace(existing, mtime_ns=stat.st_mtime_ns)
+                with _lock:
+                    _artifacts[(path, sha256)] = existing
+            return existing
+
+        started = time.perf_counter()
+        if path.suffix == ".npz":
+            # Exported actors run in NumPy, so serving never has to import torch.
+            agent = WumpusAgent(model=NumpyPolicy.load(path))
+        else:
+            from stable_baselines3 import PPO
+
+            logger.info("No NumPy export for %s, loading it with stable-baselines3", path)
+            agent = WumpusAgent(model=PPO.load(str(path)))
+        load_seconds = time.perf_counter() - started
+
+        metrics = ModelMetrics(
+            path=str(path),
+            sha256=sha256,
+            file_bytes=stat.st_size,
+            parameter_bytes=_parameter_bytes(agent),
+            load_seconds=load_seconds,
+            loaded_at=time.time(),
+        )
+        artifact = _Artifact(
+            path=path, sha256=sha256, mtime_ns=stat.st_mtime_ns, agent=agent, metrics=metrics,
+        )
+        with _lock:
+            # Older versions of this file are no longer served.
+            for key in [key for key in _artifacts if key[0] == path]:
+                del _artifacts[key]
+            _artifacts[(path, sha256)] = artifact
+        logger.info("Loaded %s (%s) in %.3fs", path, sha256[:12], load_seconds)
+        return artifact
 
 
 def load_model(difficulty: str) -> WumpusPolicy:
     """Load (or return cached) agent for the given difficulty tier."""
-    if difficulty in _cache:
-        return _cache[difficulty]
-
-    filename = DIFFICULTY_MODELS.get(difficulty)
-    if filename is None:
-        logger.warning("Unknown difficulty %r, falling back to random agent", difficulty)
-        agent: WumpusPolicy = RandomWumpusAgent()
-        _cache[difficulty] = agent
+    agent = _cache.get(difficulty)
+    if agent is not None:
         return agent
 
-    model_path = _MODELS_DIR / filename
-    if not model_path.exists():
-        logger.warning("Model file %s not found, using random agent", model_path)
+    path = model_path(difficulty)
+    if path is None:
+        logger.warning("Unknown difficulty %r, falling back to random agent", difficulty)
         agent = RandomWumpusAgent()
-        _cache[difficulty] = agent
-        return agent
+    else:
+        artifact_path = _artifact_path(path)
+        if artifact_path is None:
+            logger.warning("Model file %s not found, using random agent", path)
+            agent = RandomWumpusAgent()
+        else:
+            agent = _load_artifact(artifact_path).agent
+    return _cache.setdefault(difficulty, agent)
+
+
+def preload(difficulties: list[str] | None = None, max_workers: int | None = None) -> None:
+    """Load every tier up front, each distinct artifact once and concurrently."""
+    tiers = list(DIFFICULTY_MODELS) if difficulties is None else difficulties
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-preload") as pool:
+        for future in [pool.submit(load_model, difficulty) for difficulty in tiers]:
+            future.result()
+
+
+def model_metrics() -> list[ModelMetrics]:
+    """Load metrics of every artifact currently being served."""
+    with _lock:
+        return [artifact.metrics for artifact in _artifacts.values()]
+
+
+def add_reload_listener(listener: Callable[[list[str]], None]) -> None:
+    """Call ``listener`` with the updated tiers after every reload that swaps a model."""
+    _reload_listeners.append(listener)
+
+
+def reload_changed() -> list[str]:
+    """Swap in retrained models whose files changed; returns the updated tiers.
+
+    New versions are fully loaded before the cache entry is replaced, so
+    requests keep using the agent they already hold and never wait on a load.
+    Action tables of the old version stop being served at the same moment;
+    the new version runs directly until its own tables are built.
+    """
+    forget_missing_tables()
+    updated: list[str] = []
+    for difficulty in list(_cache):
+        path = model_path(difficulty)
+        if path is None:
+            continue
+        artifact_path = _artifact_path(path)
+        current = _cache.get(difficulty)
+        if artifact_path is None:
+            continue
+        served = _served_artifact(current)
+        if served is not None and served.path == artifact_path:
+            if artifact_path.stat().st_mtime_ns == served.mtime_ns:
+                continue
+        try:
+            artifact = _load_artifact(artifact_path)
+        except Exception:
+            logger.exception("Reloading %s failed; keeping the current model", artifact_path)
+            continue
+        if artifact.agent is not current:
+            _cache[difficulty] = artifact.agent
+            # Tables are named by artifact hash, so the old policy's tables are
+            # never mapped again; drop the open ones to release them.
+            for key in [key for key in _tables if key[0] == difficulty]:
+                _tables.pop(key, None)
+            updated.append(difficulty)
+    if updated:
+        logger.info("Hot-reloaded models for %s", ", ".join(updated))
+        for listener in _reload_listeners:
+            try:
+                listener(updated)
+            except Exception:
+                logger.exception("Model reload listener %r failed", listener)
+    return updated
+
+
+def _served_artifact(agent: WumpusPolicy | None) -> _Artifact | None:
+    with _lock:
+        for artifact in _artifacts.values():
+            if artifact.agent is agent:
+                return artifact
+    return None
+
+
+class _ModelWatcher(threading.Thread):
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="model-watcher", daemon=True)
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                reload_changed()
+            except Exception:
+                logger.exception("Model watcher iteration failed")
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+def start_watcher(interval: float = DEFAULT_WATCH_INTERVAL) -> None:
+    """Poll model files every ``interval`` seconds and hot-reload changes."""
+    global _watcher
+    if _watcher is not None or interval <= 0:
+        return
+    _watcher = _ModelWatcher(interval)
+    _watcher.start()
+
+
+def stop_watcher() -> None:
+    global _watcher
+    if _watcher is None:
+        return
+    _watcher.stop()
+    _watcher.join()
+    _watcher = None
+
+
+def served_sha256(difficulty: str) -> str | None:
+    """Content hash of the trained artifact serving ``difficulty``, if one is loaded."""
+    artifact = _served_artifact(_cache.get(difficulty))
+    return None if artifact is None else artifact.sha256
+
+
+def load_action_table(difficulty: str, grid_size: int) -> ActionTable | None:
+    """Memory-mapped action table of the model serving ``difficulty``, if built.
+
+    Only a table named after the served artifact's hash is used, so after a
+    reload the old policy's table is never served. Misses are remembered
+    too, so the common no-table case is two dict reads; tables built later
+    are found after ``forget_missing_tables`` (every watcher poll).
+    """
+    agent = _cache.get(difficulty)
+    if agent is None:
+        # The model is loaded off the event loop by the inference path.
+        return None
+    key = (difficulty, grid_size)
+    entry = _tables.get(key)
+    if entry is not None and entry[0] is agent:
+        return entry[1]
+
+    table = None
+    path = model_path(difficulty)
+    sha256 = served_sha256(difficulty)
+    if path is not None and sha256 is not None:
+        table_file = table_path(path, grid_size, sha256)
+        if table_file.exists():
+            table = ActionTable.load(table_file, grid_size)
+    _tables[key] = (agent, table)
+    return table
+
 
-    ppo = PPO.load(str(model_path))
-    agent = WumpusAgent(model=ppo)
-    _cache[difficulty] = agent
-    return agent
+def forget_missing_tables() -> None:
+    """Look for action tables that were missing again on their next use."""
+    for key, (_, table) in list(_tables.items()):
+        if table is None:
+            _tables.pop(key, None)
 
 
 def clear_cache() -> None:
-    """Clear the model cache (useful for testing)."""
-    _cache.clear()
+    """Clear the model and action-table caches (useful for testing)."""
+    with _lock:
+        _cache.clear()
+        _artifacts.clear()
+        _tables.clear()
+        _failed_exports.clear()
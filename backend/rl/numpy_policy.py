@@ -0,0 +1,148 @@
+"""Torch-free forward pass of an exported PPO actor.
+
+``export_policy`` pulls the actor MLP (``mlp_extractor.policy_net`` followed
+by ``action_net``) out of a trained PPO model into a small ``.npz``;
+``NumpyPolicy`` replays it with NumPy so serving never imports torch.
+
+    python -m rl.numpy_policy models/easy.zip models/hard.zip
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+_ACTIVATIONS = ("tanh", "relu")
+
+
+def _tanh(values: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+    return np.tanh(values, out=values)
+
+
+def _relu(values: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+    return np.maximum(values, 0.0, out=values)
+
+
+class NumpyPolicy:
+    """Deterministic argmax over the logits of a feed-forward actor."""
+
+    def __init__(
+        self,
+        weights: Sequence[npt.NDArray[np.float32]],
+        biases: Sequence[npt.NDArray[np.float32]],
+        activation: str = "tanh",
+        seed: int | None = None,
+    ) -> None:
+        if len(weights) != len(biases) or not weights:
+            raise ValueError("weights and biases must be non-empty and of equal length")
+        if activation not in _ACTIVATIONS:
+            raise ValueError(f"Unsupported activation: {activation!r}")
+        # Stored transposed so a batch is ``observations @ weight + bias``.
+        self._weights = [np.ascontiguousarray(w, dtype=np.float32).T for w in weights]
+        self._biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activation = activation
+        self._activate = _tanh if activation == "tanh" else _relu
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(w.nbytes + b.nbytes for w, b in zip(self._weights, self._biases))
+
+    @classmethod
+    def load(cls, path: str | Path) -> NumpyPolicy:
+        with np.load(path) as data:
+            count = int(data["num_layers"])
+            return cls(
+                weights=[data[f"weight_{i}"] for i in range(count)],
+                biases=[data[f"bias_{i}"] for i in range(count)],
+                activation=str(data["activation"]),
+            )
+
+    def save(self, path: str | Path) -> None:
+        arrays: dict[str, Any] = {
+            "num_layers": np.array(len(self._weights)),
+            "activation": np.array(self.activation),
+        }
+        for i, (weight, bias) in enumerate(zip(self._weights, self._biases)):
+            arrays[f"weight_{i}"] = weight.T
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+
+    def logits(self, observations: npt.NDArray[np.float32]) -> npt.NDArray[np.float32]:
+        hidden = np.asarray(observations, dtype=np.float32)
+        last = len(self._weights) - 1
+        for i, (weight, bias) in enumerate(zip(self._weights, self._biases)):
+            hidden = hidden @ weight
+            hidden += bias
+            if i < last:
+                hidden = self._activate(hidden)
+        return hidden
+
+    def predict(
+        self, observation: npt.NDArray[np.float32], deterministic: bool = True,
+    ) -> tuple[npt.NDArray[np.int64], None]:
+        """Mirror ``PPO.predict``: one action per row, or a scalar for one row."""
+        observation = np.asarray(observation, dtype=np.float32)
+        single = observation.ndim == 1
+        logits = self.logits(observation.reshape(1, -1) if single else observation)
+        if deterministic:
+            actions = logits.argmax(axis=1)
+        else:
+            shifted = np.exp(logits - logits.max(axis=1, keepdims=True))
+            cumulative = np.cumsum(shifted / shifted.sum(axis=1, keepdims=True), axis=1)
+            draws = self._rng.random((len(logits), 1))
+            actions = np.minimum((cumulative < draws).sum(axis=1), logits.shape[1] - 1)
+        actions = actions.astype(np.int64)
+        return (actions[0] if single else actions), None
+
+
+def export_policy(model: Any) -> NumpyPolicy:
+    """Build a ``NumpyPolicy`` from a loaded SB3 ``PPO`` with an MLP actor."""
+    from stable_baselines3.common.torch_layers import FlattenExtractor
+    from torch import nn
+
+    policy = model.policy
+    if not isinstance(policy.pi_features_extractor, FlattenExtractor):
+        raise ValueError("Only flat (un-normalised) observation features can be exported")
+    activation_fn = policy.activation_fn
+    if activation_fn is nn.Tanh:
+        activation = "tanh"
+    elif activation_fn is nn.ReLU:
+        activation = "relu"
+    else:
+        raise ValueError(f"Unsupported activation: {activation_fn!r}")
+
+    linears = [m for m in policy.mlp_extractor.policy_net if isinstance(m, nn.Linear)]
+    linears.append(policy.action_net)
+    return NumpyPolicy(
+        weights=[layer.weight.detach().cpu().numpy() for layer in linears],
+        biases=[layer.bias.detach().cpu().numpy() for layer in linears],
+        activation=activation,
+    )
+
+
+def export_model_file(model_path: str | Path) -> Path:
+    """Write ``<model>.npz`` next to a saved PPO ``.zip`` and return its path."""
+    from stable_baselines3 import PPO
+
+    model_path = Path(model_path)
+    output_path = model_path.with_suffix(".npz")
+    export_policy(PPO.load(str(model_path), device="cpu")).save(output_path)
+    return output_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export PPO actors for torch-free serving")
+    parser.add_argument("models", nargs="+", help="Saved PPO .zip files")
+    args = parser.parse_args()
+    for model_path in args.models:
+        print(f"Exported {model_path} -> {export_model_file(model_path)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""The 9-feature wumpus observation, written into caller-owned buffers.
+
+Layout: wumpus x, wumpus y, player x, player y (each scaled to [0, 1] by
+``size - 1``), then the scent at the wumpus cell and its north, east, south
+and west neighbours (scaled by ``MAX_SCENT``; 0 off the board).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+
+import numpy as np
+import numpy.typing as npt
+
+from engine.entities import Direction, Position
+from engine.game_state import GameEngine
+from engine.senses import MAX_SCENT
+from engine.topology import Topology, get_topology
+
+OBSERVATION_SIZE = 9
+
+# Neighbour order of the scent features, which differs from Direction order.
+_SCENT_DIRECTIONS: tuple[int, ...] = (
+    Direction.NORTH.value,
+    Direction.EAST.value,
+    Direction.SOUTH.value,
+    Direction.WEST.value,
+)
+_SCENT_FEATURES: tuple[float, ...] = tuple(
+    float(value) / float(MAX_SCENT) for value in range(MAX_SCENT + 1)
+)
+
+
+def empty_observation() -> npt.NDArray[np.float32]:
+    return np.zeros(OBSERVATION_SIZE, dtype=np.float32)
+
+
+@lru_cache(maxsize=None)
+def _coordinate_features(size: int) -> tuple[float, ...]:
+    denom = float(max(1, size - 1))
+    return tuple(value / denom for value in range(size))
+
+
+def write_observation(
+    out: npt.NDArray[np.float32],
+    topology: Topology,
+    wumpus_cell: int,
+    player_cell: int,
+    scent_at_cell: Callable[[int], int],
+) -> npt.NDArray[np.float32]:
+    """Fill ``out`` in place from flat cell indices and return it."""
+    features = _coordinate_features(topology.size)
+    wumpus = topology.positions[wumpus_cell]
+    player = topology.positions[player_cell]
+    out[0] = features[wumpus.x]
+    out[1] = features[wumpus.y]
+    out[2] = features[player.x]
+    out[3] = features[player.y]
+    out[4] = _SCENT_FEATURES[scent_at_cell(wumpus_cell)]
+    adjacent = topology.adjacent
+    for slot, direction in enumerate(_SCENT_DIRECTIONS, start=5):
+        neighbor = adjacent[direction][wumpus_cell]
+        out[slot] = _SCENT_FEATURES[scent_at_cell(neighbor)] if neighbor >= 0 else 0.0
+    return out
+
+
+def write_engine_observation(
+    out: npt.NDArray[np.float32], engine: GameEngine, wumpus: Position,
+) -> npt.NDArray[np.float32]:
+    """Fill ``out`` with ``wumpus``'s view of ``engine`` and return it."""
+    topology = engine.topology
+    return write_observation(
+        out,
+        topology,
+        topology.index(wumpus),
+        topology.index(engine.player_pos),
+        engine.scent_at_cell,
+    )
+
+
+def write_grid_observation(
+    out: npt.NDArray[np.float32],
+    size: int,
+    wumpus: tuple[int, int],
+    player: tuple[int, int],
+    scent_grid: Sequence[Sequence[int]],
+) -> npt.NDArray[np.float32]:
+    """Fill ``out`` from a dense ``[y][x]`` scent grid and return it."""
+    topology = get_topology(size)
+    return write_observation(
+        out,
+        topology,
+        wumpus[1] * size + wumpus[0],
+        player[1] * size + player[0],
+        lambda cell: int(scent_grid[cell // size][cell % size]),
+    )
+
+
+def write_engine_observations(
+    engine: GameEngine, out: npt.NDArray[np.float32] | None = None,
+) -> npt.NDArray[np.float32]:
+    """Return a ``(k, 9)`` matrix with one row per wumpus of ``engine``.
+
+    Rows are filled in ``out`` when it is given and has room for every wumpus.
+    """
+    count = len(engine.wumpus_positions)
+    if out is None or len(out) < count:
+        out = np.empty((count, OBSERVATION_SIZE), dtype=np.float32)
+    rows = out[:count]
+    for row, wumpus in zip(rows, engine.wumpus_positions):
+        write_engine_observation(row, engine, wumpus)
+    return rows
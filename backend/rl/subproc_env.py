@@ -0,0 +1,290 @@
+"""Multi-process rollout collection over shared-memory buffers."""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import pickle
+import struct
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+import numpy.typing as npt
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+from stable_baselines3.common.vec_env.base_vec_env import VecEnvIndices, VecEnvStepReturn
+
+from engine.game_state import STATUS_LABELS
+from rl.vec_env import HunterWumpusVecEnv
+
+# (name, dtype, per-env shape) of every array shared between the trainer and workers.
+_FIELDS: tuple[tuple[str, type[np.generic], tuple[int, ...]], ...] = (
+    ("actions", np.int64, ()),
+    ("obs", np.float32, (9,)),
+    ("terminal_obs", np.float32, (9,)),
+    ("rewards", np.float32, ()),
+    ("dones", np.bool_, ()),
+    ("truncated", np.bool_, ()),
+    ("status", np.int8, ()),
+    ("step_counts", np.int64, ()),
+)
+_ALIGNMENT = 8
+
+_CMD_STEP = b"s"
+_CMD_RESET = b"r"
+_CMD_CLOSE = b"c"
+# Followed by a pickled (kind, name, args, kwargs, local indices) request.
+_CMD_CALL = b"m"
+_SEED = struct.Struct("<q")
+
+
+def _buffer_layout(num_envs: int) -> tuple[list[tuple[str, np.dtype[Any], tuple[int, ...], int]], int]:
+    layout = []
+    offset = 0
+    for name, dtype, shape in _FIELDS:
+        full_shape = (num_envs, *shape)
+        nbytes = int(np.prod(full_shape)) * np.dtype(dtype).itemsize
+        layout.append((name, np.dtype(dtype), full_shape, offset))
+        offset += -(-nbytes // _ALIGNMENT) * _ALIGNMENT
+    return layout, offset
+
+
+def _attach_buffers(shm: SharedMemory, num_envs: int) -> dict[str, npt.NDArray[Any]]:
+    layout, _ = _buffer_layout(num_envs)
+    return {
+        name: np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        for name, dtype, shape, offset in layout
+    }
+
+
+def _handle_call(env: HunterWumpusVecEnv, request: bytes) -> bytes:
+    """Run a forwarded get_attr/set_attr/env_method; reply with (ok, result or error)."""
+    kind, name, args, kwargs, indices = pickle.loads(request)
+    try:
+        if kind == "get":
+            result: Any = env.get_attr(name, indices)
+        elif kind == "set":
+            result = env.set_attr(name, args[0], indices)
+        else:
+            result = env.env_method(name, *args, indices=indices, **kwargs)
+        return pickle.dumps((True, result))
+    except Exception as exc:
+        return pickle.dumps((False, exc))
+
+
+def _worker(
+    conn: Connection,
+    shm_name: str,
+    num_envs: int,
+    start: int,
+    stop: int,
+    env_kwargs: dict[str, Any],
+    seed: int,
+) -> None:
+    shm = SharedMemory(name=shm_name)
+    buffers = {name: array[start:stop] for name, array in _attach_buffers(shm, num_envs).items()}
+    env = HunterWumpusVecEnv(num_envs=stop - start, seed=seed, **env_kwargs)
+    try:
+        while True:
+            command = conn.recv_bytes()
+            if command == _CMD_STEP:
+                obs, rewards, dones, infos = env.step(buffers["actions"])
+                buffers["obs"][:] = obs
+                buffers["rewards"][:] = rewards
+                buffers["dones"][:] = dones
+                for index, info in enumerate(infos):
+                    buffers["status"][index] = STATUS_LABELS.index(info["status"])
+                    buffers["step_counts"][index] = info["step_count"]
+                    if dones[index]:
+                        buffers["terminal_obs"][index] = info["terminal_observation"]
+                        buffers["truncated"][index] = info["TimeLimit.truncated"]
+            elif command.startswith(_CMD_RESET):
+                if len(command) > len(_CMD_RESET):
+                    env.seed(_SEED.unpack_from(command, len(_CMD_RESET))[0])
+                buffers["obs"][:] = env.reset()
+            elif command.startswith(_CMD_CALL):
+                conn.send_bytes(_handle_call(env, command[len(_CMD_CALL):]))
+                continue
+            elif command == _CMD_CLOSE:
+                break
+            conn.send_bytes(b"")
+    finally:
+        env.close()
+        del buffers
+        shm.close()
+        conn.close()
+
+
+class SubprocWumpusVecEnv(VecEnv):
+    """``HunterWumpusVecEnv`` boards spread over ``num_workers`` processes.
+
+    Each worker owns ``envs_per_worker`` boards and reads actions from and
+    writes observations, rewards and episode ends into one shared-memory
+    block, so a step only exchanges a one-byte command per worker. Board and
+    player-move seeds are derived from ``seed`` and the global board index,
+    so a run is reproducible for a fixed worker layout.
+
+    ``get_attr``, ``set_attr`` and ``env_method`` are pickled over the worker
+    pipes to each worker's ``HunterWumpusVecEnv``. That env's attributes are
+    shared by all of its boards, so setting one for any index sets it for
+    the worker's whole slice.
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        envs_per_worker: int,
+        size: int = 4,
+        num_pits: int = 3,
+        max_steps: int = 200,
+        seed: int = 0,
+        start_method: str | None = None,
+    ) -> None:
+        if num_workers < 1 or envs_per_worker < 1:
+            raise ValueError("num_workers and envs_per_worker must be >= 1")
+        num_envs = num_workers * envs_per_worker
+        self.size = size
+        self.num_pits = num_pits
+        self.max_steps = max_steps
+        self.render_mode: str | None = None
+        self.closed = False
+        self._envs_per_worker = envs_per_worker
+
+        _, nbytes = _buffer_layout(num_envs)
+        self._shm = SharedMemory(create=True, size=nbytes)
+        self._buffers = _attach_buffers(self._shm, num_envs)
+
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+        env_kwargs = {"size": size, "num_pits": num_pits, "max_steps": max_steps}
+        self._conns: list[Connection] = []
+        self._processes: list[Any] = []
+        for worker in range(num_workers):
+            start = worker * envs_per_worker
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(
+                    child_conn, self._shm.name, num_envs, start, start + envs_per_worker,
+                    env_kwargs, seed + start,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+        super().__init__(
+            num_envs=num_envs,
+            observation_space=spaces.Box(low=0.0, high=1.0, shape=(9,), dtype=np.float32),
+            action_space=spaces.Discrete(4),
+        )
+
+    def _broadcast(self, commands: list[bytes]) -> None:
+        for conn, command in zip(self._conns, commands):
+            conn.send_bytes(command)
+        for conn in self._conns:
+            conn.recv_bytes()
+
+    def reset(self) -> npt.NDArray[np.float32]:
+        commands = []
+        for worker in range(len(self._conns)):
+            seed = self._seeds[worker * self._envs_per_worker]
+            commands.append(_CMD_RESET if seed is None else _CMD_RESET + _SEED.pack(seed))
+        self._broadcast(commands)
+        self._reset_seeds()
+        self._reset_options()
+        return self._buffers["obs"].copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._buffers["actions"][:] = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+        for conn in self._conns:
+            conn.send_bytes(_CMD_STEP)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        for conn in self._conns:
+            conn.recv_bytes()
+        buffers = self._buffers
+        infos: list[dict[str, Any]] = [
+            {"status": STATUS_LABELS[code], "step_count": int(count)}
+            for code, count in zip(buffers["status"], buffers["step_counts"])
+        ]
+        for index in np.flatnonzero(buffers["dones"]):
+            infos[index]["terminal_observation"] = buffers["terminal_obs"][index].copy()
+            infos[index]["TimeLimit.truncated"] = bool(buffers["truncated"][index])
+        return (
+            buffers["obs"].copy(),
+            buffers["rewards"].copy(),
+            buffers["dones"].copy(),
+            infos,
+        )
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for conn in self._conns:
+            conn.send_bytes(_CMD_CLOSE)
+        for process in self._processes:
+            process.join()
+        for conn in self._conns:
+            conn.close()
+        del self._buffers
+        self._shm.close()
+        self._shm.unlink()
+
+    def _call(
+        self,
+        kind: str,
+        name: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        indices: VecEnvIndices,
+    ) -> list[Any]:
+        """Forward a call to the workers owning ``indices``; results in index order."""
+        targets = list(self._get_indices(indices))
+        local: dict[int, list[int]] = {}
+        for index in targets:
+            local.setdefault(index // self._envs_per_worker, []).append(
+                index % self._envs_per_worker,
+            )
+        for worker, worker_indices in local.items():
+            request = pickle.dumps((kind, name, args, kwargs, worker_indices))
+            self._conns[worker].send_bytes(_CMD_CALL + request)
+        results: dict[int, Any] = {}
+        error: Exception | None = None
+        for worker in local:
+            ok, payload = pickle.loads(self._conns[worker].recv_bytes())
+            if ok:
+                results[worker] = iter(payload) if payload is not None else None
+            elif error is None:
+                error = payload
+        if error is not None:
+            raise error
+        if kind == "set":
+            return []
+        return [next(results[index // self._envs_per_worker]) for index in targets]
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> list[Any]:
+        return self._call("get", attr_name, (), {}, indices)
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        self._call("set", attr_name, (value,), {}, indices)
+
+    def env_method(
+        self,
+        method_name: str,
+        *method_args: Any,
+        indices: VecEnvIndices = None,
+        **method_kwargs: Any,
+    ) -> list[Any]:
+        return self._call("method", method_name, method_args, method_kwargs, indices)
+
+    def env_is_wrapped(
+        self, wrapper_class: type[gym.Wrapper], indices: VecEnvIndices = None,
+    ) -> list[bool]:
+        return [False for _ in self._get_indices(indices)]
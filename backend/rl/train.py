@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import time
 from pathlib import Path
 
 import numpy as np
@@ -8,12 +9,20 @@ from stable_baselines3 import PPO
 from stable_baselines3.common.callbacks import EvalCallback
 from stable_baselines3.common.evaluation import evaluate_policy
 from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.common.vec_env import DummyVecEnv
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv, VecMonitor
 
 from rl.env import HunterWumpusEnv
+from rl.numpy_policy import export_policy
+from rl.subproc_env import SubprocWumpusVecEnv
+from rl.vec_env import HunterWumpusVecEnv
 
 DEFAULT_TOTAL_TIMESTEPS = 1_000_000
 DEFAULT_SEED = 42
+DEFAULT_N_ENVS = 1
+DEFAULT_WORKERS = 0
+DEFAULT_ENVS_PER_WORKER = 1
+ROLLOUT_STEPS = 2048
+EVAL_FREQ = 10_000
 GRID_SIZE = 10
 NUM_PITS = 2
 
@@ -38,7 +47,30 @@ class RandomPolicy:
         return action, None
 
 
-def build_training_env(seed: int) -> DummyVecEnv:
+def build_training_env(
+    seed: int,
+    n_envs: int = DEFAULT_N_ENVS,
+    workers: int = DEFAULT_WORKERS,
+    envs_per_worker: int = DEFAULT_ENVS_PER_WORKER,
+) -> VecEnv:
+    if workers > 0:
+        subproc_env = SubprocWumpusVecEnv(
+            num_workers=workers,
+            envs_per_worker=envs_per_worker,
+            size=GRID_SIZE,
+            num_pits=NUM_PITS,
+            seed=seed,
+        )
+        subproc_env.seed(seed)
+        return VecMonitor(subproc_env)
+
+    if n_envs > 1:
+        vec_env = HunterWumpusVecEnv(
+            num_envs=n_envs, size=GRID_SIZE, num_pits=NUM_PITS, seed=seed,
+        )
+        vec_env.seed(seed)
+        return VecMonitor(vec_env)
+
     def _factory() -> Monitor:
         env = HunterWumpusEnv(size=GRID_SIZE, num_pits=NUM_PITS)
         env.reset(seed=seed)
@@ -57,17 +89,23 @@ def train_and_save(
     total_timesteps: int,
     output_path: Path,
     seed: int,
-) -> tuple[Path, float, float]:
+    n_envs: int = DEFAULT_N_ENVS,
+    workers: int = DEFAULT_WORKERS,
+    envs_per_worker: int = DEFAULT_ENVS_PER_WORKER,
+) -> tuple[Path, float, float, float]:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    train_env = build_training_env(seed=seed)
+    train_env = build_training_env(
+        seed=seed, n_envs=n_envs, workers=workers, envs_per_worker=envs_per_worker,
+    )
+    n_envs = train_env.num_envs
     eval_env = build_eval_env(seed=seed + 1)
     try:
         eval_callback = EvalCallback(
             eval_env=eval_env,
             best_model_save_path=str(output_path.parent),
             log_path=str(output_path.parent),
-            eval_freq=10_000,
+            eval_freq=max(EVAL_FREQ // n_envs, 1),
             n_eval_episodes=20,
             deterministic=True,
             render=False,
@@ -77,7 +115,7 @@ def train_and_save(
             policy="MlpPolicy",
             env=train_env,
             learning_rate=3e-4,
-            n_steps=2048,
+            n_steps=max(ROLLOUT_STEPS // n_envs, 1),
             batch_size=64,
             n_epochs=10,
             gamma=0.99,
@@ -85,7 +123,9 @@ def train_and_save(
             seed=seed,
         )
 
+        started = time.perf_counter()
         model.learn(total_timesteps=total_timesteps, callback=eval_callback)
+        steps_per_sec = model.num_timesteps / (time.perf_counter() - started)
 
         random_policy = RandomPolicy(n_actions=4, seed=seed)
         random_reward, _ = evaluate_policy(
@@ -110,7 +150,8 @@ def train_and_save(
 
         save_path = output_path.with_suffix("")
         model.save(str(save_path))
-        return save_path.with_suffix(".zip"), random_reward, trained_reward
+        export_policy(model).save(save_path.with_suffix(".npz"))
+        return save_path.with_suffix(".zip"), random_reward, trained_reward, steps_per_sec
     finally:
         eval_env.close()
         train_env.close()
@@ -134,19 +175,41 @@ def parse_args() -> argparse.Namespace:
         help="Output model path (e.g. models/easy.zip)",
     )
     parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Random seed")
+    parser.add_argument(
+        "--n-envs",
+        type=int,
+        default=DEFAULT_N_ENVS,
+        help="Number of boards stepped together by the vectorized training env",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Rollout worker processes (0 steps every board in the trainer process)",
+    )
+    parser.add_argument(
+        "--envs-per-worker",
+        type=int,
+        default=DEFAULT_ENVS_PER_WORKER,
+        help="Boards stepped by each rollout worker process",
+    )
     return parser.parse_args()
 
 
 def main() -> None:
     args = parse_args()
-    model_path, random_reward, trained_reward = train_and_save(
+    model_path, random_reward, trained_reward, steps_per_sec = train_and_save(
         total_timesteps=args.steps,
         output_path=args.output,
         seed=args.seed,
+        n_envs=args.n_envs,
+        workers=args.workers,
+        envs_per_worker=args.envs_per_worker,
     )
     print(f"Saved model to: {model_path}")
     print(f"Random policy mean reward: {random_reward:.2f}")
     print(f"Trained policy mean reward: {trained_reward:.2f}")
+    print(f"Training throughput: {steps_per_sec:,.0f} steps/sec")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from typing import Any
+
+import gymnasium as gym
+import numpy as np
+import numpy.typing as npt
+from gymnasium import spaces
+from stable_baselines3.common.vec_env import VecEnv
+from stable_baselines3.common.vec_env.base_vec_env import VecEnvIndices, VecEnvStepReturn
+
+from engine.batch import (
+    ONGOING,
+    PLAYER_LOST_PIT,
+    PLAYER_LOST_WUMPUS,
+    PLAYER_WON,
+    STATUS_LABELS,
+    BatchGameEngine,
+)
+from engine.senses import MAX_SCENT
+
+# (dx, dy) of the scent cells in observation order: here, N, E, S, W.
+_SCENT_OFFSETS: tuple[tuple[int, int], ...] = ((0, 0), (0, -1), (1, 0), (0, 1), (-1, 0))
+
+
+class HunterWumpusVecEnv(VecEnv):
+    """``HunterWumpusEnv`` for ``num_envs`` boards stepped as one array program.
+
+    Implements the SB3 ``VecEnv`` interface directly on ``BatchGameEngine``
+    state, with the same observation layout, reward shaping and auto-reset
+    behaviour ``DummyVecEnv`` gives the scalar env.
+    """
+
+    def __init__(
+        self,
+        num_envs: int,
+        size: int = 4,
+        num_pits: int = 3,
+        max_steps: int = 200,
+        seed: int | None = None,
+    ) -> None:
+        self.size = size
+        self.num_pits = num_pits
+        self.max_steps = max_steps
+        self.render_mode: str | None = None
+        self.engine = BatchGameEngine(
+            num_games=num_envs, size=size, num_pits=num_pits, seed=seed,
+        )
+        self.step_counts: npt.NDArray[np.int64] = np.zeros(num_envs, dtype=np.int64)
+        self._player_rng = np.random.default_rng(seed)
+        self._actions: npt.NDArray[np.int64] = np.zeros(num_envs, dtype=np.int64)
+
+        super().__init__(
+            num_envs=num_envs,
+            observation_space=spaces.Box(low=0.0, high=1.0, shape=(9,), dtype=np.float32),
+            action_space=spaces.Discrete(4),
+        )
+
+    def reset(self) -> npt.NDArray[np.float32]:
+        seeds = self._seeds if self._seeds[0] is not None else None
+        if seeds is not None:
+            self._player_rng = np.random.default_rng(seeds[0])
+        self.engine.reset_games(np.arange(self.num_envs), seeds=seeds)
+        self.step_counts[:] = 0
+        self._reset_seeds()
+        self._reset_options()
+        return self._get_obs()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        if ((self._actions < 0) | (self._actions > 3)).any():
+            raise ValueError(f"Invalid action: {self._actions}")
+        engine = self.engine
+        self.step_counts += 1
+
+        wumpus_before_x = engine.wumpus_x[:, 0].copy()
+        wumpus_before_y = engine.wumpus_y[:, 0].copy()
+        engine.move_wumpus(self._actions)
+        status = engine.check_game_over().copy()
+        terminated = status != ONGOING
+
+        still_playing = ~terminated
+        engine.move_player(self._sample_player_directions(), mask=still_playing)
+        status = engine.check_game_over(mask=still_playing).copy()
+        terminated = status != ONGOING
+
+        rewards = self._compute_rewards(status, wumpus_before_x, wumpus_before_y)
+        engine.update_scent()
+
+        truncated = (self.step_counts >= self.max_steps) & ~terminated
+        dones = terminated | truncated
+        obs = self._get_obs()
+
+        infos: list[dict[str, Any]] = [
+            {"status": STATUS_LABELS[code], "step_count": int(count)}
+            for code, count in zip(status, self.step_counts)
+        ]
+        done_indices = np.flatnonzero(dones)
+        if done_indices.size:
+            for index in done_indices:
+                infos[index]["terminal_observation"] = obs[index].copy()
+                infos[index]["TimeLimit.truncated"] = bool(truncated[index])
+            engine.reset_games(done_indices)
+            self.step_counts[done_indices] = 0
+            obs = self._get_obs()
+
+        return obs, rewards, dones, infos
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> list[Any]:
+        value = getattr(self, attr_name)
+        return [value for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(
+        self,
+        method_name: str,
+        *method_args: Any,
+        indices: VecEnvIndices = None,
+        **method_kwargs: Any,
+    ) -> list[Any]:
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(
+        self, wrapper_class: type[gym.Wrapper], indices: VecEnvIndices = None,
+    ) -> list[bool]:
+        return [False for _ in self._get_indices(indices)]
+
+    def _sample_player_directions(self) -> npt.NDArray[np.int64]:
+        return self._player_rng.integers(0, 4, size=self.num_envs)
+
+    def _get_obs(self) -> npt.NDArray[np.float32]:
+        engine = self.engine
+        denom = float(max(1, self.size - 1))
+        wumpus_x = engine.wumpus_x[:, 0]
+        wumpus_y = engine.wumpus_y[:, 0]
+
+        obs = np.empty((self.num_envs, 9), dtype=np.float64)
+        obs[:, 0] = wumpus_x / denom
+        obs[:, 1] = wumpus_y / denom
+        obs[:, 2] = engine.player_x / denom
+        obs[:, 3] = engine.player_y / denom
+        padded = np.pad(engine.scent_grid, ((0, 0), (1, 1), (1, 1)))
+        boards = np.arange(self.num_envs)
+        for column, (dx, dy) in enumerate(_SCENT_OFFSETS, start=4):
+            obs[:, column] = padded[boards, wumpus_y + dy + 1, wumpus_x + dx + 1]
+        obs[:, 4:] /= float(MAX_SCENT)
+        return obs.astype(np.float32)
+
+    def _compute_rewards(
+        self,
+        status: npt.NDArray[np.int8],
+        wumpus_before_x: npt.NDArray[np.int64],
+        wumpus_before_y: npt.NDArray[np.int64],
+    ) -> npt.NDArray[np.float32]:
+        wumpus_after_x = self.engine.wumpus_x[:, 0]
+        wumpus_after_y = self.engine.wumpus_y[:, 0]
+        rewards = np.full(self.num_envs, -1.0)
+
+        stayed = (wumpus_before_x == wumpus_after_x) & (wumpus_before_y == wumpus_after_y)
+        rewards[stayed] -= 5.0
+        scent = self.engine.scent_grid[np.arange(self.num_envs), wumpus_after_y, wumpus_after_x]
+        rewards[scent > 0] += 2.0
+
+        rewards[status == PLAYER_LOST_WUMPUS] += 100.0
+        rewards[status == PLAYER_LOST_PIT] += 50.0
+        rewards[status == PLAYER_WON] -= 100.0
+        return rewards.astype(np.float32)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from engine.entities import Direction
+from engine.game_state import GameEngine
+from rl.action_table import (
+    ActionTable,
+    build_action_table,
+    build_tables,
+    table_path,
+    table_size,
+)
+from rl.model_registry import clear_cache, load_action_table, load_model, served_sha256
+from rl.numpy_policy import NumpyPolicy
+from rl.observation import write_engine_observations
+
+
+def _random_policy(seed: int) -> NumpyPolicy:
+    rng = np.random.default_rng(seed)
+    return NumpyPolicy(
+        weights=[rng.normal(size=(16, 9)), rng.normal(size=(4, 16))],
+        biases=[rng.normal(size=16), rng.normal(size=4)],
+    )
+
+
+def test_table_lookup_matches_policy_on_played_games(tmp_path: Path) -> None:
+    policy = _random_policy(0)
+    table = ActionTable.load(build_action_table(policy, 4, tmp_path / "policy_4.npy"), 4)
+    assert isinstance(table.actions, np.memmap)
+    assert table.actions.shape == (table_size(4),)
+
+    engine = GameEngine(size=4, num_pits=0, num_wumpuses=2, seed=1)
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        engine.move_player(Direction(int(rng.integers(0, 4))))
+        for index in range(len(engine.wumpus_positions)):
+            engine.move_wumpus(index, Direction(int(rng.integers(0, 4))))
+        engine._update_scent()
+        observations = write_engine_observations(engine)
+
+        expected, _ = policy.predict(observations)
+        actual, _ = table.predict(observations)
+        np.testing.assert_array_equal(actual, expected)
+
+
+def test_registry_serves_tables_only_when_built_for_the_served_model(tmp_path: Path) -> None:
+    clear_cache()
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        _random_policy(2).save(tmp_path / "hard.npz")
+        load_model("hard")
+        sha256 = served_sha256("hard")
+        assert sha256 is not None
+        # A table built from another model is never picked up.
+        build_action_table(_random_policy(3), 4, table_path(tmp_path / "hard.zip", 4, "0" * 64))
+        assert load_action_table("hard", 4) is None
+
+        # Misses are remembered until the tables are rebuilt or the watcher polls.
+        with patch.object(Path, "exists", side_effect=AssertionError("stat on a cached miss")):
+            assert load_action_table("hard", 4) is None
+        assert build_tables([4], ["hard"]) == [table_path(tmp_path / "hard.zip", 4, sha256)]
+        assert sorted(p.name for p in tmp_path.glob("hard_4.*.npy")) == [
+            f"hard_4.{sha256[:16]}.npy",
+        ]
+        table = load_action_table("hard", 4)
+        assert table is not None and table.size == 4
+        assert load_action_table("hard", 4) is table
+        assert load_action_table("hard", 5) is None
+    clear_cache()
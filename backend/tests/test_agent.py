@@ -7,6 +7,7 @@ import numpy as np
 from numpy.typing import NDArray
 
 from engine.entities import Direction
+from engine.game_state import GameEngine
 from rl.agent import WumpusAgent
 
 
@@ -93,4 +94,34 @@ def test_real_trained_model_loads_and_predicts_when_available() -> None:
         Direction.SOUTH,
         Direction.EAST,
         Direction.WEST,
-    }
\ No newline at end of file
+    }
+
+
+def test_predict_batch_runs_one_forward_pass_for_all_wumpuses() -> None:
+    class BatchModel:
+        def __init__(self) -> None:
+            self.calls: list[np.ndarray] = []
+
+        def predict(
+            self, observation: np.ndarray, deterministic: bool = True,
+        ) -> tuple[np.ndarray, None]:
+            self.calls.append(observation)
+            return np.arange(len(observation), dtype=np.int64) % 4, None
+
+    engine = GameEngine(size=8, num_pits=2, num_wumpuses=3, seed=5)
+    model = BatchModel()
+    agent = WumpusAgent(model=model)
+
+    actions = agent.predict_batch(engine)
+
+    assert actions == [Direction.NORTH, Direction.SOUTH, Direction.EAST]
+    assert len(model.calls) == 1
+    assert model.calls[0].shape == (3, 9)
+    for row, wumpus in zip(model.calls[0], engine.wumpus_positions):
+        state = {
+            "grid_size": engine.size,
+            "player_pos": [engine.player_pos.x, engine.player_pos.y],
+            "wumpus_pos": [wumpus.x, wumpus.y],
+            "scent_grid": engine.scent_grid,
+        }
+        np.testing.assert_array_equal(row, agent.build_observation(state))
@@ -1,21 +1,38 @@
 from __future__ import annotations
 
+import json
+import random
 from typing import Any, cast
 
+import numpy as np
+import pytest
 from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
 
+from api import auth, main
+from api.auth_cache import FirebaseVerifier, LocalKeySetVerifier
+from api.latency import move_latency
 from api.main import app
-from api.routes import _sessions
+from api.routes import (
+    WS_GAME_NOT_FOUND,
+    WS_SUBPROTOCOL,
+    WS_TOKEN_PREFIX,
+    _get_entity_counts,
+    _sessions,
+)
+from api.sessions import encode_session
 from engine.entities import Direction, Position
+from engine.game_state import GameEngine
 
 
 class StubAgent:
-    def build_observation(self, game_state: dict[str, object]) -> object:
-        return game_state
+    def predict_observations(self, observations: np.ndarray) -> list[Direction]:
+        return [Direction.WEST for _ in observations]
 
-    def get_wumpus_action(self, obs: object) -> Direction:
-        del obs
-        return Direction.WEST
+
+class FailingAgent:
+    def predict_observations(self, observations: np.ndarray) -> list[Direction]:
+        raise RuntimeError("inference worker died")
 
 
 def _start_game(client: TestClient, grid_size: int = 6) -> dict[str, Any]:
@@ -24,9 +41,33 @@ def _start_game(client: TestClient, grid_size: int = 6) -> dict[str, Any]:
     return cast(dict[str, Any], response.json())
 
 
-def test_start_game_returns_contract_shape_and_no_hidden_fields() -> None:
+def _deterministic_board(game_id: str) -> None:
+    session = _sessions[game_id]
+    session.engine.wumpus_positions = [Position(x=5, y=5)]
+    session.engine.pits = [Position(x=5, y=0)]
+    session.engine.gold_pos = Position(x=4, y=5)
+
+
+@pytest.fixture
+def client() -> TestClient:
     _sessions.clear()
-    client = TestClient(app)
+    return TestClient(app)
+
+
+@pytest.fixture
+def stub_agent(monkeypatch: Any) -> None:
+    monkeypatch.setattr("rl.model_registry.load_model", lambda _d: StubAgent())
+
+
+@pytest.fixture
+def game_id(client: TestClient, stub_agent: None) -> str:
+    """A started game with the board from ``_deterministic_board``."""
+    started = str(_start_game(client)["game_id"])
+    _deterministic_board(started)
+    return started
+
+
+def test_start_game_returns_contract_shape_and_no_hidden_fields(client: TestClient) -> None:
     payload = _start_game(client)
 
     assert payload["status"] == "Ongoing"
@@ -42,9 +83,7 @@ def test_start_game_returns_contract_shape_and_no_hidden_fields() -> None:
     assert "scent_grid" not in payload
 
 
-def test_move_unknown_game_returns_404() -> None:
-    _sessions.clear()
-    client = TestClient(app)
+def test_move_unknown_game_returns_404(client: TestClient) -> None:
     response = client.post(
         "/game/move",
         json={"game_id": "missing", "player_action": "NORTH"},
@@ -54,9 +93,7 @@ def test_move_unknown_game_returns_404() -> None:
     assert response.json() == {"detail": "Game not found."}
 
 
-def test_move_invalid_action_returns_422() -> None:
-    _sessions.clear()
-    client = TestClient(app)
+def test_move_invalid_action_returns_422(client: TestClient) -> None:
     start_payload = _start_game(client)
 
     response = client.post(
@@ -67,9 +104,7 @@ def test_move_invalid_action_returns_422() -> None:
     assert response.status_code == 422
 
 
-def test_move_shoot_without_arrows_returns_400() -> None:
-    _sessions.clear()
-    client = TestClient(app)
+def test_move_shoot_without_arrows_returns_400(client: TestClient) -> None:
     start_payload = _start_game(client)
     game_id = start_payload["game_id"]
     session = _sessions[game_id]
@@ -84,11 +119,9 @@ def test_move_shoot_without_arrows_returns_400() -> None:
     assert response.json() == {"detail": "No arrows remaining."}
 
 
-def test_move_resolves_turn_in_order_and_increments_turn(monkeypatch: Any) -> None:
-    _sessions.clear()
-    client = TestClient(app)
-    monkeypatch.setattr("rl.model_registry.load_model", lambda _d: StubAgent())
-
+def test_move_resolves_turn_in_order_and_increments_turn(
+    client: TestClient, stub_agent: None,
+) -> None:
     start_payload = _start_game(client)
     game_id = start_payload["game_id"]
     session = _sessions[game_id]
@@ -120,9 +153,7 @@ def test_move_resolves_turn_in_order_and_increments_turn(monkeypatch: Any) -> No
     assert "scent_grid" not in payload
 
 
-def test_status_returns_existing_state_without_advancing_turn() -> None:
-    _sessions.clear()
-    client = TestClient(app)
+def test_status_returns_existing_state_without_advancing_turn(client: TestClient) -> None:
     start_payload = _start_game(client)
     game_id = start_payload["game_id"]
 
@@ -134,21 +165,16 @@ def test_status_returns_existing_state_without_advancing_turn() -> None:
     assert payload["turn"] == 0
 
 
-def test_status_unknown_game_returns_404() -> None:
-    _sessions.clear()
-    client = TestClient(app)
-
+def test_status_unknown_game_returns_404(client: TestClient) -> None:
     status_response = client.get("/game/unknown/status")
 
     assert status_response.status_code == 404
     assert status_response.json() == {"detail": "Game not found."}
 
 
-def test_move_reports_premove_stench_when_wumpus_kills_player(monkeypatch: Any) -> None:
-    _sessions.clear()
-    client = TestClient(app)
-    monkeypatch.setattr("rl.model_registry.load_model", lambda _d: StubAgent())
-
+def test_move_reports_premove_stench_when_wumpus_kills_player(
+    client: TestClient, stub_agent: None,
+) -> None:
     start_payload = _start_game(client)
     game_id = start_payload["game_id"]
     session = _sessions[game_id]
@@ -169,20 +195,14 @@ def test_move_reports_premove_stench_when_wumpus_kills_player(monkeypatch: Any)
     assert payload["senses"]["stench_direction"] is not None
 
 
-def test_start_game_accepts_difficulty_and_returns_it() -> None:
-    _sessions.clear()
-    client = TestClient(app)
+def test_start_game_accepts_difficulty_and_returns_it(client: TestClient) -> None:
     response = client.post("/game/start", json={"grid_size": 6, "difficulty": "hard"})
     assert response.status_code == 200
     payload = cast(dict[str, Any], response.json())
     assert payload["difficulty"] == "hard"
 
 
-def test_shoot_miss_mentions_full_corridor_direction(monkeypatch: Any) -> None:
-    _sessions.clear()
-    client = TestClient(app)
-    monkeypatch.setattr("rl.model_registry.load_model", lambda _d: StubAgent())
-
+def test_shoot_miss_mentions_full_corridor_direction(client: TestClient, stub_agent: None) -> None:
     start_payload = _start_game(client)
     game_id = start_payload["game_id"]
     session = _sessions[game_id]
@@ -201,3 +221,217 @@ def test_shoot_miss_mentions_full_corridor_direction(monkeypatch: Any) -> None:
     assert payload["message"].startswith(
         "Your arrow flies EAST through the corridor but finds nothing."
     )
+
+
+def test_start_game_board_is_reproducible_from_session_seed(client: TestClient) -> None:
+    payload = client.post(
+        "/game/start", json={"grid_size": 8, "difficulty": "impossible_ii"},
+    ).json()
+    session = _sessions[payload["game_id"]]
+    assert session.seed is not None
+
+    wumpus_count, pit_count = _get_entity_counts("impossible_ii", 8, random.Random(session.seed))
+    replay = GameEngine(size=8, num_pits=pit_count, num_wumpuses=wumpus_count, seed=session.seed)
+
+    assert replay.wumpus_positions == session.engine.wumpus_positions
+    assert replay.gold_pos == session.engine.gold_pos
+    assert replay.pits == session.engine.pits
+
+
+def test_stateless_game_plays_from_tokens_without_a_session(
+    client: TestClient, stub_agent: None,
+) -> None:
+    start = client.post("/game/start", json={"grid_size": 6, "stateless": True}).json()
+    assert start["state_token"]
+    assert start["game_id"] not in _sessions
+
+    token = start["state_token"]
+    payload = start
+    for turn in range(1, 4):
+        if payload["status"] != "Ongoing":
+            break
+        action = "SOUTH" if turn % 2 else "NORTH"
+        response = client.post(
+            "/game/move",
+            json={"game_id": start["game_id"], "player_action": action, "state_token": token},
+        )
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload["turn"] == turn
+        token = payload["state_token"]
+    assert len(_sessions) == 0
+
+
+def test_replayed_stateless_wins_are_not_credited(monkeypatch: Any, client: TestClient) -> None:
+    credited: list[str] = []
+    monkeypatch.setattr("api.routes._maybe_update_profile", lambda _s: credited.append("profile"))
+    monkeypatch.setattr("api.routes._fire_telemetry", lambda _s: credited.append("telemetry"))
+    monkeypatch.setattr(GameEngine, "check_game_over", lambda self: "PlayerWon")
+
+    start = client.post("/game/start", json={"grid_size": 6, "stateless": True}).json()
+    body = {
+        "game_id": start["game_id"],
+        "player_action": "SOUTH",
+        "state_token": start["state_token"],
+    }
+    for _ in range(3):
+        response = client.post("/game/move", json=body)
+        assert response.json()["status"] == "PlayerWon"
+
+    assert credited == []
+
+
+def test_stateless_move_rejects_a_forged_token(client: TestClient) -> None:
+    start = client.post("/game/start", json={"grid_size": 6, "stateless": True}).json()
+
+    response = client.post(
+        "/game/move",
+        json={
+            "game_id": start["game_id"],
+            "player_action": "EAST",
+            "state_token": start["state_token"][:-4] + "AAAA",
+        },
+    )
+
+    assert response.status_code == 400
+
+
+def test_websocket_channel_streams_moves_and_records_latency(
+    client: TestClient, game_id: str,
+) -> None:
+    move_latency.clear()
+
+    with client.websocket_connect(f"/game/ws/{game_id}") as websocket:
+        websocket.send_text(json.dumps({"player_action": "SOUTH"}))
+        first = websocket.receive_json()
+        websocket.send_text(json.dumps({"player_action": "JUMP"}))
+        rejected = websocket.receive_json()
+        websocket.send_text(json.dumps({"player_action": "NORTH"}))
+        second = websocket.receive_json()
+
+    assert (first["turn"], first["player_pos"]) == (1, [0, 1])
+    assert rejected == {"error": "Unknown action.", "status_code": 422}
+    assert (second["turn"], second["player_pos"]) == (2, [0, 0])
+
+    client.post("/game/move", json={"game_id": game_id, "player_action": "EAST"})
+    stats = {row["transport"]: row for row in client.get("/metrics/move-latency").json()}
+    assert stats["websocket"]["count"] == 3
+    assert stats["rest"]["count"] == 1
+
+
+def test_websocket_channel_closes_for_unknown_game(client: TestClient) -> None:
+    with pytest.raises(WebSocketDisconnect) as excinfo:
+        with client.websocket_connect("/game/ws/missing") as websocket:
+            websocket.receive_text()
+
+    assert excinfo.value.code == WS_GAME_NOT_FOUND
+
+
+def test_websocket_channel_takes_the_id_token_from_a_subprotocol(
+    client: TestClient, game_id: str,
+) -> None:
+    verifier = LocalKeySetVerifier({"local": b"secret"})
+    token = verifier.sign({"sub": "user-7", "exp": 4_102_444_800}, kid="local")
+    auth.set_token_verifier(verifier)
+    try:
+        protocols = [WS_SUBPROTOCOL, WS_TOKEN_PREFIX + token]
+        with client.websocket_connect(f"/game/ws/{game_id}", subprotocols=protocols) as websocket:
+            assert websocket.accepted_subprotocol == WS_SUBPROTOCOL
+            websocket.send_text(json.dumps({"player_action": "SOUTH"}))
+            assert websocket.receive_json()["turn"] == 1
+        assert _sessions[game_id].user_id == "user-7"
+
+        # A token in the URL is ignored rather than trusted.
+        _sessions[game_id].user_id = None
+        with client.websocket_connect(f"/game/ws/{game_id}?token={token}") as websocket:
+            websocket.send_text(json.dumps({"player_action": "NORTH"}))
+            assert websocket.receive_json()["turn"] == 2
+        assert _sessions[game_id].user_id is None
+
+        forged = [WS_SUBPROTOCOL, WS_TOKEN_PREFIX + "forged.token.value"]
+        with pytest.raises(WebSocketDisconnect) as excinfo:
+            with client.websocket_connect(f"/game/ws/{game_id}", subprotocols=forged) as websocket:
+                websocket.receive_text()
+        assert excinfo.value.code == 1008
+    finally:
+        auth.set_token_verifier(FirebaseVerifier())
+
+
+def test_move_with_current_known_turn_returns_only_changes(
+    client: TestClient, game_id: str,
+) -> None:
+    payload = client.post(
+        "/game/move",
+        json={"game_id": game_id, "player_action": "SOUTH", "known_turn": 0},
+    ).json()
+
+    assert payload["delta"] is True
+    assert (payload["turn"], payload["since_turn"]) == (1, 0)
+    assert payload["new_explored_tiles"] == [[0, 1]]
+    assert payload["player_pos"] == [0, 1]
+    assert set(payload["senses"]) == {"breeze", "stench_direction", "shine"}
+    for unchanged in ("explored_tiles", "status", "arrows_remaining", "wumpuses_remaining"):
+        assert unchanged not in payload
+
+
+@pytest.mark.parametrize("action", ["SOUTH", "SHOOT_SOUTH"])
+def test_failed_inference_rolls_the_turn_back(
+    monkeypatch: Any, action: str, client: TestClient, game_id: str,
+) -> None:
+    monkeypatch.setattr("rl.model_registry.load_model", lambda _d: FailingAgent())
+    session = _sessions[game_id]
+    # The arrow kills the first wumpus; the second still has to move.
+    session.engine.wumpus_positions = [Position(x=0, y=3), Position(x=5, y=5)]
+    before = encode_session(session)
+
+    response = client.post("/game/move", json={"game_id": game_id, "player_action": action})
+
+    assert response.status_code == 503
+    assert _sessions[game_id] is session
+    assert encode_session(session) == before
+
+    monkeypatch.setattr("rl.model_registry.load_model", lambda _d: StubAgent())
+    payload = client.post(
+        "/game/move", json={"game_id": game_id, "player_action": action},
+    ).json()
+    assert payload["turn"] == 1
+
+
+def test_move_with_stale_known_turn_resyncs_with_full_snapshot(
+    client: TestClient, game_id: str,
+) -> None:
+    client.post("/game/move", json={"game_id": game_id, "player_action": "SOUTH"})
+
+    payload = client.post(
+        "/game/move",
+        json={"game_id": game_id, "player_action": "NORTH", "known_turn": 0},
+    ).json()
+
+    assert "delta" not in payload
+    assert payload["turn"] == 2
+    assert payload["explored_tiles"] == [[0, 0], [0, 1]]
+
+
+def test_websocket_channel_sends_deltas_for_known_turns(client: TestClient, game_id: str) -> None:
+    with client.websocket_connect(f"/game/ws/{game_id}") as websocket:
+        websocket.send_text(json.dumps({"player_action": "EAST", "known_turn": 0}))
+        delta = websocket.receive_json()
+
+    assert delta["delta"] is True
+    assert delta["new_explored_tiles"] == [[1, 0]]
+    assert "explored_tiles" not in delta
+
+
+def test_shutdown_drains_side_effects_before_closing_the_writers(monkeypatch: Any) -> None:
+    order: list[str] = []
+    monkeypatch.setattr(main.profile_writer, "start", lambda: None)
+    monkeypatch.setenv("MODEL_PRELOAD", "0")
+    monkeypatch.setenv("MODEL_WATCH_INTERVAL", "0")
+    monkeypatch.setattr(main.executors, "shutdown", lambda: order.append("executors"))
+    monkeypatch.setattr(main.profile_writer, "close", lambda: order.append("profiles"))
+    monkeypatch.setattr(main, "close_writer", lambda: order.append("telemetry"))
+
+    with TestClient(app):
+        pass
+
+    assert order == ["executors", "profiles", "telemetry"]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 from unittest.mock import MagicMock, patch
 
@@ -7,6 +8,7 @@ import pytest
 from fastapi import HTTPException
 
 from api import auth
+from api.auth_cache import FirebaseVerifier, LocalKeySetVerifier
 
 
 @pytest.fixture(autouse=True)
@@ -69,3 +71,19 @@ def test_verify_firebase_token_raises_on_bad_token() -> None:
         with pytest.raises(HTTPException) as exc_info:
             auth.verify_firebase_token("bad-token")
         assert exc_info.value.status_code == 401
+
+
+def test_get_optional_user_with_pluggable_verifier_uses_cache() -> None:
+    verifier = LocalKeySetVerifier({"local": b"secret"})
+    token = verifier.sign({"sub": "user-9", "exp": 4_102_444_800}, kid="local")
+    auth.set_token_verifier(verifier)
+    try:
+        for _ in range(3):
+            uid = asyncio.run(auth.get_optional_user(f"Bearer {token}"))
+            assert uid == "user-9"
+        stats = auth.verification_stats()
+        assert (stats.hits, stats.misses) == (2, 1)
+        with pytest.raises(HTTPException):
+            asyncio.run(auth.get_optional_user("Bearer forged.token.value"))
+    finally:
+        auth.set_token_verifier(FirebaseVerifier())
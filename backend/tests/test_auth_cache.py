@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from api.auth_cache import LocalKeySetVerifier, VerificationCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _CountingVerifier:
+    def __init__(self, inner: LocalKeySetVerifier) -> None:
+        self.inner = inner
+        self.calls = 0
+
+    def verify(self, token: str) -> dict[str, Any]:
+        self.calls += 1
+        return self.inner.verify(token)
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.fixture
+def keys(clock: _Clock) -> LocalKeySetVerifier:
+    return LocalKeySetVerifier({"k1": b"first", "k2": b"second"}, clock=clock)
+
+
+def test_local_key_set_accepts_each_key_and_rejects_forgeries(keys: LocalKeySetVerifier) -> None:
+    token = keys.sign({"sub": "user-1", "exp": 2_000}, kid="k2")
+
+    assert keys.verify(token)["uid"] == "user-1"
+    header, body, _ = token.split(".")
+    forged = f"{header}.{body}.{keys.sign({'sub': 'x', 'exp': 2_000}, kid='k2').split('.')[2]}"
+    for bad in (forged, "not-a-jwt", keys.sign({"sub": "user-1", "exp": 999}, kid="k1")):
+        with pytest.raises(ValueError):
+            keys.verify(bad)
+    with pytest.raises(ValueError):
+        LocalKeySetVerifier({"k3": b"other"}).verify(token)
+
+
+def test_cache_verifies_each_token_once_until_it_expires(
+    keys: LocalKeySetVerifier, clock: _Clock,
+) -> None:
+    verifier = _CountingVerifier(keys)
+    cache = VerificationCache(verifier, clock=clock)
+    token = keys.sign({"sub": "user-1", "exp": 1_100}, kid="k1")
+
+    for _ in range(5):
+        assert cache.verify(token)["uid"] == "user-1"
+    assert verifier.calls == 1
+
+    clock.now = 1_100.0
+    with pytest.raises(ValueError):
+        cache.verify(token)
+    assert verifier.calls == 2
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (4, 2, 0)
+    assert stats.hit_ratio == pytest.approx(4 / 6)
+    assert stats.verify_count == 2
+
+
+def test_cache_never_stores_failures(keys: LocalKeySetVerifier, clock: _Clock) -> None:
+    verifier = _CountingVerifier(keys)
+    cache = VerificationCache(verifier, clock=clock)
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            cache.verify("garbage")
+
+    assert verifier.calls == 3
+    assert cache.stats().entries == 0
+
+
+def test_cache_drops_least_recently_used_tokens(keys: LocalKeySetVerifier, clock: _Clock) -> None:
+    verifier = _CountingVerifier(keys)
+    cache = VerificationCache(verifier, max_entries=2, clock=clock)
+    first, second, third = (
+        keys.sign({"sub": f"user-{i}", "exp": 5_000}, kid="k1") for i in range(3)
+    )
+
+    cache.verify(first)
+    cache.verify(second)
+    cache.verify(first)
+    cache.verify(third)
+    calls = verifier.calls
+    cache.verify(first)
+    cache.verify(second)
+
+    assert verifier.calls == calls + 1
+    assert cache.stats().evicted_total == 2
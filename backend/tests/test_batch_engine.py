@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from engine.batch import STATUS_LABELS, STENCH_LABELS, BatchGameEngine
+from engine.entities import Direction, Position
+from engine.game_state import GameEngine
+
+
+def _scalar_engines(seeds: list[int], **kwargs: int) -> list[GameEngine]:
+    engines = []
+    for seed in seeds:
+        engine = GameEngine(**kwargs)
+        engine.reset(seed=seed)
+        engines.append(engine)
+    return engines
+
+
+def _assert_matches(batch: BatchGameEngine, engines: list[GameEngine]) -> None:
+    senses = batch.get_senses()
+    for i, engine in enumerate(engines):
+        assert (batch.player_x[i], batch.player_y[i]) == (engine.player_pos.x, engine.player_pos.y)
+        alive = [
+            Position(x=int(batch.wumpus_x[i, slot]), y=int(batch.wumpus_y[i, slot]))
+            for slot in range(batch.num_wumpuses)
+            if batch.wumpus_alive[i, slot]
+        ]
+        assert alive == engine.wumpus_positions
+        assert batch.scent_grid[i].tolist() == engine.scent_grid
+        assert STATUS_LABELS[batch.status[i]] == engine.status
+
+        expected = engine.get_senses(engine.player_pos)
+        assert bool(senses["breeze"][i]) == expected["breeze"]
+        assert bool(senses["shine"][i]) == expected["shine"]
+        assert STENCH_LABELS[senses["stench_direction"][i]] == expected["stench_direction"]
+
+
+def test_seeded_boards_match_scalar_engine() -> None:
+    seeds = list(range(32))
+    batch = BatchGameEngine(num_games=32, size=6, num_pits=4, seeds=seeds)
+    engines = _scalar_engines(seeds, size=6, num_pits=4)
+
+    _assert_matches(batch, engines)
+    for i, engine in enumerate(engines):
+        pits = {(x, y) for y, x in zip(*np.nonzero(batch.pits[i]))}
+        assert pits == {(p.x, p.y) for p in engine.pits}
+        assert (batch.gold_x[i], batch.gold_y[i]) == (engine.gold_pos.x, engine.gold_pos.y)
+
+
+@pytest.mark.parametrize("num_wumpuses", [1, 3])
+def test_random_play_matches_scalar_engine(num_wumpuses: int) -> None:
+    seeds = list(range(100, 164))
+    kwargs = {"size": 5, "num_pits": 2, "num_wumpuses": num_wumpuses}
+    batch = BatchGameEngine(num_games=len(seeds), seeds=seeds, **kwargs)
+    engines = _scalar_engines(seeds, **kwargs)
+    rng = np.random.default_rng(0)
+
+    for _ in range(40):
+        player_dirs = rng.integers(0, 4, size=len(seeds))
+        batch.move_player(player_dirs)
+        for engine, action in zip(engines, player_dirs):
+            engine.move_player(Direction(int(action)))
+
+        for slot in range(num_wumpuses):
+            wumpus_dirs = rng.integers(0, 4, size=len(seeds))
+            batch.move_wumpus(wumpus_dirs, index=slot)
+            for engine, action in zip(engines, wumpus_dirs):
+                engine.move_wumpus(slot, Direction(int(action)))
+
+        batch.check_game_over()
+        batch.update_scent()
+        for engine in engines:
+            engine.check_game_over()
+            engine._update_scent()
+
+        _assert_matches(batch, engines)
+
+
+def test_masked_boards_are_left_untouched() -> None:
+    batch = BatchGameEngine(num_games=2, size=4, num_pits=0, seeds=[1, 2])
+    batch.player_x[:] = 1
+    batch.player_y[:] = 1
+
+    batch.move_player([Direction.EAST.value] * 2, mask=np.array([True, False]))
+    batch.update_scent(mask=np.array([True, False]))
+
+    assert (batch.player_x.tolist(), batch.player_y.tolist()) == ([2, 1], [1, 1])
+    assert batch.scent_grid[0, 1, 1] == 3
+    assert batch.scent_grid[1].sum() == 0
+
+
+def test_from_engines_copies_scalar_state() -> None:
+    engine = GameEngine(size=4, num_pits=1)
+    engine.move_player(Direction.SOUTH)
+    engine._update_scent()
+
+    batch = BatchGameEngine.from_engines([engine])
+
+    _assert_matches(batch, [engine])
+
+
+def test_converting_between_a_move_and_its_scent_update_keeps_the_trail() -> None:
+    seeds = list(range(200, 216))
+    kwargs = {"size": 5, "num_pits": 2, "num_wumpuses": 2}
+    engines = _scalar_engines(seeds, **kwargs)
+    rng = np.random.default_rng(1)
+    for _ in range(3):
+        for engine in engines:
+            engine.move_player(Direction(int(rng.integers(0, 4))))
+            engine.check_game_over()
+            engine._update_scent()
+    # Convert mid-turn: the player has moved but the scent has not been laid.
+    for engine in engines:
+        engine.move_player(Direction(int(rng.integers(0, 4))))
+
+    batch = BatchGameEngine.from_engines(engines)
+    batch.check_game_over()
+    batch.update_scent()
+    for engine in engines:
+        engine.check_game_over()
+        engine._update_scent()
+
+    _assert_matches(batch, engines)
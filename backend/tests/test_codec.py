@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from api.sessions import SessionState, decode_session, encode_session
+from engine.codec import decode_engine, encode_engine
+from engine.entities import Direction
+from engine.game_state import GameEngine
+
+
+def _played_engine(seed: int) -> GameEngine:
+    engine = GameEngine(size=9, num_pits=4, num_wumpuses=3, seed=seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(15):
+        engine.move_player(Direction(int(rng.integers(0, 4))))
+        engine.move_wumpus(1, Direction(int(rng.integers(0, 4))))
+        engine._update_scent()
+    engine.move_player(Direction.EAST)
+    engine.remove_wumpus(0)
+    return engine
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_engine_round_trip(seed: int) -> None:
+    engine = _played_engine(seed)
+
+    restored = decode_engine(encode_engine(engine))
+
+    for name in ("size", "num_pits", "num_wumpuses", "status", "player_pos", "gold_pos", "pits"):
+        assert getattr(restored, name) == getattr(engine, name)
+    assert restored.wumpus_positions == engine.wumpus_positions
+    assert restored.scent_grid == engine.scent_grid
+    assert restored.wumpus_visited == engine.wumpus_visited
+    assert restored.get_senses(restored.player_pos) == engine.get_senses(engine.player_pos)
+    restored._update_scent()
+    engine._update_scent()
+    assert restored.scent_grid == engine.scent_grid
+
+
+def test_decoding_does_not_deal_a_board(monkeypatch: pytest.MonkeyPatch) -> None:
+    data = encode_engine(_played_engine(0))
+
+    def deal(_engine: GameEngine) -> None:
+        raise AssertionError("decode dealt a random board")
+
+    monkeypatch.setattr(GameEngine, "_reset_board", deal)
+    restored = decode_engine(data)
+
+    assert encode_engine(restored) == data
+
+
+def test_session_round_trip_and_bad_input() -> None:
+    session = SessionState(
+        engine=_played_engine(1),
+        turn=17,
+        arrows_remaining=0,
+        explored_tiles=[(0, 0), (1, 0), (1, 1)],
+        explored_set={(0, 0), (1, 0), (1, 1)},
+        message="A breeze… and a stench.",
+        user_id="user-1",
+        pacing_interval=2,
+        difficulty="impossible_ii",
+        seed=2**62,
+    )
+
+    data = encode_session(session)
+    restored = decode_session(data)
+
+    assert len(data) < 200
+    for name in (
+        "turn", "arrows_remaining", "explored_tiles", "explored_set", "message",
+        "user_id", "pacing_interval", "difficulty", "seed",
+    ):
+        assert getattr(restored, name) == getattr(session, name)
+    assert encode_session(restored) == data
+    with pytest.raises(ValueError):
+        decode_session(data[:20])
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import random
+
 import pytest
 
-from engine.entities import Position
+from engine.entities import Direction, Position
 from engine.game_state import GameEngine
 
 
@@ -76,3 +78,45 @@ def test_multi_wumpus_stench_all(engine: GameEngine) -> None:
     engine.wumpus_positions = [Position(x=3, y=2), Position(x=4, y=3)]
     senses = engine.get_senses(Position(x=3, y=3))
     assert senses["stench_direction"] == "ALL"
+
+
+def _reference_senses(engine: GameEngine, pos: Position) -> dict[str, bool | str | None]:
+    offsets = {"NORTH": (0, -1), "SOUTH": (0, 1), "EAST": (1, 0), "WEST": (-1, 0)}
+    neighbors = [Position(pos.x + dx, pos.y + dy) for dx, dy in offsets.values()]
+    labels = {
+        label
+        for wp in engine.wumpus_positions
+        for label, (dx, dy) in offsets.items()
+        if wp == Position(pos.x + dx, pos.y + dy)
+    }
+    stench: str | None = None
+    if pos in engine.wumpus_positions or len(labels) > 1:
+        stench = "ALL"
+    elif labels:
+        stench = labels.pop()
+    return {
+        "breeze": any(neighbor in engine.pits for neighbor in neighbors),
+        "stench_direction": stench,
+        "shine": pos == engine.gold_pos or engine.gold_pos in neighbors,
+    }
+
+
+def test_sense_maps_match_reference_while_wumpuses_move() -> None:
+    rng = random.Random(4)
+    for _ in range(20):
+        engine = GameEngine(size=6, num_pits=5, num_wumpuses=3)
+        for _ in range(10):
+            engine.move_wumpus(rng.randrange(len(engine.wumpus_positions)), rng.choice(list(Direction)))
+            for y in range(engine.size):
+                for x in range(engine.size):
+                    pos = Position(x=x, y=y)
+                    assert engine.get_senses(pos) == _reference_senses(engine, pos)
+
+
+def test_stench_clears_when_wumpus_removed(engine: GameEngine) -> None:
+    engine.wumpus_positions = [Position(x=3, y=2), Position(x=8, y=8)]
+    assert engine.get_senses(Position(x=3, y=3))["stench_direction"] == "NORTH"
+
+    engine.remove_wumpus(0)
+
+    assert engine.get_senses(Position(x=3, y=3))["stench_direction"] is None
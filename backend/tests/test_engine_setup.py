@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import random
 from collections.abc import Generator
 
 import pytest
 
+from engine.entities import Direction
 from engine.game_state import GameEngine
 
 
@@ -52,3 +54,46 @@ def test_multi_wumpus_spawn() -> None:
         assert game_engine.player_pos not in game_engine.wumpus_positions
         # All wumpus positions should be unique
         assert len(set(game_engine.wumpus_positions)) == 3
+
+
+def test_reset_reuses_engine_and_is_reproducible_per_seed() -> None:
+    game_engine = GameEngine(size=6, num_pits=3, num_wumpuses=2)
+    scent_memory = game_engine._require_scent_memory()
+    game_engine.remove_wumpus(0)
+    game_engine.move_player(Direction.EAST)
+    game_engine._update_scent()
+
+    game_engine.reset(seed=7)
+    first = (game_engine.wumpus_positions, game_engine.gold_pos, game_engine.pits)
+    game_engine.reset(seed=7)
+
+    assert (game_engine.wumpus_positions, game_engine.gold_pos, game_engine.pits) == first
+    assert len(game_engine.wumpus_positions) == 2
+    assert game_engine.player_pos.x == 0 and game_engine.player_pos.y == 0
+    assert game_engine.status == "Ongoing"
+    assert game_engine._require_scent_memory() is scent_memory
+    assert scent_memory.active_scent == {}
+    assert game_engine.wumpus_visited == {
+        (game_engine.wumpus_positions[0].x, game_engine.wumpus_positions[0].y)
+    }
+
+
+def test_board_is_reproducible_from_seed_and_counts() -> None:
+    first = GameEngine(size=8, num_pits=5, num_wumpuses=2, seed=1234)
+    second = GameEngine(size=8, num_pits=5, num_wumpuses=2, seed=1234)
+
+    assert first.wumpus_positions == second.wumpus_positions
+    assert first.gold_pos == second.gold_pos
+    assert first.pits == second.pits
+
+
+def test_engine_rng_is_independent_of_global_random() -> None:
+    random.seed(0)
+    first = GameEngine(size=8, num_pits=5, seed=99)
+    random.seed(1)
+    random.random()
+    second = GameEngine(size=8, num_pits=5, seed=99)
+
+    assert (first.wumpus_positions, first.gold_pos, first.pits) == (
+        second.wumpus_positions, second.gold_pos, second.pits,
+    )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import numpy as np
+
+from api import executors
+from engine.entities import Direction
+from rl.model_registry import DIFFICULTY_MODELS, clear_cache, load_model, reload_changed
+from rl.numpy_policy import NumpyPolicy
+
+
+def _save_policy(path: Path, action: int) -> None:
+    biases = np.zeros(4, dtype=np.float32)
+    biases[action] = 1.0
+    NumpyPolicy(weights=[np.zeros((4, 9), dtype=np.float32)], biases=[biases]).save(path)
+
+
+def test_submit_io_runs_side_effects_off_the_calling_thread() -> None:
+    executors.configure(io_workers=2)
+    seen: list[str] = []
+    try:
+        executors.submit_io(lambda: seen.append(threading.current_thread().name))
+        executors.submit_io(lambda: 1 / 0)  # failures are logged, not raised
+    finally:
+        executors.shutdown()
+        executors.configure(io_workers=executors.IO_WORKERS)
+
+    assert len(seen) == 1 and seen[0].startswith("api-io")
+
+
+def test_submit_io_inline_when_disabled() -> None:
+    executors.configure(io_workers=0)
+    seen: list[str] = []
+    try:
+        executors.submit_io(seen.append, "done")
+    finally:
+        executors.configure(io_workers=executors.IO_WORKERS)
+
+    assert seen == ["done"]
+
+
+def test_predict_in_process_pool_matches_local_model(tmp_path: Path) -> None:
+    _save_policy(tmp_path / "hard.npz", action=3)
+    observations = np.zeros((3, 9), dtype=np.float32)
+
+    clear_cache()
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        executors.configure(inference_workers=1)
+        try:
+            actions: Any = asyncio.run(executors.predict("hard", observations))
+        finally:
+            executors.configure(inference_workers=executors.INFERENCE_WORKERS)
+    clear_cache()
+
+    assert actions == [Direction.WEST] * 3
+
+
+def test_hot_reload_reaches_inference_workers(tmp_path: Path) -> None:
+    _save_policy(tmp_path / "hard.npz", action=3)
+    observations = np.zeros((2, 9), dtype=np.float32)
+
+    clear_cache()
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        executors.configure(inference_workers=1)
+        try:
+            load_model("hard")
+            before: Any = asyncio.run(executors.predict("hard", observations))
+            _save_policy(tmp_path / "hard.npz", action=1)
+            os.utime(tmp_path / "hard.npz", ns=(0, 10**18))
+            assert reload_changed() == ["hard"]
+            after: Any = asyncio.run(executors.predict("hard", observations))
+        finally:
+            executors.configure(inference_workers=executors.INFERENCE_WORKERS)
+    clear_cache()
+
+    assert before == [Direction.WEST] * 2
+    assert after == [Direction.SOUTH] * 2
+
+
+def test_in_process_predict_runs_off_the_event_loop(monkeypatch: Any) -> None:
+    seen: list[str] = []
+
+    class _Agent:
+        def predict_observations(self, observations: np.ndarray) -> list[Direction]:
+            seen.append(threading.current_thread().name)
+            return [Direction.EAST for _ in observations]
+
+    monkeypatch.setattr("rl.model_registry.load_model", lambda _d: _Agent())
+    executors.configure(inference_workers=0)
+
+    actions = asyncio.run(executors.predict("easy", np.zeros((2, 9), dtype=np.float32)))
+
+    assert actions == [Direction.EAST, Direction.EAST]
+    assert seen and seen[0] != threading.main_thread().name
+
+
+def test_warm_worker_runs_every_tier_once(monkeypatch: Any) -> None:
+    warmed: list[str] = []
+
+    class _Agent:
+        def __init__(self, difficulty: str) -> None:
+            self.difficulty = difficulty
+
+        def predict_observations(self, observations: np.ndarray) -> list[Direction]:
+            warmed.append(self.difficulty)
+            return [Direction.NORTH for _ in observations]
+
+    monkeypatch.setattr("rl.model_registry.load_model", _Agent)
+
+    executors._warm_worker()
+
+    assert warmed == list(DIFFICULTY_MODELS)
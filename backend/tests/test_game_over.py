@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import pytest
 
-from engine.entities import Position
+from engine.entities import Direction, Position
 from engine.game_state import GameEngine
 
 
@@ -49,3 +49,23 @@ def test_kill_last_wumpus_via_remove() -> None:
     engine.wumpus_positions = [Position(x=5, y=5)]
     engine.remove_wumpus(0)
     assert len(engine.wumpus_positions) == 0
+
+
+def test_arrow_hits_first_listed_wumpus_in_line_of_fire() -> None:
+    engine = GameEngine(size=10, num_pits=0, num_wumpuses=3)
+    engine.player_pos = Position(x=2, y=4)
+    engine.wumpus_positions = [Position(x=2, y=1), Position(x=9, y=4), Position(x=5, y=4)]
+
+    assert engine.arrow_hit(Direction.EAST) == 1
+    assert engine.arrow_hit(Direction.NORTH) == 0
+    assert engine.arrow_hit(Direction.SOUTH) is None
+    assert engine.arrow_hit(Direction.WEST) is None
+
+
+def test_arrow_misses_removed_wumpus() -> None:
+    engine = GameEngine(size=10, num_pits=0, num_wumpuses=2)
+    engine.player_pos = Position(x=0, y=0)
+    engine.wumpus_positions = [Position(x=4, y=0), Position(x=7, y=7)]
+    engine.remove_wumpus(0)
+
+    assert engine.arrow_hit(Direction.EAST) is None
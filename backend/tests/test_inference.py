@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import numpy as np
+import pytest
+
+from api.inference import InferenceScheduler
+from engine.entities import Direction
+
+
+class RecordingAgent:
+    def __init__(self) -> None:
+        self.batches: list[np.ndarray] = []
+
+    def predict_observations(self, observations: np.ndarray) -> list[Direction]:
+        self.batches.append(observations)
+        return [Direction(int(row[0]) % 4) for row in observations]
+
+
+def _rows(*values: int) -> np.ndarray:
+    rows = np.zeros((len(values), 9), dtype=np.float32)
+    rows[:, 0] = values
+    return rows
+
+
+def test_concurrent_requests_share_one_forward_pass(monkeypatch: Any) -> None:
+    agent = RecordingAgent()
+    monkeypatch.setattr("rl.model_registry.load_model", lambda _d: agent)
+    scheduler = InferenceScheduler(max_batch_size=64, max_delay=0.001)
+
+    async def run() -> list[list[Direction]]:
+        return await asyncio.gather(
+            scheduler.predict("hard", _rows(0)),
+            scheduler.predict("hard", _rows(1, 2)),
+            scheduler.predict("hard", _rows(3)),
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [
+        [Direction.NORTH],
+        [Direction.SOUTH, Direction.EAST],
+        [Direction.WEST],
+    ]
+    assert [len(batch) for batch in agent.batches] == [4]
+
+
+def test_batches_are_split_by_difficulty_and_size_cap(monkeypatch: Any) -> None:
+    agents: dict[str, RecordingAgent] = {"easy": RecordingAgent(), "hard": RecordingAgent()}
+    monkeypatch.setattr("rl.model_registry.load_model", lambda d: agents[d])
+    scheduler = InferenceScheduler(max_batch_size=2, max_delay=10.0)
+
+    async def run() -> None:
+        await asyncio.wait_for(
+            asyncio.gather(
+                scheduler.predict("easy", _rows(0)),
+                scheduler.predict("hard", _rows(1)),
+                scheduler.predict("easy", _rows(2)),
+                scheduler.predict("hard", _rows(3)),
+            ),
+            timeout=1.0,
+        )
+
+    asyncio.run(run())
+
+    assert [batch[:, 0].tolist() for batch in agents["easy"].batches] == [[0, 2]]
+    assert [batch[:, 0].tolist() for batch in agents["hard"].batches] == [[1, 3]]
+
+
+def test_inference_errors_reach_every_waiting_request(monkeypatch: Any) -> None:
+    class BrokenAgent:
+        def predict_observations(self, observations: np.ndarray) -> list[Direction]:
+            raise RuntimeError("model exploded")
+
+    monkeypatch.setattr("rl.model_registry.load_model", lambda _d: BrokenAgent())
+    scheduler = InferenceScheduler(max_batch_size=8, max_delay=0.0)
+
+    async def run() -> list[Any]:
+        return await asyncio.gather(
+            scheduler.predict("hard", _rows(0)),
+            scheduler.predict("hard", _rows(1)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    with pytest.raises(ValueError):
+        InferenceScheduler(max_batch_size=0)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pytest
+
+from api.latency import LatencyRecorder
+
+
+def test_recorder_reports_lifetime_totals_and_windowed_percentiles() -> None:
+    recorder = LatencyRecorder(window=100)
+    for ms in range(1, 201):
+        recorder.record("rest", ms / 1000.0)
+    recorder.record("websocket", 0.002)
+
+    rest, websocket = recorder.stats()
+
+    assert rest.transport == "rest"
+    assert rest.count == 200
+    assert rest.mean_ms == pytest.approx(100.5)
+    assert rest.max_ms == pytest.approx(200.0)
+    # Percentiles only cover the last 100 samples (101..200 ms).
+    assert rest.p50_ms == pytest.approx(151.0)
+    assert rest.p99_ms == pytest.approx(200.0)
+    assert (websocket.count, websocket.p95_ms) == (1, pytest.approx(2.0))
+
+
+def test_clear_drops_every_series() -> None:
+    recorder = LatencyRecorder()
+    recorder.record("rest", 0.01)
+
+    recorder.clear()
+
+    assert recorder.stats() == []
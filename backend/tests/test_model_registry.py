@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import os
+from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
 
 import numpy as np
 
 from engine.entities import Direction
+from rl import model_registry
 from rl.agent import RandomWumpusAgent, WumpusAgent
-from rl.model_registry import DIFFICULTY_MODELS, clear_cache, load_model
+from rl.action_table import build_tables
+from rl.model_registry import (
+    DIFFICULTY_MODELS,
+    clear_cache,
+    load_action_table,
+    load_model,
+    model_metrics,
+    preload,
+    reload_changed,
+)
+from rl.numpy_policy import NumpyPolicy
 
 
 def _make_mock_ppo() -> MagicMock:
@@ -42,7 +55,7 @@ def test_load_model_loads_ppo_when_file_exists(tmp_path: Any) -> None:
         fake_zip = tmp_path / "easy.zip"
         fake_zip.write_text("fake")
 
-        with patch("rl.model_registry.PPO.load", return_value=mock_ppo):
+        with patch("stable_baselines3.PPO.load", return_value=mock_ppo):
             agent = load_model("easy")
 
     assert isinstance(agent, WumpusAgent)
@@ -64,3 +77,155 @@ def test_clear_cache_resets_state() -> None:
     # After clearing, a new instance should be created
     agent = load_model("easy")
     assert isinstance(agent, RandomWumpusAgent)
+
+
+def test_load_model_prefers_numpy_export(tmp_path: Any) -> None:
+    clear_cache()
+    weights = np.zeros((4, 9), dtype=np.float32)
+    biases = np.array([0.0, 0.0, 1.0, 0.0], dtype=np.float32)
+
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        (tmp_path / "easy.zip").write_text("fake")
+        NumpyPolicy(weights=[weights], biases=[biases]).save(tmp_path / "easy.npz")
+
+        with patch("stable_baselines3.PPO.load") as ppo_load:
+            agent = load_model("easy")
+
+    ppo_load.assert_not_called()
+    assert isinstance(agent, WumpusAgent)
+    assert isinstance(agent.model, NumpyPolicy)
+    assert agent.get_wumpus_action(np.zeros(9, dtype=np.float32)) == Direction.EAST
+
+
+def _save_policy(path: Any, action: int) -> None:
+    biases = np.zeros(4, dtype=np.float32)
+    biases[action] = 1.0
+    NumpyPolicy(weights=[np.zeros((4, 9), dtype=np.float32)], biases=[biases]).save(path)
+
+
+def test_tiers_sharing_a_file_share_one_loaded_agent(tmp_path: Any) -> None:
+    clear_cache()
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        _save_policy(tmp_path / "impossible.npz", action=1)
+        _save_policy(tmp_path / "hard.npz", action=2)
+
+        with patch(
+            "rl.model_registry.NumpyPolicy.load", wraps=NumpyPolicy.load,
+        ) as numpy_load:
+            preload(["impossible_i", "impossible_ii", "impossible_iii", "hard"])
+
+        agents = [load_model(tier) for tier in ("impossible_i", "impossible_ii", "impossible_iii")]
+        metrics = {Path(m.path).name: m for m in model_metrics()}
+
+    assert numpy_load.call_count == 2
+    assert agents[0] is agents[1] is agents[2]
+    assert set(metrics) == {"impossible.npz", "hard.npz"}
+    assert metrics["hard.npz"].parameter_bytes == (4 * 9 + 4) * 4
+    assert metrics["hard.npz"].load_seconds >= 0.0
+    clear_cache()
+
+
+def test_reload_changed_swaps_retrained_models(tmp_path: Any) -> None:
+    clear_cache()
+    obs = np.zeros(9, dtype=np.float32)
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        assert isinstance(load_model("easy"), RandomWumpusAgent)
+        _save_policy(tmp_path / "easy.npz", action=1)
+        assert reload_changed() == ["easy"]
+        in_flight = load_model("easy")
+        assert in_flight.get_wumpus_action(obs) == Direction.SOUTH
+
+        assert reload_changed() == []
+        _save_policy(tmp_path / "easy.npz", action=3)
+        os.utime(tmp_path / "easy.npz", ns=(0, 10**18))
+        assert reload_changed() == ["easy"]
+
+        assert load_model("easy").get_wumpus_action(obs) == Direction.WEST
+        assert in_flight.get_wumpus_action(obs) == Direction.SOUTH
+    clear_cache()
+
+
+def test_reload_stops_serving_the_old_models_action_table(tmp_path: Any) -> None:
+    clear_cache()
+    obs = np.zeros((1, 9), dtype=np.float32)
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        _save_policy(tmp_path / "easy.npz", action=1)
+        load_model("easy")
+        build_tables([4], ["easy"])
+        old_table = load_action_table("easy", 4)
+        assert old_table is not None
+        assert old_table.predict_observations(obs) == [Direction.SOUTH]
+
+        _save_policy(tmp_path / "easy.npz", action=3)
+        os.utime(tmp_path / "easy.npz", ns=(0, 10**18))
+        assert reload_changed() == ["easy"]
+        assert load_action_table("easy", 4) is None
+
+        build_tables([4], ["easy"])
+        new_table = load_action_table("easy", 4)
+        assert new_table is not None and new_table is not old_table
+        assert new_table.predict_observations(obs) == [Direction.WEST]
+    clear_cache()
+
+
+def test_retrained_zip_newer_than_its_export_is_re_exported(tmp_path: Any) -> None:
+    clear_cache()
+    obs = np.zeros(9, dtype=np.float32)
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        _save_policy(tmp_path / "easy.npz", action=1)
+        (tmp_path / "easy.zip").write_text("v1")
+        os.utime(tmp_path / "easy.npz", ns=(0, 12 * 10**17))
+        os.utime(tmp_path / "easy.zip", ns=(0, 10**18))
+        assert load_model("easy").get_wumpus_action(obs) == Direction.SOUTH
+
+        # A retrain drops a newer .zip next to the old export.
+        (tmp_path / "easy.zip").write_text("v2")
+        os.utime(tmp_path / "easy.zip", ns=(0, 15 * 10**17))
+
+        def export(path: Path) -> Path:
+            _save_policy(path.with_suffix(".npz"), action=3)
+            return path.with_suffix(".npz")
+
+        with patch("rl.model_registry.export_model_file", side_effect=export) as exporter:
+            assert reload_changed() == ["easy"]
+            assert reload_changed() == []
+
+    exporter.assert_called_once_with(tmp_path / "easy.zip")
+    assert load_model("easy").get_wumpus_action(obs) == Direction.WEST
+    clear_cache()
+
+
+def test_touched_but_unchanged_file_is_hashed_once(tmp_path: Any) -> None:
+    clear_cache()
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        _save_policy(tmp_path / "easy.npz", action=1)
+        agent = load_model("easy")
+        os.utime(tmp_path / "easy.npz", ns=(0, 10**18))
+
+        with patch(
+            "rl.model_registry._file_sha256", wraps=model_registry._file_sha256,
+        ) as hasher:
+            assert reload_changed() == []
+            assert reload_changed() == []
+
+    assert hasher.call_count == 1
+    assert load_model("easy") is agent
+    clear_cache()
+
+
+def test_watcher_poll_finds_a_table_built_by_another_process(tmp_path: Any) -> None:
+    clear_cache()
+    with patch("rl.model_registry._MODELS_DIR", tmp_path):
+        _save_policy(tmp_path / "easy.npz", action=2)
+        load_model("easy")
+        assert load_action_table("easy", 4) is None
+
+        with patch("rl.model_registry.forget_missing_tables"):
+            build_tables([4], ["easy"])
+        assert load_action_table("easy", 4) is None
+
+        assert reload_changed() == []
+        table = load_action_table("easy", 4)
+        assert table is not None
+        assert table.predict_observations(np.zeros((1, 9), dtype=np.float32)) == [Direction.EAST]
+    clear_cache()
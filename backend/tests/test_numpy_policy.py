@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+from stable_baselines3 import PPO
+from torch import nn
+
+from rl.env import HunterWumpusEnv
+from rl.numpy_policy import NumpyPolicy, export_policy
+
+
+@pytest.mark.parametrize(
+    "policy_kwargs",
+    [None, {"net_arch": [32, 16], "activation_fn": nn.ReLU}],
+)
+def test_exported_policy_matches_ppo_predict(
+    tmp_path: Path, policy_kwargs: dict[str, object] | None,
+) -> None:
+    model = PPO("MlpPolicy", HunterWumpusEnv(), policy_kwargs=policy_kwargs, seed=0, device="cpu")
+    export_path = tmp_path / "policy.npz"
+    export_policy(model).save(export_path)
+    policy = NumpyPolicy.load(export_path)
+
+    observations = np.random.default_rng(0).random((20_000, 9), dtype=np.float32)
+    expected, _ = model.predict(observations, deterministic=True)
+    actual, _ = policy.predict(observations, deterministic=True)
+
+    # float32 summation order differs from torch, so only exact logit ties may flip.
+    mismatched = np.flatnonzero(actual != expected)
+    assert len(mismatched) <= 2
+    logits = policy.logits(observations[mismatched])
+    rows = np.arange(len(mismatched))
+    np.testing.assert_allclose(
+        logits[rows, actual[mismatched]], logits[rows, expected[mismatched]], atol=1e-5,
+    )
+    single, _ = policy.predict(observations[0])
+    assert single.shape == () and int(single) == int(expected[0])
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+
+from engine.entities import Direction, Position
+from engine.game_state import GameEngine
+from engine.senses import MAX_SCENT
+from rl.agent import WumpusAgent
+from rl.observation import empty_observation, write_engine_observation
+
+
+def _reference_observation(engine: GameEngine, wumpus: Position) -> np.ndarray:
+    grid = engine.scent_grid
+    denom = float(max(1, engine.size - 1))
+
+    def scent(x: int, y: int) -> float:
+        if 0 <= x < engine.size and 0 <= y < engine.size:
+            return grid[y][x] / MAX_SCENT
+        return 0.0
+
+    return np.array(
+        [
+            wumpus.x / denom,
+            wumpus.y / denom,
+            engine.player_pos.x / denom,
+            engine.player_pos.y / denom,
+            scent(wumpus.x, wumpus.y),
+            scent(wumpus.x, wumpus.y - 1),
+            scent(wumpus.x + 1, wumpus.y),
+            scent(wumpus.x, wumpus.y + 1),
+            scent(wumpus.x - 1, wumpus.y),
+        ],
+        dtype=np.float32,
+    )
+
+
+def test_engine_and_state_observations_match_reference() -> None:
+    engine = GameEngine(size=5, num_pits=0, seed=3)
+    agent = WumpusAgent(model=None)  # type: ignore[arg-type]
+    buffer = empty_observation()
+    rng = np.random.default_rng(0)
+
+    for _ in range(60):
+        engine.move_player(Direction(int(rng.integers(0, 4))))
+        engine.move_wumpus(Direction(int(rng.integers(0, 4))))
+        engine._update_scent()
+        engine.status = "Ongoing"
+        wumpus = engine.wumpus_pos
+        expected = _reference_observation(engine, wumpus)
+
+        assert write_engine_observation(buffer, engine, wumpus) is buffer
+        np.testing.assert_array_equal(buffer, expected)
+        state = {
+            "grid_size": engine.size,
+            "player_pos": [engine.player_pos.x, engine.player_pos.y],
+            "wumpus_pos": [wumpus.x, wumpus.y],
+            "scent_grid": engine.scent_grid,
+        }
+        np.testing.assert_array_equal(agent.build_observation(state), expected)
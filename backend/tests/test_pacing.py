@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
 from fastapi.testclient import TestClient
 
 from api.main import app
@@ -10,12 +11,8 @@ from engine.entities import Direction, Position
 
 
 class StubAgent:
-    def build_observation(self, game_state: dict[str, object]) -> object:
-        return game_state
-
-    def get_wumpus_action(self, obs: object) -> Direction:
-        del obs
-        return Direction.WEST
+    def predict_observations(self, observations: np.ndarray) -> list[Direction]:
+        return [Direction.WEST for _ in observations]
 
 
 def _start_game(client: TestClient) -> dict[str, Any]:
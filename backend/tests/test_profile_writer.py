@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+
+from api.profile_writer import MemorySink, ProfileDelta, ProfileWriter
+
+
+class _FlakySink(MemorySink):
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures = failures
+
+    def commit(self, updates: Mapping[str, ProfileDelta]) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("backend unavailable")
+        super().commit(updates)
+
+
+def test_increments_are_coalesced_per_uid_into_one_commit(tmp_path: Path) -> None:
+    sink = MemorySink()
+    writer = ProfileWriter(sink, spill_path=tmp_path / "spill.jsonl")
+
+    for won in (True, False, True):
+        writer.record("alice", "a@example.com", won)
+    writer.record("bob", "", False)
+
+    assert writer.flush() == 2
+    assert sink.commits == 1
+    assert sink.profiles["alice"] == ProfileDelta("a@example.com", 3, 2, 1)
+    assert sink.profiles["bob"] == ProfileDelta("", 1, 0, 1)
+    assert writer.flush() == 0
+
+
+def test_backlog_spills_to_disk_while_a_slow_commit_holds_the_flusher(
+    tmp_path: Path,
+) -> None:
+    entered, release = threading.Event(), threading.Event()
+
+    class _SlowSink(MemorySink):
+        def commit(self, updates: Mapping[str, ProfileDelta]) -> None:
+            entered.set()
+            release.wait(5.0)
+            super().commit(updates)
+
+    sink = _SlowSink()
+    spill = tmp_path / "spill.jsonl"
+    writer = ProfileWriter(sink, flush_interval=0.01, max_pending=3, spill_path=spill)
+    writer.start()
+    writer.record("first", "", True)
+    assert entered.wait(2.0)
+
+    for uid in ("a", "b", "a", "c", "d"):
+        writer.record(uid, "", True)
+    for _ in range(200):
+        if spill.exists():
+            break
+        threading.Event().wait(0.01)
+    assert spill.exists()
+    assert writer.stats().pending == 1
+
+    release.set()
+    writer.close()
+
+    assert sink.profiles["a"] == ProfileDelta("", 2, 2, 0)
+    assert set(sink.profiles) == {"first", "a", "b", "c", "d"}
+    assert sum(p.games_played for p in sink.profiles.values()) == 6
+    assert not spill.exists()
+
+
+def test_failed_commit_is_kept_and_retried(tmp_path: Path) -> None:
+    sink = _FlakySink(failures=1)
+    writer = ProfileWriter(sink, spill_path=tmp_path / "spill.jsonl")
+    writer.record("alice", "", True)
+
+    assert writer.flush() == 0
+    writer.record("alice", "", True)
+    assert writer.flush() == 1
+
+    assert sink.profiles["alice"] == ProfileDelta("", 2, 2, 0)
+    stats = writer.stats()
+    assert (stats.failed_commits, stats.committed_total) == (1, 1)
+
+
+def test_partial_commit_retries_only_the_chunks_that_failed(tmp_path: Path) -> None:
+    class _FailsSecondChunk(MemorySink):
+        def __init__(self) -> None:
+            super().__init__(batch_limit=2)
+            self.chunks = 0
+
+        def _commit_chunk(self, chunk: list[tuple[str, ProfileDelta]]) -> None:
+            self.chunks += 1
+            if self.chunks == 2:
+                raise RuntimeError("backend unavailable")
+            super()._commit_chunk(chunk)
+
+    sink = _FailsSecondChunk()
+    writer = ProfileWriter(sink, spill_path=tmp_path / "spill.jsonl")
+    for uid in ("a", "b", "c", "d", "e"):
+        writer.record(uid, "", True)
+
+    assert writer.flush() == 3
+    assert set(sink.profiles) == {"a", "b", "e"}
+    assert writer.flush() == 2
+
+    assert sink.profiles == {uid: ProfileDelta("", 1, 1, 0) for uid in "abcde"}
+    stats = writer.stats()
+    assert (stats.failed_commits, stats.committed_total, stats.spilled_total) == (1, 5, 2)
+
+
+def test_background_thread_commits_and_close_drains(tmp_path: Path) -> None:
+    committed = threading.Event()
+
+    class _SignallingSink(MemorySink):
+        def commit(self, updates: Mapping[str, ProfileDelta]) -> None:
+            super().commit(updates)
+            committed.set()
+
+    sink = _SignallingSink()
+    writer = ProfileWriter(sink, flush_interval=0.01, spill_path=tmp_path / "spill.jsonl")
+    writer.start()
+    writer.record("alice", "", True)
+    assert committed.wait(2.0)
+
+    writer.record("bob", "", False)
+    writer.close()
+
+    assert set(sink.profiles) == {"alice", "bob"}
+
+
+def test_close_spills_when_the_sink_is_down_and_next_run_commits(tmp_path: Path) -> None:
+    spill = tmp_path / "spill.jsonl"
+    down = ProfileWriter(_FlakySink(failures=1), spill_path=spill)
+    down.record("alice", "", True)
+    down.close()
+    inflight = tmp_path / "spill.jsonl.inflight"
+    assert inflight.exists()
+
+    sink = MemorySink()
+    ProfileWriter(sink, spill_path=spill).close()
+
+    assert sink.profiles["alice"] == ProfileDelta("", 1, 1, 0)
+    assert not inflight.exists() and not spill.exists()
+
+
+def test_spilled_updates_survive_a_crash_during_the_commit(tmp_path: Path) -> None:
+    spill = tmp_path / "spill.jsonl"
+    writer = ProfileWriter(MemorySink(), max_pending=2, spill_path=spill)
+    writer.record("a", "", True)
+    writer.record("b", "", False)
+    writer._spill_overflow()
+
+    class _CrashingSink(MemorySink):
+        def commit(self, updates: Mapping[str, ProfileDelta]) -> None:
+            raise SystemExit("process killed mid-commit")
+
+    writer.sink = _CrashingSink()
+    try:
+        writer.flush()
+    except SystemExit:
+        pass
+
+    sink = MemorySink()
+    ProfileWriter(sink, spill_path=spill).close()
+
+    assert sink.profiles == {"a": ProfileDelta("", 1, 1, 0), "b": ProfileDelta("", 1, 0, 1)}
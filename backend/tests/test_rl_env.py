@@ -91,3 +91,16 @@ def test_player_won_gives_terminal_negative_reward(
     assert reward == -101.0
     assert terminated is True
     assert info["status"] == "PlayerWon"
+
+
+def test_reset_reuses_engine_between_episodes() -> None:
+    env = HunterWumpusEnv(size=4, num_pits=1)
+    first_obs, _ = env.reset(seed=9)
+    engine = env.engine
+    env.step(1)
+
+    second_obs, _ = env.reset(seed=9)
+
+    assert env.engine is engine
+    assert env.step_count == 0
+    np.testing.assert_array_equal(first_obs, second_obs)
@@ -14,6 +14,7 @@ def engine() -> GameEngine:
     game_engine.wumpus_positions = [Position(x=3, y=3)]
     game_engine.gold_pos = Position(x=3, y=0)
     game_engine.pits = []
+    game_engine._require_scent_memory().wumpus_visited = {(3, 3)}
     return game_engine
 
 
@@ -50,7 +51,7 @@ def test_scent_decay(engine: GameEngine) -> None:
 
 
 def test_scent_timing(engine: GameEngine) -> None:
-    engine.scent_grid[0][0] = 1
+    engine._require_scent_memory().set_scent(Position(x=0, y=0), 1)
     engine.move_player(Direction.EAST)
 
     assert engine.scent_grid[0][0] == 1
@@ -60,6 +61,30 @@ def test_scent_timing(engine: GameEngine) -> None:
     assert engine.scent_grid[0][0] == MAX_SCENT
 
 
+def test_only_active_trail_cells_are_tracked(engine: GameEngine) -> None:
+    for direction in (Direction.EAST, Direction.EAST, Direction.SOUTH, Direction.SOUTH):
+        engine.move_player(direction)
+        engine._update_scent()
+
+    scent_memory = engine._require_scent_memory()
+    assert len(scent_memory.active_scent) == MAX_SCENT
+    assert engine.scent_at(Position(x=0, y=0)) == 0
+    assert engine.scent_at(Position(x=1, y=0)) == 1
+    assert engine.scent_at(Position(x=2, y=1)) == MAX_SCENT
+    assert engine.scent_grid == [
+        [0, 1, 2, 0],
+        [0, 0, 3, 0],
+        [0, 0, 0, 0],
+        [0, 0, 0, 0],
+    ]
+
+
+def test_scent_grid_is_a_copy(engine: GameEngine) -> None:
+    engine.scent_grid[0][0] = MAX_SCENT
+
+    assert engine.scent_at(Position(x=0, y=0)) == 0
+
+
 def test_wumpus_memory_logging(engine: GameEngine) -> None:
     initial_count = len(engine.wumpus_visited)
 
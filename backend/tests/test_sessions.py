@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from api.sessions import SessionState, SessionStore
+from engine.game_state import GameEngine
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _session() -> SessionState:
+    return SessionState(engine=GameEngine(size=4, num_pits=1, seed=0))
+
+
+def test_lru_cap_evicts_least_recently_used() -> None:
+    store = SessionStore(max_sessions=2)
+    store["a"] = _session()
+    store["b"] = _session()
+    assert store.get("a") is not None
+
+    store["c"] = _session()
+
+    assert "b" not in store
+    assert list(store) == ["a", "c"]
+    assert store.stats().evicted_total == 1
+    with pytest.raises(KeyError):
+        store["b"]
+
+
+def test_lru_cap_skips_sessions_with_a_request_in_flight() -> None:
+    store = SessionStore(max_sessions=2)
+    store["busy"] = _session()
+    store["idle"] = _session()
+
+    async def run() -> None:
+        async with store.lock("busy"):
+            store["new"] = _session()
+            assert list(store) == ["busy", "new"]
+            store["newer"] = _session()
+
+    asyncio.run(run())
+
+    assert list(store) == ["busy", "newer"]
+    assert store.stats().evicted_total == 2
+
+
+def test_lru_cap_waits_when_every_other_session_is_busy() -> None:
+    store = SessionStore(max_sessions=1)
+    store["busy"] = _session()
+
+    async def run() -> None:
+        async with store.lock("busy"):
+            store["new"] = _session()
+
+    asyncio.run(run())
+
+    assert list(store) == ["busy", "new"]
+    store["newest"] = _session()
+    assert list(store) == ["newest"]
+
+
+def test_locks_are_only_kept_for_stored_games() -> None:
+    store = SessionStore()
+    store["a"] = _session()
+
+    async def run() -> None:
+        async with store.lock("missing"):
+            pass
+        async with store.lock("a"):
+            store.pop("a")
+        async with store.lock("a"):
+            pass
+
+    asyncio.run(run())
+
+    assert store._locks == {}
+
+
+def test_sweep_expires_idle_and_finished_games() -> None:
+    clock = FakeClock()
+    store = SessionStore(idle_ttl=100.0, terminal_ttl=10.0, clock=clock)
+    store["ongoing"] = _session()
+    store["finished"] = _session()
+    store["finished"].engine.status = "PlayerWon"
+
+    clock.now = 50.0
+    assert store.sweep() == 1
+    assert list(store) == ["ongoing"]
+
+    clock.now = 99.0
+    assert store.sweep() == 0
+    clock.now = 100.0
+    assert store.sweep() == 1
+    assert len(store) == 0
+    assert store.stats().expired_total == 2
+
+
+def test_sweep_skips_sessions_with_a_request_in_flight() -> None:
+    clock = FakeClock()
+    store = SessionStore(idle_ttl=1.0, clock=clock)
+    store["busy"] = _session()
+
+    async def run() -> int:
+        async with store.lock("busy"):
+            clock.now = 5.0
+            return store.sweep()
+
+    assert asyncio.run(run()) == 0
+    assert store.sweep() == 1
+
+
+def test_stats_report_counts_and_memory() -> None:
+    store = SessionStore()
+    store["a"] = _session()
+    store["b"] = _session()
+    store["b"].engine.status = "PlayerLost_Pit"
+
+    stats = store.stats()
+
+    assert (stats.sessions, stats.ongoing, stats.finished) == (2, 1, 1)
+    assert stats.approx_bytes > 0
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from api.sessions import SessionConflictError, SessionState
+from api.sqlite_sessions import SqliteSessionStore
+from engine.entities import Direction
+from engine.game_state import GameEngine
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _session(turn: int = 0) -> SessionState:
+    return SessionState(engine=GameEngine(size=4, num_pits=1, seed=turn), turn=turn)
+
+
+def test_other_workers_see_saves_immediately(tmp_path: Path) -> None:
+    path = tmp_path / "sessions.db"
+    worker_a = SqliteSessionStore(path)
+    worker_b = SqliteSessionStore(path)
+    try:
+        session = _session(turn=3)
+        worker_a["game"] = session
+
+        shared = worker_b["game"]
+        assert shared.turn == 3
+        assert shared.engine.pits == session.engine.pits
+
+        session = worker_a["game"]
+        session.turn += 1
+        worker_a.save("game", session)
+        assert worker_b["game"].turn == 4
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_interleaved_moves_from_two_workers_conflict_instead_of_overwriting(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "sessions.db"
+    worker_a = SqliteSessionStore(path)
+    worker_b = SqliteSessionStore(path)
+    try:
+        worker_a["game"] = _session()
+
+        # Both workers read turn 0 and play it.
+        on_a = worker_a["game"]
+        on_b = worker_b["game"]
+        on_a.engine.move_player(Direction.EAST)
+        on_a.turn += 1
+        on_b.engine.move_player(Direction.SOUTH)
+        on_b.turn += 1
+
+        worker_a.save("game", on_a)
+        with pytest.raises(SessionConflictError):
+            worker_b.save("game", on_b)
+
+        # Worker B re-reads A's turn and plays the next one on top of it.
+        on_b = worker_b["game"]
+        assert (on_b.turn, on_b.engine.player_pos) == (1, on_a.engine.player_pos)
+        on_b.engine.move_player(Direction.SOUTH)
+        on_b.turn += 1
+        worker_b.save("game", on_b)
+
+        final = worker_a["game"]
+        assert final.turn == 2
+        assert final.engine.player_pos == on_b.engine.player_pos
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_game_trimmed_by_another_worker_is_missing_not_conflicting(tmp_path: Path) -> None:
+    path = tmp_path / "sessions.db"
+    clock = FakeClock()
+    worker_a = SqliteSessionStore(path, max_sessions=1, clock=clock)
+    worker_b = SqliteSessionStore(path, max_sessions=1, clock=clock)
+    try:
+        worker_a["game"] = _session()
+        playing = worker_a["game"]
+        clock.now += 1.0
+        worker_b["newer"] = _session()
+        assert worker_b.sweep() == 1
+
+        playing.turn += 1
+        with pytest.raises(KeyError):
+            worker_a.save("game", playing)
+    finally:
+        worker_a.close()
+        worker_b.close()
+
+
+def test_async_calls_query_the_database_off_the_event_loop(tmp_path: Path) -> None:
+    store = SqliteSessionStore(tmp_path / "sessions.db")
+    threads: list[str] = []
+    db_lock = store._db_lock
+
+    class _RecordingLock:
+        # Every query runs under the store's database lock.
+        def __enter__(self) -> None:
+            threads.append(threading.current_thread().name)
+            db_lock.acquire()
+
+        def __exit__(self, *exc: object) -> None:
+            db_lock.release()
+
+    store._db_lock = _RecordingLock()  # type: ignore[assignment]
+
+    async def play() -> None:
+        await store.add_async("game", _session())
+        assert await store.contains_async("game")
+        session = await store.get_async("game")
+        assert session is not None
+        session.turn += 1
+        await store.save_async("game", session)
+        assert await store.sweep_async() == 0
+
+    try:
+        asyncio.run(play())
+        assert threads and threading.main_thread().name not in threads
+    finally:
+        store.close()
+
+
+def test_games_survive_restart(tmp_path: Path) -> None:
+    path = tmp_path / "sessions.db"
+    store = SqliteSessionStore(path)
+    store["game"] = _session(turn=7)
+    store.close()
+
+    reopened = SqliteSessionStore(path)
+    try:
+        assert reopened["game"].turn == 7
+        assert reopened.pop("game") is not None
+        assert "game" not in reopened
+    finally:
+        reopened.close()
+
+
+def test_sweep_expires_and_trims(tmp_path: Path) -> None:
+    clock = FakeClock()
+    store = SqliteSessionStore(
+        tmp_path / "sessions.db",
+        idle_ttl=100.0,
+        terminal_ttl=10.0,
+        max_sessions=2,
+        clock=clock,
+    )
+    try:
+        finished = _session()
+        finished.engine.status = "PlayerWon"
+        store["finished"] = finished
+        store["old"] = _session()
+        clock.now += 50.0
+        store["new"] = _session()
+
+        assert store.sweep() == 1
+        assert "finished" not in store and len(store) == 2
+
+        clock.now += 60.0
+        assert store.sweep() == 1
+        assert "old" not in store and "new" in store
+        stats = store.stats()
+        assert (stats.sessions, stats.expired_total) == (1, 2)
+        assert stats.approx_bytes > 0
+    finally:
+        store.close()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from rl.subproc_env import SubprocWumpusVecEnv
+
+
+def _rollout(seed: int, steps: int = 25) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    vec_env = SubprocWumpusVecEnv(
+        num_workers=2, envs_per_worker=3, size=4, num_pits=1, seed=seed, start_method="fork",
+    )
+    try:
+        vec_env.seed(seed)
+        observations = [vec_env.reset()]
+        rewards = []
+        rng = np.random.default_rng(seed)
+        for _ in range(steps):
+            obs, reward, _, infos = vec_env.step(rng.integers(0, 4, size=vec_env.num_envs))
+            assert len(infos) == vec_env.num_envs
+            observations.append(obs)
+            rewards.append(reward)
+        return observations, rewards
+    finally:
+        vec_env.close()
+
+
+def test_workers_fill_shared_buffers() -> None:
+    observations, rewards = _rollout(seed=5, steps=3)
+
+    assert observations[0].shape == (6, 9)
+    assert observations[0].dtype == np.float32
+    assert rewards[0].shape == (6,)
+
+
+def test_rollouts_are_deterministic_per_seed() -> None:
+    first_obs, first_rewards = _rollout(seed=11)
+    second_obs, second_rewards = _rollout(seed=11)
+
+    np.testing.assert_array_equal(np.stack(first_obs), np.stack(second_obs))
+    np.testing.assert_array_equal(np.stack(first_rewards), np.stack(second_rewards))
+
+
+def test_done_envs_report_terminal_observation() -> None:
+    vec_env = SubprocWumpusVecEnv(
+        num_workers=2, envs_per_worker=2, size=4, num_pits=0, max_steps=1, start_method="fork",
+    )
+    try:
+        vec_env.reset()
+        _, _, dones, infos = vec_env.step(np.zeros(4, dtype=np.int64))
+    finally:
+        vec_env.close()
+
+    assert dones.all()
+    assert all(info["terminal_observation"].shape == (9,) for info in infos)
+
+
+def test_attributes_and_methods_are_forwarded_to_workers() -> None:
+    vec_env = SubprocWumpusVecEnv(
+        num_workers=2, envs_per_worker=2, size=4, num_pits=0, max_steps=50, start_method="fork",
+    )
+    try:
+        assert vec_env.get_attr("render_mode") == [None] * 4
+        assert vec_env.get_attr("max_steps", indices=[3, 0]) == [50, 50]
+
+        vec_env.set_attr("max_steps", 1)
+        assert len(vec_env.env_method("seed", 7, indices=[1, 2])) == 2
+        vec_env.reset()
+        dones = vec_env.step(np.zeros(4, dtype=np.int64))[2]
+        assert dones.all()
+
+        with pytest.raises(AttributeError):
+            vec_env.get_attr("no_such_attribute")
+    finally:
+        vec_env.close()
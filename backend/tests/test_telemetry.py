@@ -17,12 +17,17 @@ from api import telemetry
 def _reset_telemetry_state(tmp_path: Path) -> Any:
     """Reset module-level state and redirect queue to tmp_path."""
     original_path = telemetry.TELEMETRY_QUEUE_PATH
+    original_writer = telemetry._writer
     original_client = telemetry._sheets_client
     original_inited = telemetry._sheets_inited
     telemetry.TELEMETRY_QUEUE_PATH = tmp_path / "test_queue.jsonl"
+    # Write through so each test can read the file right after enqueueing.
+    telemetry._writer = telemetry.TelemetryWriter(telemetry.TELEMETRY_QUEUE_PATH, flush_interval=0)
     telemetry._sheets_client = None
     telemetry._sheets_inited = False
     yield
+    telemetry._writer.close()
+    telemetry._writer = original_writer
     telemetry.TELEMETRY_QUEUE_PATH = original_path
     telemetry._sheets_client = original_client
     telemetry._sheets_inited = original_inited
@@ -91,8 +96,9 @@ def test_flush_queue_uploads_and_truncates() -> None:
     rows = mock_ws.append_rows.call_args[0][0]
     assert len(rows) == 1
     assert rows[0][2] == "medium"
-    # File should be truncated
-    assert telemetry.TELEMETRY_QUEUE_PATH.read_text(encoding="utf-8") == ""
+    # Nothing is left to upload
+    assert not telemetry.TELEMETRY_QUEUE_PATH.exists()
+    assert telemetry._writer.sealed_segments() == []
 
 
 def test_flush_queue_preserves_on_upload_failure() -> None:
@@ -115,7 +121,8 @@ def test_flush_queue_preserves_on_upload_failure() -> None:
     count = telemetry.flush_queue()
 
     assert count == 0
-    lines = telemetry.TELEMETRY_QUEUE_PATH.read_text(encoding="utf-8").strip().splitlines()
+    (segment,) = telemetry._writer.sealed_segments()
+    lines = segment.read_text(encoding="utf-8").strip().splitlines()
     assert len(lines) == 1  # preserved for retry
 
 
@@ -200,3 +207,126 @@ def test_start_processor_spawns_daemon_thread() -> None:
         assert thread.daemon is True
         assert thread.name == "telemetry-processor"
         # Clean up: we can't easily stop the thread, but it's a daemon
+
+
+def test_writer_buffers_until_flushed_and_keeps_the_file_open(tmp_path: Path) -> None:
+    path = tmp_path / "buffered.jsonl"
+    writer = telemetry.TelemetryWriter(path, flush_interval=60, flush_records=1_000)
+
+    for i in range(3):
+        writer.append(json.dumps({"n": i}))
+    assert not path.exists()
+
+    assert writer.flush() == 3
+    handle = writer._handle
+    writer.append(json.dumps({"n": 3}))
+    writer.close()
+
+    assert handle.closed
+    assert [json.loads(line)["n"] for line in path.read_text(encoding="utf-8").splitlines()] == [
+        0, 1, 2, 3,
+    ]
+
+
+def test_writer_flushes_in_the_background_on_record_threshold(tmp_path: Path) -> None:
+    path = tmp_path / "threshold.jsonl"
+    writer = telemetry.TelemetryWriter(path, flush_interval=60, flush_records=2)
+
+    writer.append('{"n": 0}')
+    writer.append('{"n": 1}')
+    for _ in range(200):
+        if path.exists() and path.read_text(encoding="utf-8").count("\n") == 2:
+            break
+        threading.Event().wait(0.01)
+    writer.close()
+
+    assert path.read_text(encoding="utf-8").count("\n") == 2
+
+
+def test_writer_seals_segments_at_the_size_cap_and_flush_uploads_them_all(
+    tmp_path: Path,
+) -> None:
+    telemetry._writer = telemetry.TelemetryWriter(
+        telemetry.TELEMETRY_QUEUE_PATH, flush_interval=0, segment_records=2,
+    )
+    for i in range(5):
+        telemetry.enqueue_stats(
+            user_id=f"u{i}",
+            difficulty="easy",
+            status="PlayerWon",
+            turns=i,
+            arrows_used=0,
+            player_x=0,
+            player_y=0,
+            wumpus_count=1,
+            pit_count=2,
+        )
+    assert len(telemetry._writer.sealed_segments()) == 2
+
+    mock_ws = MagicMock()
+    telemetry._sheets_client = mock_ws
+    telemetry._sheets_inited = True
+
+    assert telemetry.flush_queue() == 5
+    uploaded = [row[1] for call in mock_ws.append_rows.call_args_list for row in call[0][0]]
+    assert uploaded == ["u0", "u1", "u2", "u3", "u4"]
+    assert telemetry._writer.sealed_segments() == []
+    assert not telemetry.TELEMETRY_QUEUE_PATH.exists()
+
+
+def _enqueue(user_id: str) -> None:
+    telemetry.enqueue_stats(
+        user_id=user_id,
+        difficulty="easy",
+        status="PlayerWon",
+        turns=1,
+        arrows_used=0,
+        player_x=0,
+        player_y=0,
+        wumpus_count=1,
+        pit_count=2,
+    )
+
+
+def test_rotation_during_an_upload_neither_loses_nor_repeats_lines() -> None:
+    telemetry._writer = telemetry.TelemetryWriter(
+        telemetry.TELEMETRY_QUEUE_PATH, flush_interval=0, segment_records=2,
+    )
+    _enqueue("u0")
+    uploaded: list[str] = []
+
+    def append_rows(rows: list[list[Any]], value_input_option: str) -> None:
+        uploaded.extend(row[1] for row in rows)
+        if len(uploaded) == 1:
+            # Games finishing mid-upload fill and rotate the live file.
+            for user_id in ("u1", "u2", "u3"):
+                _enqueue(user_id)
+
+    mock_ws = MagicMock()
+    mock_ws.append_rows.side_effect = append_rows
+    telemetry._sheets_client = mock_ws
+    telemetry._sheets_inited = True
+
+    assert telemetry.flush_queue() == 1
+    assert telemetry.flush_queue() == 3
+    assert uploaded == ["u0", "u1", "u2", "u3"]
+    assert telemetry._writer.sealed_segments() == []
+
+
+def test_lines_are_kept_when_a_write_fails(tmp_path: Path) -> None:
+    path = tmp_path / "blocked.jsonl"
+    path.mkdir()
+    writer = telemetry.TelemetryWriter(path, flush_interval=60)
+    writer.append('{"n": 0}')
+    writer.append('{"n": 1}')
+
+    with pytest.raises(OSError):
+        writer.flush()
+    path.rmdir()
+    writer.append('{"n": 2}')
+
+    assert writer.flush() == 3
+    writer.close()
+    assert [json.loads(line)["n"] for line in path.read_text(encoding="utf-8").splitlines()] == [
+        0, 1, 2,
+    ]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import base64
+import uuid
+
+import numpy as np
+import pytest
+
+from api.sessions import SessionState
+from api.tokens import decode_state_token, encode_state_token
+from engine.entities import Direction
+from engine.game_state import GameEngine
+
+
+def _played_session(seed: int) -> SessionState:
+    engine = GameEngine(size=9, num_pits=4, num_wumpuses=3, seed=seed)
+    session = SessionState(engine=engine, difficulty="impossible_ii", pacing_interval=2, seed=seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(15):
+        engine.move_player(Direction(int(rng.integers(0, 4))))
+        position = (engine.player_pos.x, engine.player_pos.y)
+        if position not in session.explored_set:
+            session.explored_set.add(position)
+            session.explored_tiles.append(position)
+        engine.move_wumpus(1, Direction(int(rng.integers(0, 4))))
+        engine._update_scent()
+        session.turn += 1
+    engine.move_player(Direction.EAST)
+    engine.remove_wumpus(0)
+    session.arrows_remaining = 0
+    return session
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_state_token_round_trip(seed: int) -> None:
+    session = _played_session(seed)
+    game_id = str(uuid.uuid4())
+
+    restored = decode_state_token(encode_state_token(game_id, session), game_id)
+
+    engine, original = restored.engine, session.engine
+    for name in ("size", "num_pits", "num_wumpuses", "status", "player_pos", "gold_pos", "pits"):
+        assert getattr(engine, name) == getattr(original, name)
+    assert engine.wumpus_positions == original.wumpus_positions
+    assert engine.scent_grid == original.scent_grid
+    assert engine.wumpus_visited == original.wumpus_visited
+    for name in ("turn", "arrows_remaining", "explored_set", "pacing_interval", "difficulty", "seed"):
+        assert getattr(restored, name) == getattr(session, name)
+    assert restored.explored_tiles == sorted(session.explored_tiles, key=lambda p: (p[1], p[0]))
+    engine._update_scent()
+    original._update_scent()
+    assert engine.scent_grid == original.scent_grid
+
+
+def test_state_token_hides_the_board() -> None:
+    session = _played_session(0)
+    game_id = str(uuid.uuid4())
+
+    first = encode_state_token(game_id, session)
+    second = encode_state_token(game_id, session)
+
+    # A fresh nonce per token: equal states never produce equal ciphertexts.
+    assert first != second
+    assert decode_state_token(second, game_id).engine.pits == session.engine.pits
+
+
+def test_state_token_rejects_tampering_and_other_games() -> None:
+    session = _played_session(1)
+    game_id = str(uuid.uuid4())
+    token = encode_state_token(game_id, session)
+    raw = bytearray(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    raw[10] ^= 1
+    forged = base64.urlsafe_b64encode(bytes(raw)).rstrip(b"=").decode("ascii")
+
+    with pytest.raises(ValueError):
+        decode_state_token(forged, game_id)
+    with pytest.raises(ValueError):
+        decode_state_token(token, str(uuid.uuid4()))
+    with pytest.raises(ValueError):
+        decode_state_token(token, game_id, secret=b"another worker")
+    with pytest.raises(ValueError):
+        decode_state_token("not a token!", game_id)
+    with pytest.raises(ValueError):
+        decode_state_token(token[:12], game_id)
+
+
+def test_state_token_shares_an_explicit_secret() -> None:
+    session = _played_session(2)
+    game_id = str(uuid.uuid4())
+
+    token = encode_state_token(game_id, session, secret=b"shared")
+
+    assert decode_state_token(token, game_id, secret=b"shared").turn == session.turn
+
+
+def test_unseeded_session_cannot_be_tokenised() -> None:
+    with pytest.raises(ValueError):
+        encode_state_token(str(uuid.uuid4()), SessionState(engine=GameEngine(seed=0)))
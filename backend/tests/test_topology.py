@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from engine.entities import Direction, Position
+from engine.topology import get_topology
+
+
+def test_topology_is_cached_per_size() -> None:
+    assert get_topology(5) is get_topology(5)
+    assert get_topology(5) is not get_topology(6)
+
+
+def test_moves_clamp_at_walls_and_adjacent_marks_off_board() -> None:
+    topology = get_topology(4)
+    corner = topology.index(Position(x=0, y=0))
+
+    assert topology.moves[Direction.NORTH.value][corner] == corner
+    assert topology.moves[Direction.WEST.value][corner] == corner
+    assert topology.moves[Direction.EAST.value][corner] == topology.index(Position(x=1, y=0))
+    assert topology.adjacent[Direction.NORTH.value][corner] == -1
+    assert topology.adjacent[Direction.SOUTH.value][corner] == topology.index(Position(x=0, y=1))
+
+
+def test_neighbors_and_distance_rings() -> None:
+    topology = get_topology(3)
+    center = topology.index(Position(x=1, y=1))
+
+    assert [topology.positions[cell] for cell in topology.neighbors[center]] == [
+        Position(x=1, y=0),
+        Position(x=1, y=2),
+        Position(x=2, y=1),
+        Position(x=0, y=1),
+    ]
+    assert [len(ring) for ring in topology.distance_rings] == [1, 2, 3, 2, 1]
+    assert topology.origin_distance[topology.index(Position(x=2, y=2))] == 4
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from engine.batch import BatchGameEngine
+from engine.entities import Direction
+from rl.env import HunterWumpusEnv
+from rl.vec_env import HunterWumpusVecEnv
+
+
+def test_reset_returns_batched_locked_observations() -> None:
+    vec_env = HunterWumpusVecEnv(num_envs=8, size=4, num_pits=1)
+    vec_env.seed(3)
+    obs = vec_env.reset()
+
+    assert obs.shape == (8, 9)
+    assert obs.dtype == np.float32
+    assert all(vec_env.observation_space.contains(row) for row in obs)
+
+
+def test_steps_match_scalar_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    num_envs = 16
+    envs = [HunterWumpusEnv(size=5, num_pits=2) for _ in range(num_envs)]
+    scalar_obs = [env.reset(seed=seed)[0] for seed, env in enumerate(envs)]
+
+    vec_env = HunterWumpusVecEnv(num_envs=num_envs, size=5, num_pits=2)
+    vec_env.engine = BatchGameEngine.from_engines([env.engine for env in envs])
+    np.testing.assert_array_equal(vec_env._get_obs(), np.stack(scalar_obs))
+
+    rng = np.random.default_rng(7)
+    player_dirs = np.zeros(num_envs, dtype=np.int64)
+    monkeypatch.setattr(vec_env, "_sample_player_directions", lambda: player_dirs)
+    for index, env in enumerate(envs):
+        monkeypatch.setattr(
+            env, "_sample_player_direction",
+            lambda index=index: Direction(int(player_dirs[index])),
+        )
+
+    finished = np.zeros(num_envs, dtype=bool)
+    for _ in range(30):
+        actions = rng.integers(0, 4, size=num_envs)
+        player_dirs[:] = rng.integers(0, 4, size=num_envs)
+        obs, rewards, dones, infos = vec_env.step(actions)
+
+        for index, env in enumerate(envs):
+            if finished[index]:
+                continue
+            expected_obs, reward, terminated, truncated, info = env.step(int(actions[index]))
+            info_row: dict[str, Any] = infos[index]
+            assert rewards[index] == reward
+            assert dones[index] == (terminated or truncated)
+            assert info_row["status"] == info["status"]
+            actual_obs = info_row["terminal_observation"] if dones[index] else obs[index]
+            np.testing.assert_array_equal(actual_obs, expected_obs)
+        finished |= dones
+
+
+def test_done_envs_auto_reset() -> None:
+    vec_env = HunterWumpusVecEnv(num_envs=4, size=4, num_pits=0, max_steps=1)
+    vec_env.reset()
+
+    obs, _, dones, infos = vec_env.step(np.zeros(4, dtype=np.int64))
+
+    assert dones.all()
+    assert all("terminal_observation" in info for info in infos)
+    assert (vec_env.step_counts == 0).all()
+    np.testing.assert_array_equal(obs[:, 2:4], 0.0)
@@ -1,6 +1,9 @@
 const _wqParam = new URLSearchParams(window.location.search).get('wq');
 const BASE_URL =
   _wqParam ?? import.meta.env.VITE_API_BASE_URL ?? 'http://localhost:8000';
+const WS_BASE_URL = BASE_URL.replace(/^http/, 'ws');
+// Set VITE_GAME_CHANNEL=websocket to send moves over one socket per game.
+const USE_GAME_CHANNEL = import.meta.env.VITE_GAME_CHANNEL === 'websocket';
 
 async function parseResponse(response) {
   if (response.ok) {
@@ -39,14 +42,96 @@ export async function startGame(
   return parseResponse(response);
 }
 
-export async function movePlayer(gameId, action, token = null) {
+function moveBody(action, knownTurn) {
+  return knownTurn === null
+    ? { player_action: action }
+    : { player_action: action, known_turn: knownTurn };
+}
+
+export function openGameChannel(
+  gameId,
+  token = null,
+  WebSocketImpl = globalThis.WebSocket,
+) {
+  // The ID token rides in Sec-WebSocket-Protocol rather than the URL, which
+  // proxies and access logs record; the server answers with 'wumpus'.
+  const protocols = token ? ['wumpus', `bearer.${token}`] : ['wumpus'];
+  const socket = new WebSocketImpl(`${WS_BASE_URL}/game/ws/${gameId}`, protocols);
+  // The server answers frames in order, so replies settle moves first in, first out.
+  const pending = [];
+  let closed = false;
+
+  const opened = new Promise((resolve, reject) => {
+    socket.onopen = () => resolve();
+    socket.onerror = () => reject(new Error('Connection lost'));
+  });
+  opened.catch(() => {});
+
+  socket.onmessage = (event) => {
+    const next = pending.shift();
+    if (!next) return;
+    const body = JSON.parse(event.data);
+    if (typeof body?.error === 'string') {
+      next.reject(new Error(body.error));
+    } else {
+      next.resolve(body);
+    }
+  };
+
+  socket.onclose = () => {
+    closed = true;
+    pending.splice(0).forEach(({ reject }) => reject(new Error('Connection lost')));
+  };
+
+  return {
+    gameId,
+    get closed() {
+      return closed;
+    },
+    async move(action, knownTurn = null) {
+      await opened;
+      return new Promise((resolve, reject) => {
+        pending.push({ resolve, reject });
+        socket.send(JSON.stringify(moveBody(action, knownTurn)));
+      });
+    },
+    close() {
+      socket.close();
+    },
+  };
+}
+
+let activeChannel = null;
+
+async function moveOverChannel(gameId, action, token, knownTurn) {
+  if (!activeChannel || activeChannel.closed || activeChannel.gameId !== gameId) {
+    activeChannel?.close();
+    activeChannel = openGameChannel(gameId, token);
+  }
+  return activeChannel.move(action, knownTurn);
+}
+
+/**
+ * Passing the turn of the state already held asks for a delta reply
+ * (`delta: true`) instead of a full snapshot.
+ */
+export async function movePlayer(
+  gameId,
+  action,
+  token = null,
+  knownTurn = null,
+) {
+  if (USE_GAME_CHANNEL && typeof globalThis.WebSocket === 'function') {
+    return moveOverChannel(gameId, action, token, knownTurn);
+  }
+
   const headers = { 'Content-Type': 'application/json' };
   if (token) headers['Authorization'] = `Bearer ${token}`;
 
   const response = await fetch(`${BASE_URL}/game/move`, {
     method: 'POST',
     headers,
-    body: JSON.stringify({ game_id: gameId, player_action: action }),
+    body: JSON.stringify({ game_id: gameId, ...moveBody(action, knownTurn) }),
   });
 
   return parseResponse(response);
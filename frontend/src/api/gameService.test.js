@@ -1,4 +1,25 @@
-import { movePlayer, startGame } from './gameService';
+import { movePlayer, openGameChannel, startGame } from './gameService';
+
+class FakeSocket {
+  constructor(url, protocols) {
+    this.url = url;
+    this.protocols = protocols;
+    this.sent = [];
+    FakeSocket.last = this;
+  }
+
+  send(data) {
+    this.sent.push(JSON.parse(data));
+  }
+
+  close() {
+    this.onclose?.();
+  }
+
+  reply(body) {
+    this.onmessage({ data: JSON.stringify(body) });
+  }
+}
 
 describe('gameService', () => {
   const originalFetch = globalThis.fetch;
@@ -139,4 +160,62 @@ describe('gameService', () => {
 
     await expect(startGame()).rejects.toThrow('network down');
   });
+
+  it('openGameChannel sends actions and resolves replies in order', async () => {
+    const channel = openGameChannel('test-id', 'my-jwt', FakeSocket);
+    const socket = FakeSocket.last;
+    socket.onopen();
+
+    const first = channel.move('EAST');
+    const second = channel.move('SHOOT_NORTH');
+    await Promise.resolve();
+    await Promise.resolve();
+    socket.reply({ game_id: 'test-id', turn: 1 });
+    socket.reply({ error: 'No arrows remaining.', status_code: 400 });
+
+    expect(socket.url).toBe('ws://localhost:8000/game/ws/test-id');
+    expect(socket.protocols).toEqual(['wumpus', 'bearer.my-jwt']);
+    expect(socket.sent).toEqual([
+      { player_action: 'EAST' },
+      { player_action: 'SHOOT_NORTH' },
+    ]);
+    await expect(first).resolves.toEqual({ game_id: 'test-id', turn: 1 });
+    await expect(second).rejects.toThrow('No arrows remaining.');
+  });
+
+  it('openGameChannel rejects pending moves when the socket closes', async () => {
+    const channel = openGameChannel('test-id', null, FakeSocket);
+    const socket = FakeSocket.last;
+    socket.onopen();
+
+    const move = channel.move('WEST');
+    await Promise.resolve();
+    await Promise.resolve();
+    channel.close();
+
+    expect(socket.url).toBe('ws://localhost:8000/game/ws/test-id');
+    expect(socket.protocols).toEqual(['wumpus']);
+    await expect(move).rejects.toThrow('Connection lost');
+    expect(channel.closed).toBe(true);
+  });
+
+  it('movePlayer asks for a delta when the known turn is given', async () => {
+    globalThis.fetch.mockResolvedValue({
+      ok: true,
+      json: async () => ({ game_id: 'id', delta: true, turn: 4 }),
+    });
+
+    await movePlayer('test-id', 'EAST', null, 3);
+
+    expect(globalThis.fetch).toHaveBeenCalledWith(
+      expect.any(String),
+      expect.objectContaining({
+        body: JSON.stringify({
+          game_id: 'test-id',
+          player_action: 'EAST',
+          known_turn: 3,
+        }),
+      }),
+    );
+  });
 });
@@ -33,8 +33,16 @@ export function useControls() {
       const action = state.isAiming ? `SHOOT_${direction}` : direction;
 
       try {
-        const gameState = await movePlayer(state.gameId, action);
-        dispatch({ type: 'UPDATE_STATE', payload: gameState });
+        const gameState = await movePlayer(
+          state.gameId,
+          action,
+          null,
+          state.turn,
+        );
+        dispatch({
+          type: gameState.delta ? 'APPLY_DELTA' : 'UPDATE_STATE',
+          payload: gameState,
+        });
         dispatch({ type: 'SET_AIMING', payload: false });
       } catch {
         dispatch({ type: 'SET_ERROR', payload: 'Connection lost. Try again.' });
@@ -42,7 +50,14 @@ export function useControls() {
         actionInFlightRef.current = false;
       }
     },
-    [dispatch, state.gameId, state.isAiming, state.isLoading, state.status],
+    [
+      dispatch,
+      state.gameId,
+      state.isAiming,
+      state.isLoading,
+      state.status,
+      state.turn,
+    ],
   );
 
   const toggleAim = useCallback(() => {
@@ -65,7 +65,12 @@ describe('useControls', () => {
     window.dispatchEvent(new KeyboardEvent('keydown', eventInit));
 
     await waitFor(() => {
-      expect(movePlayer).toHaveBeenCalledWith('game-1', expectedAction);
+      expect(movePlayer).toHaveBeenCalledWith(
+        'game-1',
+        expectedAction,
+        null,
+        0,
+      );
     });
   });
 
@@ -122,7 +127,7 @@ describe('useControls', () => {
     );
 
     await waitFor(() => {
-      expect(movePlayer).toHaveBeenCalledWith('game-1', 'SHOOT_EAST');
+      expect(movePlayer).toHaveBeenCalledWith('game-1', 'SHOOT_EAST', null, 0);
     });
     expect(dispatch).toHaveBeenCalledWith({
       type: 'SET_AIMING',
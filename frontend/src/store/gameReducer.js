@@ -78,6 +78,25 @@ export function gameReducer(state, action) {
         error: null,
       };
     }
+    case 'APPLY_DELTA': {
+      // A delta only carries what changed since the turn the client sent.
+      const { payload } = action;
+
+      return {
+        ...state,
+        status: payload.status ?? state.status,
+        turn: payload.turn,
+        playerPos: payload.player_pos ?? state.playerPos,
+        arrowsRemaining: payload.arrows_remaining ?? state.arrowsRemaining,
+        exploredTiles: [...state.exploredTiles, ...payload.new_explored_tiles],
+        senses: payload.senses,
+        message: payload.message,
+        wumpusesRemaining:
+          payload.wumpuses_remaining ?? state.wumpusesRemaining,
+        isLoading: false,
+        error: null,
+      };
+    }
     case 'SET_LOADING':
       return {
         ...state,
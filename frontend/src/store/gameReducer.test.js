@@ -113,4 +113,45 @@ describe('gameReducer', () => {
       [2, 0],
     ]);
   });
+
+  it('applies only the changed fields on APPLY_DELTA', () => {
+    const currentState = {
+      ...initialState,
+      gameId: 'abc-123',
+      status: 'Ongoing',
+      turn: 1,
+      playerPos: [1, 0],
+      exploredTiles: [
+        [0, 0],
+        [1, 0],
+      ],
+      wumpusesRemaining: 2,
+    };
+
+    const nextState = gameReducer(currentState, {
+      type: 'APPLY_DELTA',
+      payload: {
+        game_id: 'abc-123',
+        delta: true,
+        turn: 2,
+        since_turn: 1,
+        new_explored_tiles: [[2, 0]],
+        player_pos: [2, 0],
+        senses: { breeze: true, stench_direction: null, shine: false },
+        message: 'You feel a cold draft. A pit may be nearby.',
+      },
+    });
+
+    expect(nextState.turn).toBe(2);
+    expect(nextState.playerPos).toEqual([2, 0]);
+    expect(nextState.exploredTiles).toEqual([
+      [0, 0],
+      [1, 0],
+      [2, 0],
+    ]);
+    expect(nextState.status).toBe('Ongoing');
+    expect(nextState.arrowsRemaining).toBe(1);
+    expect(nextState.wumpusesRemaining).toBe(2);
+    expect(nextState.senses.breeze).toBe(true);
+  });
 });